@@ -34,7 +34,13 @@ chirality The chirality of this atom if it is a stereocenter (R or S).
 priority The priority of this atom acording to the CIP rules, where 0 is the highest priority.
 mainChain A boolean indicating whether or not this atom is part of the main chain (used for chirality).
 hydrogenDirection The direction of the hydrogen, either up or down. Only for stereocenters with and explicit hydrogen.
-subtreeDepth The depth of the subtree coming from a stereocenter. """
+subtreeDepth The depth of the subtree coming from a stereocenter.
+class_ The atom class of a bracket atom as defined in the SMILES (e.g. 1 in [CH3:1]). """
+    __slots__ = ('idx', 'element', 'drawExplicit', 'ringbonds', 'rings', 'bondType', 'branchBond', 'isBridge',
+                 'isBridgeNode', 'originalRings', 'bridgedRing', 'anchoredRings', 'bracket', 'plane',
+                 'attachedPseudoElements', 'hasAttachedPseudoElements', 'isDrawn', 'isConnectedToRing',
+                 'neighbouringElements', 'isPartOfAromaticRing', 'bondCount', 'chirality', 'isStereoCenter',
+                 'priority', 'mainChain', 'hydrogenDirection', 'subtreeDepth', 'hasHydrogen', 'class_')
 
     # A map mapping element symbols to the atomic number.
     atomicNumbers = {
@@ -337,6 +343,7 @@ subtreeDepth The depth of the subtree coming from a stereocenter. """
         self.hydrogenDirection = 'down'
         self.subtreeDepth = 1
         self.hasHydrogen = False
+        self.class_ = None
 
     def addNeighbouringElement(self, element: str):
         'Adds a neighbouring element to this atom.'
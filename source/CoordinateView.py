@@ -0,0 +1,32 @@
+from Vector2 import Vector2
+
+
+class CoordinateView(Vector2):
+    """A Vector2 whose coordinates live in a row of the coordinate array of a Graph, used as Vertex.position once the vertex
+is added to a graph. Reading and writing x and y goes through to Graph.coordinates, so all Vector2 methods work on it and
+whole-graph operations on the array are seen by every vertex. The graph is referenced rather than the array itself,
+because the array is replaced when it grows.
+graph The graph owning the coordinate array.
+index The row of the coordinate array (the vertex id)."""
+    __slots__ = ('graph', 'index')
+
+    def __init__(self, graph: 'Graph', index: int) -> None:
+        'The constructor of the class CoordinateView.'
+        self.graph = graph
+        self.index = index
+
+    @property
+    def x(self) -> float:
+        return float(self.graph.coordinates[self.index, 0])
+
+    @x.setter
+    def x(self, value: float) -> None:
+        self.graph.coordinates[self.index, 0] = value
+
+    @property
+    def y(self) -> float:
+        return float(self.graph.coordinates[self.index, 1])
+
+    @y.setter
+    def y(self, value: float) -> None:
+        self.graph.coordinates[self.index, 1] = value
@@ -8,6 +8,7 @@ weight The weight of this edge. That is, the degree of the bond (single bond = 1
 [isPartOfAromaticRing=false] Whether or not this edge is part of an aromatic ring.
 [center=false] Wheter or not the bond is centered. For example, this affects straight double bonds.
 [wedge=''] Wedge direction. Either '', 'up' or 'down' """
+    __slots__ = ('id', 'sourceId', 'targetId', 'weight', 'bondType', 'isPartOfAromaticRing', 'center', 'wedge')
 
     bonds = {
         '-': 1,
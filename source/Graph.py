@@ -1,12 +1,18 @@
 from MathHelper import MathHelper
 from Vector2 import Vector2
 from Vertex import Vertex
+from CoordinateView import CoordinateView
 from Edge import Edge
 from Ring import Ring
 from Atom import Atom
+from RingTemplates import RingTemplates
 
 from math import sin, cos, pow, sqrt
-from typing import List, Set, Any, Callable, Final, Union
+from array import array
+from bisect import bisect_left
+from collections import deque
+import numpy as np
+from typing import List, Set, Dict, Any, Callable, Final, Union
 
 
 class Graph:
@@ -14,83 +20,120 @@ class Graph:
 vertices The vertices of the graph.
 edges The edges of this graph.
 atomIdxToVertexId A map mapping atom indices to vertex ids.
-vertexIdsToEdgeId A map mapping vertex ids to the edge between the two vertices. The key is defined as vertexAId + '_' + vertexBId.
+csrOffsets The compressed sparse row offsets. The neighbours of vertex i are stored at csrNeighbours[csrOffsets[i]:csrOffsets[i + 1]].
+csrNeighbours The neighbouring vertex ids of all vertices, sorted ascending per vertex.
+csrEdgeIds The edge ids matching the entries of csrNeighbours.
+ringTemplates An optional RingTemplates store. Ring systems found in it are placed by a rigid transform in kkLayout and smacofLayout.
+Derived structures (adjacency, bridges, components, distance matrices) are computed on first access and cached
+until addVertex, addEdge or clear change the topology. The cached objects are shared and must not be modified.
+layoutCache An optional LayoutCache. kkLayout results are stored in it and reused (by a rigid transform) for the same (sub)graph.
+coordinates The coordinates of the vertices, a float64 array with (at least) one row per vertex. Graph.addVertex() moves the
+position of a vertex into its row and makes Vertex.position a CoordinateView of it, so translate(), rotate(), scale() and
+getBounds() work on all positions in single NumPy calls. The array grows by doubling; getCoordinates() returns the rows in use.
+spatialGrid An optional SpatialGrid over the vertex positions. The coordinate operations of the graph keep it up to date.
 isometric A boolean indicating whether or not the SMILES associated with this graph is isometric."""
 
+    UNREACHABLE: Final = -1  # The distance matrix entry of two vertices that are not connected.
+
     def __init__(self, parseTree: Any, isomeric: bool = False) -> None:
         'The constructor of the class Graph.'
         self.vertices, self.edges, self.atomIdxToVertexId = [], [], []
-        self.vertexIdsToEdgeId = {}
+        self.csrOffsets, self.csrNeighbours, self.csrEdgeIds = array('l', [0]), array('l'), array('l')
+        self._csrValid = True
+        self._derived = {}
+        self.coordinates = np.zeros((0, 2))
+        self.ringTemplates = None
+        self.layoutCache = None
+        self.spatialGrid = None
         self.isomeric = isomeric
         self._atomIdx, self._time = 0, 0
-        self.__init(parseTree)
-
-    def __init(self, node: 'Graph', order: float = 0, parent_vertex_id: float = None, is_branch: bool = False):
-        'Create a new vertex object'
-        element: Final = node['atom']['element'] if 'element' in node['atom'] else node['atom']
+        if parseTree is not None:
+            self.__init(parseTree)
+
+    def __init(self, parseTree: dict) -> None:
+        """Creates the vertices and edges from the parse tree. The tree is walked depth-first with an explicit stack
+(stereo hydrogens, then branches, then the next atom of each node), so long chains do not hit the recursion limit."""
+        stack = [(parseTree, None, False)]
+        while stack:
+            node, parentVertexId, isBranch = stack.pop()
+            vertex = self.__addParseTreeVertex(node, parentVertexId, isBranch)
+            atom = vertex.value
+            offset = node['ringbondCount'] + 1
+            if atom.bracket:
+                offset += atom.bracket['hcount']
+            children = []
+            if atom.bracket and 'chirality' in atom.bracket:
+                atom.isStereoCenter = True
+                for _ in range(atom.bracket['hcount']):
+                    children.append(({
+                        'atom': 'H',
+                        'isBracket': False,
+                        'branches': [],
+                        'branchCount': 0,
+                        'ringbonds': [],
+                        'ringbondCount': False,
+                        'next': None,
+                        'hasNext': False,
+                        'bond': '-'
+                    }, vertex.id, True))
+            for i in range(node['branchCount']):
+                children.append((node['branches'][i], vertex.id, True))
+            if node['hasNext']:
+                children.append((node['next'], vertex.id, False))
+            stack.extend(reversed(children))
+
+    def __addParseTreeVertex(self, node: dict, parentVertexId: int, isBranch: bool) -> 'Vertex':
+        'PRIVATE FUNCTION used by __init(). Creates the vertex of a parse tree node and the edge to its parent.'
+        bracket = node['atom'] if isinstance(node['atom'], dict) and 'element' in node['atom'] else None
+        element: Final = bracket['element'] if bracket else node['atom']
         atom = Atom(element, node['bond'])
-        if element != 'H' or (not node['hasNext'] and parent_vertex_id is None):
+        if element != 'H' or (not node['hasNext'] and parentVertexId is None):
             atom.idx = self._atomIdx
             self._atomIdx += 1
 
-        atom.branchBond = node.branchBond
-        atom.ringbonds = node.ringbonds
-        atom.bracket = node['atom']['element'] if 'element' in node['atom'] else None
-        atom.class_ = node['atom']['class']
+        atom.branchBond = node.get('branchBond')
+        atom.ringbonds = node['ringbonds']
+        atom.bracket = bracket
+        atom.class_ = bracket.get('class') if bracket else None
         vertex = Vertex(atom)
-        parent_vertex = self.vertices[parent_vertex_id] if parent_vertex_id is not None else None
-        self.add_vertex(vertex)
+        parentVertex = self.vertices[parentVertexId] if parentVertexId is not None else None
+        self.addVertex(vertex)
         if atom.idx is not None:
-            self.atom_idx_to_vertex_id.append(vertex.id)
-        if parent_vertex_id is not None:
-            vertex.set_parent_vertex_id(parent_vertex_id)
-            vertex.value.add_neighbouring_element(parent_vertex.value.element)
-            parent_vertex.add_child(vertex.id)
-            parent_vertex.value.add_neighbouring_element(atom.element)
-            parent_vertex.spanning_tree_children.append(vertex.id)
-            edge = Edge(parent_vertex_id, vertex.id, 1)
-            vertex_id = None
-            if is_branch:
-                edge.set_bond_type(vertex.value.branch_bond or '-')
-                vertex_id = vertex.id
+            self.atomIdxToVertexId.append(vertex.id)
+        if parentVertexId is not None:
+            vertex.setParentVertexId(parentVertexId)
+            vertex.value.addNeighbouringElement(parentVertex.value.element)
+            parentVertex.addChild(vertex.id)
+            parentVertex.value.addNeighbouringElement(atom.element)
+            parentVertex.spanningTreeChildren.append(vertex.id)
+            edge = Edge(parentVertexId, vertex.id, 1)
+            if isBranch:
+                edge.setBondType(vertex.value.branchBond or '-')
             else:
-                edge.set_bond_type(parent_vertex.value.bond_type or '-')
-                vertex_id = parent_vertex.id
-            edge_id = self.add_edge(edge)
-        offset = node['ringbondCount'] + 1
-        if atom.bracket:
-            offset += atom.bracket['hcount']
-        stereo_hydrogens = 0
-        if atom.bracket and 'chirality' in atom.bracket:
-            atom.is_stereo_center = True
-            stereo_hydrogens = atom.bracket['hcount']
-            for i in range(stereo_hydrogens):
-                self.__init({
-                    'atom': 'H',
-                    'isBracket': False,
-                    'branches': [],
-                    'branchCount': 0,
-                    'ringbonds': [],
-                    'ringbondCount': False,
-                    'next': None,
-                    'hasNext': False,
-                    'bond': '-'
-                }, i, vertex.id, True)
-        for i in range(node['branchCount']):
-            self.__init(node['branches'][i], i + offset, vertex.id, True)
-        if node['hasNext']:
-            self.__init(node['next'], node['branchCount'] + offset, vertex.id)
+                edge.setBondType(parentVertex.value.bondType or '-')
+            self.addEdge(edge)
+        return vertex
 
     def clear(self):
         'Clears all the elements in this graph (edges and vertices).'
         self.vertices = []
         self.edges = []
-        self.vertexIdsToEdgeId = {}
+        self.csrOffsets, self.csrNeighbours, self.csrEdgeIds = array('l', [0]), array('l'), array('l')
+        self._csrValid = True
+        self._derived = {}
+        self.coordinates = np.zeros((0, 2))
 
     def addVertex(self, vertex: 'Vertex') -> float:
-        'Add a vertex to the graph.'
+        'Add a vertex to the graph. Its position is moved into the coordinate array of the graph.'
         vertex.id = len(self.vertices)
+        if vertex.id == len(self.coordinates):
+            coordinates = np.zeros((max(8, 2 * vertex.id), 2))
+            coordinates[:vertex.id] = self.coordinates
+            self.coordinates = coordinates
+        self.coordinates[vertex.id] = vertex.position.x, vertex.position.y
+        vertex.position = CoordinateView(self, vertex.id)
         self.vertices.append(vertex)
+        self.__invalidate()
         return vertex.id
 
     def addEdge(self, edge: 'Edge') -> float:
@@ -99,9 +142,7 @@ isometric A boolean indicating whether or not the SMILES associated with this gr
         target = self.vertices[edge.targetId]
         edge.id = len(self.edges)
         self.edges.append(edge)
-        
-        self.vertexIdsToEdgeId[f'{edge.sourceId}_{edge.targetId}'] = edge.id
-        self.vertexIdsToEdgeId[f'{edge.targetId}_{edge.sourceId}'] = edge.id
+        self.__invalidate()
 
         edge.isPartOfAromaticRing = source.value.isPartOfAromaticRing and target.value.isPartOfAromaticRing
         source.value.bondCount += edge.weight
@@ -110,14 +151,74 @@ isometric A boolean indicating whether or not the SMILES associated with this gr
         target.edges.append(edge.id)
         return edge.id
 
+    def __invalidate(self) -> None:
+        'PRIVATE FUNCTION used by addVertex() and addEdge(). Drops the CSR index and all cached derived structures.'
+        self._csrValid = False
+        if self._derived:
+            self._derived = {}
+
+    def __derived(self, key: Any, factory: Callable) -> Any:
+        'PRIVATE FUNCTION. Returns a cached derived structure, computing it with factory() if it is not cached yet.'
+        value = self._derived.get(key)
+        if value is None:
+            value = self._derived[key] = factory()
+        return value
+
     def getEdge(self, vertexIdA: float, vertexIdB: float) -> Union['Edge', None]:
         'Returns the edge between two given vertices.'
-        edgeId = self.vertexIdsToEdgeId[f'{vertexIdA}_{vertexIdB}']
+        edgeId = self.__findEdgeId(vertexIdA, vertexIdB)
         return None if edgeId is None else self.edges[edgeId]
 
     def hasEdge(self, vertexIdA: float, vertexIdB: float) -> bool:
         'Check whether or not two vertices are connected by an edge.'
-        return self.vertexIdsToEdgeId[f'{vertexIdA}_{vertexIdB}'] is not None
+        return self.__findEdgeId(vertexIdA, vertexIdB) is not None
+
+    def getCsr(self) -> tuple:
+        """Returns the compressed sparse row adjacency index (offsets, neighbours, edge ids) of the graph.
+The index is rebuilt in O(V + E) if vertices or edges were added since it was last built."""
+        if not self._csrValid:
+            self.__buildCsr()
+        return self.csrOffsets, self.csrNeighbours, self.csrEdgeIds
+
+    def getNeighbourIds(self, vertexId: int) -> List[int]:
+        'Returns the ids of the vertices connected to a given vertex by an edge, sorted ascending.'
+        offsets, neighbours, _ = self.getCsr()
+        return neighbours[offsets[vertexId]:offsets[vertexId + 1]].tolist()
+
+    def __buildCsr(self) -> None:
+        'PRIVATE FUNCTION used by getCsr(). If two vertices are connected by more than one edge, the last added edge is kept.'
+        buckets = [[] for _ in range(len(self.vertices))]
+        for edge in self.edges:
+            buckets[edge.sourceId].append((edge.targetId, edge.id))
+            buckets[edge.targetId].append((edge.sourceId, edge.id))
+        offsets, neighbours, edgeIds = array('l', [0]), array('l'), array('l')
+        for bucket in buckets:
+            bucket.sort()
+            previous = None
+            for neighbour, edgeId in bucket:
+                if neighbour == previous:
+                    edgeIds[-1] = edgeId
+                    continue
+                neighbours.append(neighbour)
+                edgeIds.append(edgeId)
+                previous = neighbour
+            offsets.append(len(neighbours))
+        self.csrOffsets, self.csrNeighbours, self.csrEdgeIds = offsets, neighbours, edgeIds
+        self._csrValid = True
+
+    def __findEdgeId(self, vertexIdA: int, vertexIdB: int) -> Union[int, None]:
+        """PRIVATE FUNCTION used by getEdge() and hasEdge(). Uses a binary search on the CSR index if it is up to date,
+otherwise scans the edges of the first vertex, so that querying while the graph is built does not trigger a rebuild."""
+        if self._csrValid:
+            lo, hi = self.csrOffsets[vertexIdA], self.csrOffsets[vertexIdA + 1]
+            i = bisect_left(self.csrNeighbours, vertexIdB, lo, hi)
+            return self.csrEdgeIds[i] if i < hi and self.csrNeighbours[i] == vertexIdB else None
+        for edgeId in reversed(self.vertices[vertexIdA].edges):
+            edge = self.edges[edgeId]
+            if (edge.sourceId == vertexIdA and edge.targetId == vertexIdB) or \
+               (edge.sourceId == vertexIdB and edge.targetId == vertexIdA):
+                return edgeId
+        return None
 
     def getVertexList(self) -> List[float]:
         'Returns an array containing the vertex ids of this graph.'
@@ -129,96 +230,104 @@ isometric A boolean indicating whether or not the SMILES associated with this gr
 
     def getAdjacencyMatrix(self) -> List[List[int]]:
         'Get the adjacency matrix of the graph.'
-        length = len(self.vertices)
-        adjacencyMatrix = [[0] * length for _ in range(length)]
-        for edge in self.edges:
-            adjacencyMatrix[edge.sourceId][edge.targetId] = 1
-            adjacencyMatrix[edge.targetId][edge.sourceId] = 1
-        return adjacencyMatrix
+        return self.__derived('adjacencyMatrix', lambda: Graph.adjacencyListToMatrix(self.getAdjacencyList()))
 
     def getComponentsAdjacencyMatrix(self) -> List[List[int]]:
         """Get the adjacency matrix of the graph with all bridges removed (thus the components).
         Thus the remaining vertices are all part of ring systems."""
-        adjacencyMatrix = self.getAdjacencyMatrix()
-        for bridge in self.getBridges():
-            adjacencyMatrix[bridge[0]][bridge[1]] = 0
-            adjacencyMatrix[bridge[1]][bridge[0]] = 0
-        return adjacencyMatrix
+        return self.__derived('componentsAdjacencyMatrix',
+                              lambda: Graph.adjacencyListToMatrix(self.getComponentsAdjacencyList()))
+
+    def getComponentsAdjacencyList(self) -> List[List[int]]:
+        'Get the adjacency list of the graph with all bridges removed (thus the components).'
+        return self.__derived('componentsAdjacencyList', self.__computeComponentsAdjacencyList)
+
+    def __computeComponentsAdjacencyList(self) -> List[List[int]]:
+        'PRIVATE FUNCTION used by getComponentsAdjacencyList().'
+        adjacencyList = [neighbours[:] for neighbours in self.getAdjacencyList()]
+        for u, v in self.getBridges():
+            adjacencyList[u].remove(v)
+            adjacencyList[v].remove(u)
+        return adjacencyList
+
+    def getComponents(self) -> List[List[int]]:
+        'Returns the connected components (with more than one vertex) of the graph with all bridges removed, i.e. the ring systems.'
+        return self.__derived('components', lambda: Graph.getConnectedComponentsFromList(self.getComponentsAdjacencyList()))
+
+    def getBlocks(self) -> List[List[int]]:
+        """Returns the biconnected components (blocks) of the graph with all bridges removed. Every ring lies in exactly one block,
+so fused ring systems joined at articulation atoms (e.g. spiro centres) are split into blocks that can be perceived independently."""
+        return self.__derived('blocks', lambda: Graph.getBiconnectedComponentsFromList(self.getComponentsAdjacencyList()))
 
     def getSubgraphAdjacencyMatrix(self, vertexIds: List[int]) -> List[List[int]]:
         'Get the adjacency matrix of a subgraph.'
-        adjacencyMatrix = [[1 if i != j and self.hasEdge(sourceId, targetId) else 0
-                            for i, sourceId in enumerate(vertexIds)]
-                           for j, targetId in enumerate(vertexIds)]
-        return adjacencyMatrix
-    #реализация с вложенным генератором мне нравится больше, но если читабельность плохая, можно оставить ориг идею
-    # def getSubgraphAdjacencyMatrix(self, vertexIds: List[int]) -> List[List[int]]:
-    #     'Get the adjacency matrix of a subgraph.'
-    #     length = len(vertexIds)
-    #     adjacencyMatrix = [[0] * length for _ in range(length)]
-    #     for i, sourceId in enumerate(vertexIds):
-    #         for j, targetId in enumerate(vertexIds):
-    #             if i != j and self.hasEdge(sourceId, targetId):
-    #                 adjacencyMatrix[i][j] = 1
-    #     return adjacencyMatrix
-
-    def getDistanceMatrix(self) -> List[List[int]]:
-        """Get the distance matrix of the graph. Floyd-Warshall algorithm for
-calculating the distance matrix between all pairs of vertices in a graph"""
-        length = len(self.vertices)
-        adja = self.getAdjacencyMatrix()
-        dist = [[1 if adja[i][j] == 1 else None for i in range(length)]\
-            for j in range(length)]
-        for k in range(length):
-            for i in range(length):
-                for j in range(length):
-                    if dist[i][j] > dist[i][k] + dist[k][j]:
-                        dist[i][j] = dist[i][k] + dist[k][j]
-        return dist
+        return self.__derived(('subgraphAdjacencyMatrix', tuple(vertexIds)),
+                              lambda: Graph.adjacencyListToMatrix(self.getSubgraphAdjacencyList(vertexIds)))
 
-    def getSubgraphDistanceMatrix(self, vertexIds: List[float]) -> List[List[int]]:
-        'Get the distance matrix of a subgraph.'
-        length = len(vertexIds)
-        adja = self.getSubgraphAdjacencyMatrix(vertexIds)
-        dist = [[1 if adja[i][j] == 1 else None for i in range(
-            length)] for j in range(length)]
-        for k in range(length):
-            for i in range(length):
-                for j in range(length):
-                    if dist[i][j] > dist[i][k] + dist[k][j]:
-                        dist[i][j] = dist[i][k] + dist[k][j]
+    def getDistanceMatrix(self) -> np.ndarray:
+        """Get the distance matrix of the graph. The graph is unweighted, so the distances
+between all pairs of vertices are computed with one breadth-first search per vertex in O(V * (V + E)).
+Unreachable pairs are set to Graph.UNREACHABLE. The returned matrix is read-only."""
+        return self.__derived('distanceMatrix', lambda: Graph.getBfsDistanceMatrix(self.getAdjacencyList(), readOnly=True))
+
+    def getSubgraphDistanceMatrix(self, vertexIds: List[float]) -> np.ndarray:
+        'Get the distance matrix of a subgraph. Row and column i correspond to vertexIds[i]. The returned matrix is read-only.'
+        return self.__derived(('subgraphDistanceMatrix', tuple(vertexIds)),
+                              lambda: Graph.getBfsDistanceMatrix(self.getSubgraphAdjacencyList(vertexIds), readOnly=True))
+
+    @staticmethod
+    def getBfsDistanceMatrix(adjacencyList: List[List[int]], readOnly: bool = False) -> np.ndarray:
+        'Returns the all-pairs shortest path lengths of an unweighted graph given as an adjacency list.'
+        length = len(adjacencyList)
+        dist = np.empty((length, length), dtype=np.int32)
+        for source in range(length):
+            row = [Graph.UNREACHABLE] * length
+            row[source] = 0
+            frontier, d = [source], 0
+            while frontier:
+                d += 1
+                nextFrontier = []
+                for u in frontier:
+                    for v in adjacencyList[u]:
+                        if row[v] == Graph.UNREACHABLE:
+                            row[v] = d
+                            nextFrontier.append(v)
+                frontier = nextFrontier
+            dist[source] = row
+        dist.flags.writeable = not readOnly
         return dist
 
     def getAdjacencyList(self) -> List[List[int]]:
         'Get the adjacency list of the graph.'
-        length = len(self.vertices)
-        adjacencyList = [[] for _ in range(length)]
-        for i in range(length):
-            for j in range(length):
-                if i != j and self.hasEdge(self.vertices[i].id, self.vertices[j].id):
-                    adjacencyList[i].append(j)
-        return adjacencyList
-
-    #   читабельность в таком подходе будет храмать, поэтому оставил вложенный цикл
-    # def getAdjacencyList(self) -> List[List[int]]:
-    #     'Get the adjacency list of the graph.'
-    #     length = len(self.vertices)
-    #     return [[j for i in range(length) if i != j and self.hasEdge(self.vertices[i].id, self.vertices[j].id)] for j in range(length)]
-    
+        offsets, neighbours, _ = self.getCsr()
+        return self.__derived('adjacencyList', lambda: [neighbours[offsets[i]:offsets[i + 1]].tolist()
+                                                        for i in range(len(self.vertices))])
 
     def getSubgraphAdjacencyList(self, vertexIds: List[float]) -> List[List[int]]:
         'Get the adjacency list of a subgraph.'
-        length = len(vertexIds)
-        adjacencyList = [[] for _ in range(length)]
-        for i in range(length):
-            for j in range(length):
-                if i != j and self.hasEdge(vertexIds[i], vertexIds[j]):
+        return self.__derived(('subgraphAdjacencyList', tuple(vertexIds)), lambda: self.__computeSubgraphAdjacencyList(vertexIds))
+
+    def __computeSubgraphAdjacencyList(self, vertexIds: List[float]) -> List[List[int]]:
+        'PRIVATE FUNCTION used by getSubgraphAdjacencyList().'
+        offsets, neighbours, _ = self.getCsr()
+        indices = {vertexId: i for i, vertexId in enumerate(vertexIds)}
+        adjacencyList = [[] for _ in range(len(vertexIds))]
+        for i, vertexId in enumerate(vertexIds):
+            for k in range(offsets[vertexId], offsets[vertexId + 1]):
+                j = indices.get(neighbours[k])
+                if j is not None and j != i:
                     adjacencyList[i].append(j)
+            adjacencyList[i].sort()
         return adjacencyList
         
     def getBridges(self) -> List[float]:
+        'Returns the bridges of the graph as pairs of vertex ids, using Tarjan\'s algorithm on the CSR index.'
+        return self.__derived('bridges', self.__computeBridges)
+
+    def __computeBridges(self) -> List[List[int]]:
+        'PRIVATE FUNCTION used by getBridges().'
         length = len(self.vertices)
-        outBridges, disc, low = [], [], []
+        outBridges, disc, low = [], [0] * length, [0] * length
         visited = [False] * length
         parent = [None] * length   
         adj = self.getAdjacencyList()
@@ -230,14 +339,14 @@ calculating the distance matrix between all pairs of vertices in a graph"""
 
     def traverseBF(self, startVertexId: float, callback: Callable) -> None:
         'Traverses the graph in breadth-first order.'
-        length = len(self.vertices)
-        visited = [False] * length
-        queue = [startVertexId]
-        while len(queue):
-            u = queue.pop(0)
-            vertex = self.vertices[u]
-            callback(vertex)
-            for neighbour in vertex.neighbours:
+        offsets, neighbours, _ = self.getCsr()
+        visited = [False] * len(self.vertices)
+        queue = deque([startVertexId])
+        while queue:
+            u = queue.popleft()
+            callback(self.vertices[u])
+            for k in range(offsets[u], offsets[u + 1]):
+                neighbour = neighbours[k]
                 if visited[neighbour] is False:
                     visited[neighbour] = True
                     queue.append(neighbour)
@@ -246,190 +355,420 @@ calculating the distance matrix between all pairs of vertices in a graph"""
         'Get the depth of a subtree in the direction opposite to the vertex specified as the parent vertex.'
         if vertexId is None or parentVertexId is None:
             return 0
-        neighbours = self.vertices[vertexId].getSpanningTreeNeighbours(parentVertexId)
-        if not neighbours:
-            return 1
-        return 1 + max(self.getTreeDepth(childId, vertexId) for childId in neighbours)
-
-    # изначальная версия, но мне кажется моя реализация намного питоничнее
-    # def getTreeDepth(self, vertexId: float, parentVertexId: float) -> int:
-    #     'Get the depth of a subtree in the direction opposite to the vertex specified as the parent vertex.'
-    #     if vertexId is None or parentVertexId is None:
-    #         return 0
-    #     neighbours = self.vertices[vertexId].getSpanningTreeNeighbours(parentVertexId)
-    #     max = 0
-    #     for childId in neighbours:
-    #         d = self.getTreeDepth(childId, vertexId)
-    #         if d > max:
-    #             max = d
-    #     return max + 1
-    
-    
+        depths = {}
+        stack = [(vertexId, parentVertexId, False)]
+        while stack:
+            u, parent, expanded = stack.pop()
+            neighbours = self.vertices[u].getSpanningTreeNeighbours(parent)
+            if expanded:
+                depths[u] = 1 + max((depths.pop(childId) for childId in neighbours), default=0)
+                continue
+            stack.append((u, parent, True))
+            stack.extend((childId, u, False) for childId in neighbours)
+        return depths[vertexId]
+
     def traverseTree(self, vertexId: float, parentVertexId: float, callback: Callable,\
         maxDepth: int = 999999, ignoreFirst: bool=False, depth: float=1,\
             visited: List[int]=None) -> None:
-        'Traverse a sub-tree in the graph.'
+        'Traverse a sub-tree in the graph (depth-first, with an explicit stack).'
         if visited is None:
-            vesited = []
-        if (depth > maxDepth + 1) or visited[vertexId] == 1:
+            visited = [0] * len(self.vertices)
+        stack = [(vertexId, parentVertexId, depth)]
+        while stack:
+            u, parent, d = stack.pop()
+            if (d > maxDepth + 1) or visited[u] == 1:
+                continue
+            visited[u] = 1
+            vertex = self.vertices[u]
+            if ignoreFirst is False or d > 1:
+                callback(vertex)
+            stack.extend((neighbour, u, d + 1) for neighbour in reversed(vertex.getNeighbours(parent)))
+
+    def getCoordinates(self) -> np.ndarray:
+        'Returns the (N, 2) coordinates of the vertices as a view of the coordinate array (not a copy).'
+        return self.coordinates[:len(self.vertices)]
+
+    def __selectCoordinates(self, vertexIds: Union[List[int], None]) -> Union[slice, np.ndarray]:
+        'PRIVATE FUNCTION used by translate(), rotate(), scale() and getBounds(). The rows of the given vertices, or of all.'
+        return slice(0, len(self.vertices)) if vertexIds is None else np.asarray(vertexIds, dtype=np.intp)
+
+    def translate(self, dx: float, dy: float, vertexIds: List[int] = None) -> None:
+        'Translates all vertices, or the given vertices, by (dx, dy).'
+        self.coordinates[self.__selectCoordinates(vertexIds)] += (dx, dy)
+        self.__moved(vertexIds)
+
+    def rotate(self, angle: float, center: 'Vector2' = None, vertexIds: List[int] = None) -> None:
+        'Rotates all vertices, or the given vertices, by a given number of radians around a center (the origin by default).'
+        rows = self.__selectCoordinates(vertexIds)
+        self.coordinates[rows] = Graph.rotateCoordinates(self.coordinates[rows], angle, center or Vector2(0, 0))
+        self.__moved(vertexIds)
+
+    def scale(self, factor: float, center: 'Vector2' = None, vertexIds: List[int] = None) -> None:
+        'Scales all vertices, or the given vertices, by a factor relative to a center (the origin by default).'
+        rows = self.__selectCoordinates(vertexIds)
+        origin = np.array((center.x, center.y) if center is not None else (0.0, 0.0))
+        self.coordinates[rows] = (self.coordinates[rows] - origin) * factor + origin
+        self.__moved(vertexIds)
+
+    def __moved(self, vertexIds: Union[List[int], np.ndarray, None]) -> None:
+        'PRIVATE FUNCTION used by the coordinate operations. Updates the spatial grid, if any, for the moved vertices (None for all).'
+        if self.spatialGrid is not None:
+            self.spatialGrid.update(vertexIds)
+
+    def getBounds(self, vertexIds: List[int] = None) -> tuple:
+        'Returns the bounding box (minX, minY, maxX, maxY) of all vertices, or of the given vertices.'
+        coordinates = self.coordinates[self.__selectCoordinates(vertexIds)]
+        (minX, minY), (maxX, maxY) = coordinates.min(axis=0), coordinates.max(axis=0)
+        return float(minX), float(minY), float(maxX), float(maxY)
+
+    @staticmethod
+    def rotateCoordinates(coordinates: np.ndarray, angles: Union[float, np.ndarray], center: 'Vector2') -> np.ndarray:
+        """Returns an (m, 2) array of coordinates rotated by a number of radians around a center. Given an array of k angles,
+returns the k rotated copies as a (k, m, 2) array, e.g. to score candidate rotations of a subtree at once."""
+        angles = np.asarray(angles, dtype=float)[..., np.newaxis]
+        cosAngles, sinAngles = np.cos(angles), np.sin(angles)
+        dx, dy = coordinates[:, 0] - center.x, coordinates[:, 1] - center.y
+        return np.stack((dx * cosAngles - dy * sinAngles + center.x, dx * sinAngles + dy * cosAngles + center.y), axis=-1)
+
+    def getSubtreeVertexIds(self, vertexId: int, parentVertexId: int) -> np.ndarray:
+        """Returns the ids of the vertices of the subtree of vertexId pointing away from parentVertexId (in traverseTree()
+order) as a read-only array. The subtree is collected once and cached until the topology changes."""
+        return self.__derived(('subtree', vertexId, parentVertexId), lambda: self.__computeSubtreeVertexIds(vertexId, parentVertexId))
+
+    def __computeSubtreeVertexIds(self, vertexId: int, parentVertexId: int) -> np.ndarray:
+        'PRIVATE FUNCTION used by getSubtreeVertexIds().'
+        vertexIds = []
+        self.traverseTree(vertexId, parentVertexId, lambda vertex: vertexIds.append(vertex.id))
+        arrVertexIds = np.array(vertexIds, dtype=np.intp)
+        arrVertexIds.flags.writeable = False
+        return arrVertexIds
+
+    def getAnchoredRingIds(self, vertexIds: List[int]) -> List[int]:
+        'Returns the ids of the rings anchored to the atoms of the given vertices, without duplicates.'
+        return list(dict.fromkeys(ringId for vertexId in vertexIds for ringId in self.vertices[vertexId].value.anchoredRings))
+
+    def rotateSubtree(self, vertexId: int, parentVertexId: int, angle: float, center: 'Vector2',
+                      rings: Dict[int, 'Ring'] = None) -> None:
+        """Rotates the subtree of vertexId pointing away from parentVertexId by a number of radians around a center, in one
+call on the coordinate array. If rings (a dict mapping ring ids to rings) is given, the centers of the rings anchored
+to the subtree are rotated as well."""
+        rows = self.getSubtreeVertexIds(vertexId, parentVertexId)
+        self.coordinates[rows] = Graph.rotateCoordinates(self.coordinates[rows], angle, center)
+        self.__moved(rows)
+        if rings:
+            self.__moveAnchoredRings(rows, rings, lambda points: Graph.rotateCoordinates(points, angle, center))
+
+    def translateSubtree(self, vertexId: int, parentVertexId: int, dx: float, dy: float, rings: Dict[int, 'Ring'] = None) -> None:
+        'Translates the subtree of vertexId pointing away from parentVertexId by (dx, dy), and the centers of its anchored rings.'
+        rows = self.getSubtreeVertexIds(vertexId, parentVertexId)
+        self.coordinates[rows] += (dx, dy)
+        self.__moved(rows)
+        if rings:
+            self.__moveAnchoredRings(rows, rings, lambda points: points + (dx, dy))
+
+    def __moveAnchoredRings(self, vertexIds: np.ndarray, rings: Dict[int, 'Ring'], transform: Callable) -> None:
+        'PRIVATE FUNCTION used by rotateSubtree() and translateSubtree(). Applies transform to the anchored ring centers at once.'
+        centers = [rings[ringId].center for ringId in self.getAnchoredRingIds(vertexIds) if ringId in rings]
+        if not centers:
             return
-        visited[vertexId] = 1
-        vertex = self.vertices[vertexId]
-        neighbours = vertex.getNeighbours(parentVertexId)
-        if ignoreFirst is False or depth > 1:
-            callback(vertex)
-        for neighbour in neighbours:
-            self.traverseTree(neighbour, vertexId, callback, maxDepth, ignoreFirst, depth + 1, visited)
+        arrCenters = transform(np.array([(center.x, center.y) for center in centers]))
+        for center, (x, y) in zip(centers, arrCenters.tolist()):
+            center.x, center.y = x, y
 
     def kkLayout(self, vertexIds: List[float], center: 'Vector2', startVertexId: float, ring: 'Ring', bondLength,
             threshold = 0.1, innerThreshold = 0.1, maxIteration = 2000,
-            maxInnerIteration = 50, maxEnergy = 1e9):
+            maxInnerIteration = 50, maxEnergy = 1e9, budget: 'LayoutBudget' = None):
         """ Positiones the (sub)graph using Kamada and Kawais algorithm for drawing general undirected graphs.
         https://pdfs.semanticscholar.org/b8d3/bca50ccc573c5cb99f7d201e8acce6618f04.pdf
-        There are undocumented layout parameters. They are undocumented for a reason, so be very careful."""
+        There are undocumented layout parameters. They are undocumented for a reason, so be very careful.
+        Positions, lengths, strengths and energies are kept in NumPy arrays, so that every Newton-Raphson
+        step updates the moved vertex against all other vertices in a few vectorized operations.
+        Every outer iteration spends one iteration of the optional budget. If it has run out before the layout starts,
+        the vertices are placed on a circle; if it runs out during the layout, the last state is kept. Either way
+        the result gets 'degraded': True and is not stored in the layout cache.
+        Returns a dict with the number of outer iterations and the final stress of the layout."""
         edgeStrength = bondLength
         length = len(vertexIds)
-        matDist = self.getSubgraphDistanceMatrix(vertexIds)
-        radius = MathHelper.polyCircumradius(500, length)
-        angle = MathHelper.centralAngle(length)
-        a = 0.0
-        arrPositionX, arrPositionY = [0.0] * length, [0.0] * length
-        arrPositioned = [False] * length    
+        matDist = self.getSubgraphDistanceMatrix(vertexIds).astype(np.float64)
+        arrPosition, arrPositioned = self.__initialPositions(vertexIds, center, MathHelper.polyCircumradius(500, length))
+        result = self.__templateLayout(vertexIds, bondLength, matDist, arrPosition, arrPositioned, center)
+        if result is not None:
+            return result
+        cacheKey, cacheOrder = None, None
+        if self.layoutCache is not None:
+            cacheKey, cacheOrder = self.layoutCache.getKey(self, vertexIds, matDist, bondLength)
+            arrCached = self.layoutCache.get(cacheKey, cacheOrder)
+            if arrCached is not None:
+                result = self.__rigidLayout(vertexIds, arrCached, bondLength, matDist, arrPosition, arrPositioned, center)
+                result['cached'] = True
+                return result
+        if budget is not None and budget.expired():
+            return self.__circleLayout(vertexIds, center, bondLength, matDist, budget, 'kkLayout')
+
+        connected = matDist > 0
+        matLength = bondLength * matDist
+        matStrength = np.zeros((length, length))
+        matStrength[connected] = edgeStrength * matDist[connected] ** -2.0
+
+        diff = arrPosition[:, np.newaxis, :] - arrPosition[np.newaxis, :, :]
+        dist = np.hypot(diff[..., 0], diff[..., 1])
+        np.fill_diagonal(dist, 1.0)
+        matForce = matStrength[..., np.newaxis] * (diff - matLength[..., np.newaxis] * diff / dist[..., np.newaxis])
+        arrEnergySum = matForce.sum(axis=1)
+        # Same bookkeeping as the original scalar loop: entry (i, j) holds the term computed for max(i, j).
+        lower = np.tri(length, k=-1, dtype=bool)[..., np.newaxis]
+        matEnergy = np.where(lower, matForce, matForce.transpose(1, 0, 2))
 
-        for i in range(length):
-            vertex = self.vertices[vertexIds[i]]
-            if not vertex.positioned:
-                arrPositionX[i] = center.x + cos(a) * radius
-                arrPositionY[i] = center.y + sin(a) * radius
-            else:
-                arrPositionX[i] = vertex.position.x
-                arrPositionY[i] = vertex.position.y
-            arrPositioned[i] = vertex.positioned
-            a += angle
-
-        matLength = [[bondLength * matDist[i][j] for j in range(length)] for i in range(length)]
-        matStrength = [[edgeStrength * matDist[i][j] ** -2.0 for j in range(length)] for i in range(length)]
-        matEnergy = [[0.0] * length for _ in range(length)]
-        arrEnergySumX = [0.0] * length
-        arrEnergySumY = [0.0] * length
-
-        for i in range(length):
-            ux, uy = arrPositionX[i], arrPositionY[i]
-            dEx, dEy = 0.0, 0.0
-            for j in range(length):
-                if i != j:
-                    vx, vy = arrPositionX[j], arrPositionY[j]
-                    denom = 1.0 / sqrt((ux - vx) ** 2 + (uy - vy) ** 2)
-                    matEnergy[i][j] = [
-                        matStrength[i][j] * ((ux - vx) - matLength[i][j] * (ux - vx) * denom),
-                        matStrength[i][j] * ((uy - vy) - matLength[i][j] * (uy - vy) * denom)
-                    ]
-                    matEnergy[j][i] = matEnergy[i][j]
-                    dEx += matEnergy[i][j][0]
-                    dEy += matEnergy[i][j][1]
-            arrEnergySumX[i], arrEnergySumY[i] = dEx, dEy
-            
         maxEnergyId, iteration, innerIteration = 0, 0, 0
-        dEX, dEY, delta = 0.0, 0.0, 0.0
+        dE, delta = np.zeros(2), 0.0
+        degraded = False
 
         while maxEnergy > threshold and maxIteration > iteration:
+            if budget is not None and budget.spend():
+                degraded = True
+                break
             iteration += 1
-            maxEnergyId, maxEnergy, dEX, dEY = self.__highestEnergy(length, arrEnergySumX, arrEnergySumY, arrPositioned)
+            maxEnergyId, maxEnergy, dE = self.__highestEnergy(arrEnergySum, arrPositioned)
             delta = maxEnergy
             innerIteration = 0
 
             while delta > innerThreshold and maxInnerIteration > innerIteration:
                 innerIteration += 1
-                self.__update(maxEnergyId, dEX, dEY, arrPositionX, arrPositionY, matLength, matStrength, length, matEnergy, arrEnergySumX, arrEnergySumY)
-                delta, dEX, dEY = self.__energy(maxEnergyId, arrEnergySumX, arrEnergySumY)
-
+                self.__update(maxEnergyId, dE, arrPosition, matLength, matStrength, matEnergy, arrEnergySum)
+                delta, dE = self.__energy(maxEnergyId, arrEnergySum)
+
+        # With more than one fixed vertex the shape depends on where they were placed, so it is not reused.
+        if cacheKey is not None and np.count_nonzero(arrPositioned) < 2 and not degraded:
+            self.layoutCache.put(cacheKey, cacheOrder, arrPosition, bondLength)
+        self.__applyPositions(vertexIds, arrPosition)
+        result = {'iterations': iteration, 'stress': Graph.__stress(arrPosition, matDist, bondLength)}
+        if degraded:
+            budget.degrade('kkLayout')
+            result['degraded'] = True
+        return result
+
+    def smacofLayout(self, vertexIds: List[float], center: 'Vector2', startVertexId: float, ring: 'Ring', bondLength,
+            threshold = 1e-5, maxIteration = 300, budget: 'LayoutBudget' = None) -> dict:
+        """Positions the (sub)graph by stress majorization (SMACOF), an alternative to kkLayout for large bridged and cage systems.
+        Instead of moving one vertex at a time, every iteration moves all vertices that are not yet positioned
+        at once by solving the Guttman transform, keeping the positioned vertices fixed.
+        Iterates until the relative decrease of the stress drops below threshold or maxIteration is reached.
+        The optional budget is treated as in kkLayout.
+        Returns a dict with the number of iterations and the final stress of the layout."""
+        length = len(vertexIds)
+        matDist = self.getSubgraphDistanceMatrix(vertexIds).astype(np.float64)
+        arrPosition, arrPositioned = self.__initialPositions(vertexIds, center, MathHelper.polyCircumradius(bondLength, length))
+        result = self.__templateLayout(vertexIds, bondLength, matDist, arrPosition, arrPositioned, center)
+        if result is not None:
+            return result
+        free = ~arrPositioned
+        if not free.any():
+            self.__applyPositions(vertexIds, arrPosition)
+            return {'iterations': 0, 'stress': Graph.__stress(arrPosition, matDist, bondLength)}
+        if budget is not None and budget.expired():
+            return self.__circleLayout(vertexIds, center, bondLength, matDist, budget, 'smacofLayout')
+
+        connected = matDist > 0
+        matLength = bondLength * matDist
+        matWeight = np.zeros((length, length))
+        matWeight[connected] = matLength[connected] ** -2.0
+        matV = np.diag(matWeight.sum(axis=1)) - matWeight
+        # Without fixed vertices the system is only defined up to a translation, hence the pseudo-inverse.
+        matVInv = np.linalg.pinv(matV[np.ix_(free, free)]) if free.all() else np.linalg.inv(matV[np.ix_(free, free)])
+        matVFixed = matV[np.ix_(free, arrPositioned)]
+        fixedTerm = matVFixed @ arrPosition[arrPositioned]
+        stress, iteration = Graph.__stress(arrPosition, matDist, bondLength), 0
+        degraded = False
+
+        while maxIteration > iteration:
+            if budget is not None and budget.spend():
+                degraded = True
+                break
+            iteration += 1
+            diff = arrPosition[:, np.newaxis, :] - arrPosition[np.newaxis, :, :]
+            dist = np.hypot(diff[..., 0], diff[..., 1])
+            dist[dist == 0] = np.inf
+            matB = -matWeight * matLength / dist
+            matB[np.diag_indices(length)] = -matB.sum(axis=1)
+            arrPosition[free] = matVInv @ ((matB @ arrPosition)[free] - fixedTerm)
+            previousStress, stress = stress, Graph.__stress(arrPosition, matDist, bondLength)
+            if previousStress - stress <= threshold * previousStress:
+                break
+
+        if free.all():
+            arrPosition += (center.x, center.y) - arrPosition.mean(axis=0)
+        self.__applyPositions(vertexIds, arrPosition)
+        result = {'iterations': iteration, 'stress': stress}
+        if degraded:
+            budget.degrade('smacofLayout')
+            result['degraded'] = True
+        return result
+
+    def __templateLayout(self, vertexIds: List[float], bondLength: float, matDist: np.ndarray,
+                         arrPosition: np.ndarray, arrPositioned: np.ndarray, center: 'Vector2') -> Union[dict, None]:
+        'auxiliary function for kkLayout and smacofLayout. Places the (sub)graph from ringTemplates if it contains a matching template.'
+        if self.ringTemplates is None:
+            return None
+        arrTemplate = self.ringTemplates.get(self.getSubgraphAdjacencyList(vertexIds))
+        if arrTemplate is None:
+            return None
+        result = self.__rigidLayout(vertexIds, arrTemplate, bondLength, matDist, arrPosition, arrPositioned, center)
+        result['template'] = True
+        return result
+
+    def __rigidLayout(self, vertexIds: List[float], arrTemplate: np.ndarray, bondLength: float, matDist: np.ndarray,
+                      arrPosition: np.ndarray, arrPositioned: np.ndarray, center: 'Vector2') -> dict:
+        'auxiliary function for kkLayout and smacofLayout. Places the (sub)graph from coordinates given for a bond length of 1.0.'
+        arrPosition = RingTemplates.rigidTransform(arrTemplate * bondLength, arrPosition, arrPositioned, center)
+        self.__applyPositions(vertexIds, arrPosition)
+        return {'iterations': 0, 'stress': Graph.__stress(arrPosition, matDist, bondLength)}
+
+    def __circleLayout(self, vertexIds: List[float], center: 'Vector2', bondLength: float, matDist: np.ndarray,
+                       budget: 'LayoutBudget', reason: str) -> dict:
+        'auxiliary function for kkLayout and smacofLayout. Places the vertices that are not yet positioned on a circle when the budget has run out.'
+        arrPosition, _ = self.__initialPositions(vertexIds, center, MathHelper.polyCircumradius(bondLength, len(vertexIds)))
+        self.__applyPositions(vertexIds, arrPosition)
+        budget.degrade(reason)
+        return {'iterations': 0, 'stress': Graph.__stress(arrPosition, matDist, bondLength), 'degraded': True}
+
+    def __initialPositions(self, vertexIds: List[float], center: 'Vector2', radius: float) -> tuple:
+        'auxiliary function for kkLayout and smacofLayout. Places the vertices that are not yet positioned on a circle around the center.'
+        length = len(vertexIds)
+        angle = MathHelper.centralAngle(length)
+        a = 0.0
+        arrPosition = np.empty((length, 2))
+        arrPositioned = np.zeros(length, dtype=bool)
         for i in range(length):
-            index = vertexIds[i]
-            vertex = self.vertices[index]
-            vertex.position.x, vertex.position.y = arrPositionX[i], arrPositionY[i]
+            vertex = self.vertices[vertexIds[i]]
+            if not vertex.positioned:
+                arrPosition[i] = center.x + cos(a) * radius, center.y + sin(a) * radius
+            else:
+                arrPosition[i] = vertex.position.x, vertex.position.y
+            arrPositioned[i] = vertex.positioned
+            a += angle
+        return arrPosition, arrPositioned
+
+    def __applyPositions(self, vertexIds: List[float], arrPosition: np.ndarray) -> None:
+        'auxiliary function for kkLayout and smacofLayout'
+        self.coordinates[np.asarray(vertexIds, dtype=np.intp)] = arrPosition
+        self.__moved(vertexIds)
+        for vertexId in vertexIds:
+            vertex = self.vertices[vertexId]
             vertex.positioned, vertex.forcePositioned = True, True
 
     @staticmethod
-    def __energy(index, arrEnergySumX, arrEnergySumY):
+    def __stress(arrPosition: np.ndarray, matDist: np.ndarray, bondLength: float) -> float:
+        'auxiliary function for kkLayout and smacofLayout. The stress of a layout, weighting each pair by its squared ideal distance.'
+        connected = np.triu(matDist > 0, k=1)
+        diff = arrPosition[:, np.newaxis, :] - arrPosition[np.newaxis, :, :]
+        dist = np.hypot(diff[..., 0], diff[..., 1])[connected]
+        ideal = bondLength * matDist[connected]
+        return float(np.sum((dist - ideal) ** 2 / ideal ** 2))
+
+    @staticmethod
+    def __energy(index: int, arrEnergySum: np.ndarray) -> tuple:
         'auxiliary function for kkLayout'
-        return [arrEnergySumX[index] * arrEnergySumX[index] + arrEnergySumY[index] * arrEnergySumY[index], arrEnergySumX[index], arrEnergySumY[index]]
+        dE = arrEnergySum[index].copy()
+        return float(dE[0] * dE[0] + dE[1] * dE[1]), dE
 
-    @classmethod
-    def __highestEnergy(cls, length, arrEnergySumX, arrEnergySumY, arrPositioned):
+    @staticmethod
+    def __highestEnergy(arrEnergySum: np.ndarray, arrPositioned: np.ndarray) -> tuple:
         'auxiliary function for kkLayout'
-        maxEnergy, maxEnergyId, maxDEX, maxDEY = 0.0, 0, 0.0, 0.0
-        for i in range(length):
-            delta, dEX, dEY = cls.__energy(index=i, arrEnergySumX= arrEnergySumX, arrEnergySumY=arrEnergySumY)
-            if delta > maxEnergy and arrPositioned[i] == False:
-                maxEnergy = delta
-                maxEnergyId = i
-                maxDEX, maxDEY = dEX, dEY
-        return maxEnergyId, maxEnergy, maxDEX, maxDEY
+        energies = np.einsum('ij,ij->i', arrEnergySum, arrEnergySum)
+        energies[arrPositioned] = 0.0
+        maxEnergyId = int(np.argmax(energies))
+        if energies[maxEnergyId] <= 0.0:
+            return 0, 0.0, np.zeros(2)
+        return maxEnergyId, float(energies[maxEnergyId]), arrEnergySum[maxEnergyId].copy()
 
     @staticmethod
-    def __update(index, dEX, dEY, arrPositionX, arrPositionY, matLength, matStrength, length, matEnergy, arrEnergySumX, arrEnergySumY):
+    def __update(index: int, dE: np.ndarray, arrPosition: np.ndarray, matLength: np.ndarray,
+                 matStrength: np.ndarray, matEnergy: np.ndarray, arrEnergySum: np.ndarray) -> None:
         'auxiliary function for kkLayout'
-        dxx, dyy, dxy= 0.0, 0.0, 0.0
-        ux, uy = arrPositionX[index], arrPositionY[index]
-        arrL = matLength[index]
-        arrK = matStrength[index]
-        
-        for i in range(length):
-            if i != index:
-                vx, vy = arrPositionX[i], arrPositionY[i]
-                l, k = arrL[i], arrK[i]
-                m = (ux - vx) * (ux - vx)
-                denom = 1.0 / ((m + (uy - vy) * (uy - vy)) ** 1.5)
-                dxx += k * (1 - l * (uy - vy) * (uy - vy) * denom)
-                dyy += k * (1 - l * m * denom)
-                dxy += k * (l * (ux - vx) * (uy - vy) * denom)
+        arrL, arrK = matLength[index], matStrength[index]
+        arrKL = arrK * arrL
+        d = arrPosition[index] - arrPosition
+        m, n = d[:, 0] * d[:, 0], d[:, 1] * d[:, 1]
+        sq = m + n
+        sq[index] = np.inf
+        denom = arrKL * sq ** -1.5
+        sumK = arrK.sum()
+        dxx = float(sumK - np.dot(denom, n))
+        dyy = float(sumK - np.dot(denom, m))
+        dxy = float(np.dot(denom * d[:, 0], d[:, 1]))
 
         dxx = 0.1 if dxx == 0 else dxx
         dyy = 0.1 if dyy == 0 else dyy
         dxy = 0.1 if dxy == 0 else dxy
-        dy = (dEX / dxx + dEY / dxy) / (dxy / dxx - dyy / dxy)
-        dx = -(dxy * dy + dEX) / dxx
-        arrPositionX[index] += dx
-        arrPositionY[index] += dy
-        arrE = matEnergy[index]
-        dEX, dEY = 0.0, 0.0
-        ux, uy = arrPositionX[index], arrPositionY[index]
-
-        for i in range(length):
-            if index != i:
-                vx, vy = arrPositionX[i], arrPositionY[i]
-                prevEx, prevEy = arrE[i][0], arrE[i][1]
-                denom = 1.0 / sqrt((ux - vx) * (ux - vx) + (uy - vy) * (uy - vy))
-                dx = arrK[i] * ((ux - vx) - arrL[i] * (ux - vx) * denom)
-                dy = arrK[i] * ((uy - vy) - arrL[i] * (uy - vy) * denom)
-                arrE[i] = [dx, dy]
-                dEX += dx
-                dEY += dy
-                arrEnergySumX[i] += dx - prevEx
-                arrEnergySumY[i] += dy - prevEy
-
-        arrEnergySumX[index], arrEnergySumY[index] = dEX, dEY
+        dy = (dE[0] / dxx + dE[1] / dxy) / (dxy / dxx - dyy / dxy)
+        dx = -(dxy * dy + dE[0]) / dxx
+        arrPosition[index] += dx, dy
+
+        d = arrPosition[index] - arrPosition
+        dist = np.hypot(d[:, 0], d[:, 1])
+        dist[index] = np.inf
+        arrE = d * (arrK - arrKL / dist)[:, np.newaxis]
+        arrEnergySum += arrE
+        arrEnergySum -= matEnergy[index]
+        matEnergy[index] = arrE
+        arrEnergySum[index] = arrE.sum(axis=0)
 
     def __bridgeDfs(self, u: int, visited: list, disc: list, low: list,\
         parent: list, adj: List[List[int]], outBridges: list) -> None:
-        'PRIVATE FUNCTION used by getBridges().'
+        'PRIVATE FUNCTION used by getBridges(). Depth-first search with an explicit stack of neighbour iterators.'
         visited[u] = True
-        self._time += self._time
+        self._time += 1
         disc[u] = low[u] = self._time
-        for v in adj[u]:
-            if not visited[v]:
-                parent[v] = u
-                self.__bridgeDfs(v, visited, disc, low, parent, adj, outBridges)
-                low[u] = min(low[u], low[v])
-                if low[v] > disc[u]: 
-                    outBridges.append([u, v])
-            elif v != parent[u]:
-                low[u] = min(low[u], disc[v])
+        stack = [(u, iter(adj[u]))]
+        while stack:
+            u, neighbours = stack[-1]
+            for v in neighbours:
+                if not visited[v]:
+                    parent[v] = u
+                    visited[v] = True
+                    self._time += 1
+                    disc[v] = low[v] = self._time
+                    stack.append((v, iter(adj[v])))
+                    break
+                elif v != parent[u]:
+                    low[u] = min(low[u], disc[v])
+            else:
+                stack.pop()
+                if stack:
+                    p = stack[-1][0]
+                    low[p] = min(low[p], low[u])
+                    if low[u] > disc[p]:
+                        outBridges.append([p, u])
+
+    @staticmethod
+    def adjacencyListToMatrix(adjacencyList: List[List[int]]) -> List[List[int]]:
+        'Converts an adjacency list into an adjacency matrix.'
+        length = len(adjacencyList)
+        adjacencyMatrix = [[0] * length for _ in range(length)]
+        for u, neighbours in enumerate(adjacencyList):
+            for v in neighbours:
+                adjacencyMatrix[u][v] = 1
+        return adjacencyMatrix
+
+    @staticmethod
+    def adjacencyMatrixToList(adjacencyMatrix: List[List]) -> List[List[int]]:
+        'Converts an adjacency matrix into an adjacency list, ignoring the diagonal.'
+        return [[v for v, c in enumerate(row) if c and u != v] for u, row in enumerate(adjacencyMatrix)]
 
     @staticmethod
     def getConnectedComponents(adjacencyMatrix: List[List]) -> List[Set]:
         'Returns the connected components of the graph.'
-        length = len(adjacencyMatrix)
+        return Graph.getConnectedComponentsFromList(Graph.adjacencyMatrixToList(adjacencyMatrix))
+
+    @staticmethod
+    def getConnectedComponentCount(adjacencyMatrix: List[List]) -> int:
+        'Returns the number of connected components for the graph. '
+        return Graph.getConnectedComponentCountFromList(Graph.adjacencyMatrixToList(adjacencyMatrix))
+
+    @staticmethod
+    def getConnectedComponentsFromList(adjacencyList: List[List[int]]) -> List[List[int]]:
+        'Returns the connected components (with more than one vertex) of a graph given as an adjacency list. Runs in O(V + E).'
+        length = len(adjacencyList)
         visited = [False] * length
         components = []
         for u in range(length):
@@ -437,41 +776,89 @@ calculating the distance matrix between all pairs of vertices in a graph"""
                 component = []
                 visited[u] = True
                 component.append(u)
-                Graph.__ccGetDfs(u, visited, adjacencyMatrix, component)
+                Graph.__ccGetDfs(u, visited, adjacencyList, component)
                 if len(component) > 1:
                     components.append(component)
         return components
 
     @staticmethod
-    def getConnectedComponentCount(adjacencyMatrix: List[List]) -> int:
-        'Returns the number of connected components for the graph. '
-        length = len(adjacencyMatrix)
+    def getBiconnectedComponentsFromList(adjacencyList: List[List[int]]) -> List[List[int]]:
+        """Returns the biconnected components of a graph given as an adjacency list, using Tarjan's algorithm with an edge stack.
+Each component is a sorted list of vertex ids; the components are sorted by their smallest vertex id. Runs in O(V + E)."""
+        length = len(adjacencyList)
+        disc, low = [-1] * length, [0] * length
+        components, time = [], 0
+        for root in range(length):
+            if disc[root] != -1 or not adjacencyList[root]:
+                continue
+            disc[root] = low[root] = time
+            time += 1
+            stack, edgeStack = [(root, -1, iter(adjacencyList[root]))], []
+            while stack:
+                u, parent, neighbours = stack[-1]
+                for v in neighbours:
+                    if disc[v] == -1:
+                        edgeStack.append((u, v))
+                        disc[v] = low[v] = time
+                        time += 1
+                        stack.append((v, u, iter(adjacencyList[v])))
+                        break
+                    if v != parent and disc[v] < disc[u]:
+                        edgeStack.append((u, v))
+                        low[u] = min(low[u], disc[v])
+                else:
+                    stack.pop()
+                    if not stack:
+                        continue
+                    parent = stack[-1][0]
+                    low[parent] = min(low[parent], low[u])
+                    if low[u] >= disc[parent]:
+                        component = set()
+                        while True:
+                            edge = edgeStack.pop()
+                            component.update(edge)
+                            if edge == (parent, u):
+                                break
+                        components.append(sorted(component))
+        components.sort()
+        return components
+
+    @staticmethod
+    def getConnectedComponentCountFromList(adjacencyList: List[List[int]]) -> int:
+        'Returns the number of connected components of a graph given as an adjacency list. Runs in O(V + E).'
+        length = len(adjacencyList)
         visited = [False] * length
         count = 0
         for u in range(length):
             if visited[u] is False:
                 visited[u] = True
                 count += 1
-                Graph.__ccCountDfs(u, visited, adjacencyMatrix)
+                Graph.__ccCountDfs(u, visited, adjacencyList)
         return count
 
     @staticmethod
-    def __ccCountDfs(u: int, visited: List[bool], adjacencyMatrix: List[List]) -> None:
-        'PRIVATE FUNCTION used by getConnectedComponentCount().'
-        for v in range(len(adjacencyMatrix[u])):
-            c = adjacencyMatrix[u][v]
-            if c is False or visited[v] or u == v:
-                continue
-            visited[v] = True
-            Graph.__ccCountDfs(v, visited, adjacencyMatrix)
+    def __ccCountDfs(u: int, visited: List[bool], adjacencyList: List[List[int]]) -> None:
+        'PRIVATE FUNCTION used by getConnectedComponentCountFromList().'
+        stack = [iter(adjacencyList[u])]
+        while stack:
+            for v in stack[-1]:
+                if not visited[v]:
+                    visited[v] = True
+                    stack.append(iter(adjacencyList[v]))
+                    break
+            else:
+                stack.pop()
 
     @staticmethod
-    def __ccGetDfs(u: int, visited: List[bool], adjacencyMatrix: List[List], component: list) -> None:
-        'PRIVATE FUNCTION used by getConnectedComponents().'
-        for v in range(len(adjacencyMatrix[u])):
-            c = adjacencyMatrix[u][v]
-            if c is False or visited[v] or u == v:
-                continue
-            visited[v] = True
-            component.append(v)
-            Graph.__ccGetDfs(v, visited, adjacencyMatrix, component)
\ No newline at end of file
+    def __ccGetDfs(u: int, visited: List[bool], adjacencyList: List[List[int]], component: list) -> None:
+        'PRIVATE FUNCTION used by getConnectedComponentsFromList().'
+        stack = [iter(adjacencyList[u])]
+        while stack:
+            for v in stack[-1]:
+                if not visited[v]:
+                    visited[v] = True
+                    component.append(v)
+                    stack.append(iter(adjacencyList[v]))
+                    break
+            else:
+                stack.pop()
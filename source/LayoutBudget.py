@@ -0,0 +1,52 @@
+from time import monotonic
+from typing import List
+
+
+class LayoutBudget:
+    """A per-molecule time and iteration budget for ring perception and layout. SSSR.getRings(), Graph.kkLayout(),
+Graph.smacofLayout() and OverlapScorer.getBestRotation() spend iterations from it and check it in their loops; once it
+has run out they fall back to a cheaper result (a fundamental cycle basis, circle placement or the last state reached)
+instead of running to completion, and record that here. Create one budget per molecule; the clock starts in the constructor.
+The deadline is an absolute time.monotonic() value, so a budget pickled to a worker process on the same host keeps it,
+but iterations spent in the worker are not counted here.
+seconds The time budget in seconds (None for no time limit).
+maxIterations The iteration budget, summed over all steps (None for no iteration limit).
+deadline The time.monotonic() value at which the time budget runs out.
+iterations The number of iterations spent so far.
+degraded A boolean indicating whether or not some step fell back to a cheaper result because the budget ran out.
+reasons The steps that fell back, e.g. ['sssr', 'kkLayout']."""
+
+    def __init__(self, seconds: float = None, maxIterations: int = None) -> None:
+        'The constructor of the class LayoutBudget.'
+        self.seconds = seconds
+        self.maxIterations = maxIterations
+        self.deadline = None if seconds is None else monotonic() + seconds
+        self.iterations = 0
+        self.degraded = False
+        self.reasons = []
+
+    def expired(self) -> bool:
+        'Returns whether or not the time or the iteration budget has run out.'
+        return (self.maxIterations is not None and self.iterations >= self.maxIterations) or \
+            (self.deadline is not None and monotonic() >= self.deadline)
+
+    def spend(self, iterations: int = 1) -> bool:
+        """Spends a number of iterations and returns whether or not they exceed the budget. Spending the last allowed
+iteration does not, but leaves the budget expired()."""
+        self.iterations += iterations
+        return (self.maxIterations is not None and self.iterations > self.maxIterations) or \
+            (self.deadline is not None and monotonic() >= self.deadline)
+
+    def getRemainingTime(self) -> float:
+        'Returns the remaining time in seconds (infinite if there is no time limit).'
+        return float('inf') if self.deadline is None else max(0.0, self.deadline - monotonic())
+
+    def degrade(self, reason: str) -> None:
+        'Records that a step fell back to a cheaper result.'
+        self.degraded = True
+        if reason not in self.reasons:
+            self.reasons.append(reason)
+
+    def getReasons(self) -> List[str]:
+        'Returns the steps that fell back to a cheaper result.'
+        return self.reasons
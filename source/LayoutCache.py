@@ -0,0 +1,75 @@
+import numpy as np
+from hashlib import blake2b
+from collections import OrderedDict
+from RingTemplates import RingTemplates
+from typing import List, Tuple, Union
+
+
+class LayoutCache:
+    """A bounded least recently used cache for the results of Graph.kkLayout.
+The key is a structural hash of the (sub)graph, built from the element labels and the distance matrix
+in canonical vertex order, together with the bond length. The values are the coordinates in canonical order,
+normalized to a canonical frame (centered, scaled to a bond length of 1.0 and rotated onto the principal axes),
+so the same ring system is laid out once, no matter where and in which atom order it occurs.
+maxSize The maximum number of cached layouts.
+maxLeaves The maximum number of leaves explored when searching for the canonical order of a symmetric (sub)graph.
+hits The number of lookups that found a cached layout.
+misses The number of lookups that did not find a cached layout.
+evictions The number of layouts dropped because the cache was full."""
+
+    def __init__(self, maxSize: int = 1024, maxLeaves: int = 5000) -> None:
+        'The constructor of the class LayoutCache.'
+        self.maxSize = maxSize
+        self.maxLeaves = maxLeaves
+        self.entries = OrderedDict()
+        self.hits, self.misses, self.evictions = 0, 0, 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def getKey(self, graph: 'Graph', vertexIds: List[int], matDist: np.ndarray,
+               bondLength: float) -> Tuple[Union[str, None], Union[List[int], None]]:
+        """Returns the structural hash of a (sub)graph and the canonical order of its vertices (order[label] = index).
+matDist is the distance matrix of the (sub)graph in the order of vertexIds. Returns (None, None) for graphs too symmetric to order."""
+        elements = [graph.vertices[vertexId].value.element for vertexId in vertexIds]
+        ranks = {element: rank for rank, element in enumerate(sorted(set(elements)))}
+        adjacencyList = graph.getSubgraphAdjacencyList(vertexIds)
+        bonds, order = RingTemplates.canonicalOrder(adjacencyList, [ranks[element] for element in elements], self.maxLeaves)
+        if bonds is None:
+            return None, None
+        digest = blake2b(digest_size=16)
+        digest.update(repr((bondLength, [elements[i] for i in order])).encode())
+        digest.update(np.ascontiguousarray(matDist[np.ix_(order, order)], dtype=np.int32).tobytes())
+        return digest.hexdigest(), order
+
+    def get(self, key: str, order: List[int]) -> Union[np.ndarray, None]:
+        'Returns the cached coordinates (for a bond length of 1.0) in the order of the (sub)graph, or None.'
+        if key is None or key not in self.entries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        arrPosition = np.empty((len(order), 2))
+        arrPosition[order] = self.entries[key]
+        return arrPosition
+
+    def put(self, key: str, order: List[int], arrPosition: np.ndarray, bondLength: float) -> None:
+        'Stores a layout given in the order of the (sub)graph, evicting the least recently used layout if the cache is full.'
+        if key is None:
+            return
+        arrPosition = arrPosition[order] - arrPosition.mean(axis=0)
+        _, _, vt = np.linalg.svd(arrPosition, full_matrices=False)
+        self.entries[key] = arrPosition @ vt.T / bondLength
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxSize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def getStats(self) -> dict:
+        'Returns the hit, miss and eviction counters and the current size of the cache.'
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'size': len(self.entries)}
+
+    def clear(self) -> None:
+        'Removes all cached layouts and resets the counters.'
+        self.entries.clear()
+        self.hits, self.misses, self.evictions = 0, 0, 0
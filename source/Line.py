@@ -1,4 +1,4 @@
-from math import sqrt, sin, cos
+from math import sqrt, sin, cos, atan2
 from Vector2 import Vector2
 
 
@@ -9,12 +9,16 @@ class Line:
 [elementFrom=null] A one-letter representation of the element associated with the vector marking the beginning of the line.
 [elementTo=null] A one-letter representation of the element associated with the vector marking the end of the line.
 [chiralFrom=false] Whether or not the from atom is a chiral center.
-[chiralTo=false] Whether or not the to atom is a chiral center. """
+[chiralTo=false] Whether or not the to atom is a chiral center.
+The shorten methods reuse one scratch vector of the class instead of allocating a vector per call. """
+    __slots__ = ('from_', 'to', 'elementFrom', 'elementTo', 'chiralFrom', 'chiralTo')
 
-    def __init__(self, from_=Vector2(0, 0), to=Vector2(0, 0), elementFrom=None, elementTo=None, chiralFrom=False, chiralTo=False):
+    _scratch = Vector2(0, 0)
+
+    def __init__(self, from_=None, to=None, elementFrom=None, elementTo=None, chiralFrom=False, chiralTo=False):
         'The constructor for the class Line.    '
-        self.from_ = from_
-        self.to = to
+        self.from_ = from_ if from_ is not None else Vector2(0, 0)
+        self.to = to if to is not None else Vector2(0, 0)
         self.elementFrom = elementFrom
         self.elementTo = elementTo
         self.chiralFrom = chiralFrom
@@ -30,9 +34,8 @@ class Line:
 
     def get_angle(self) -> float:
         'Returns the angle of the line in relation to the coordinate system (the x-axis).'
-        diff = Vector2.subtract(self.get_right_vector(),
-                                self.get_left_vector())
-        return diff.angle()
+        right, left = self.get_right_vector(), self.get_left_vector()
+        return atan2(right.y - left.y, right.x - left.x)
 
     def get_right_vector(self) -> 'Vector2':
         'Returns the right vector (the vector with the larger x value).'
@@ -97,18 +100,12 @@ class Line:
 
     def shorten_from(self, by: float) -> 'Line':
         'Shortens this line from the "from" direction by a given value (in pixels).'
-        f = Vector2.subtract(self.to, self.from_)
-        f.normalize()
-        f.multiply_scalar(by)
-        self.from_.add(f)
+        self.from_.iadd(Line._scratch.set_from(self.to).isub(self.from_).normalize().iscale(by))
         return self
 
     def shorten_to(self, by: float) -> 'Line':
         'Shortens this line from the "to" direction by a given value (in pixels).'
-        f = Vector2.subtract(self.from_, self.to)
-        f.normalize()
-        f.multiply_scalar(by)
-        self.to.add(f)
+        self.to.iadd(Line._scratch.set_from(self.from_).isub(self.to).normalize().iscale(by))
         return self
 
     def shorten_right(self, by: float) -> 'Line':
@@ -129,9 +126,7 @@ class Line:
 
     def shorten(self, by: float) -> 'Line':
         'Shortens this line from both directions by a given value (in pixels).'
-        f = Vector2.subtract(self.from_, self.to)
-        f.normalize()
-        f.multiplyScalar(by / 2.0)
-        self.to.add(f)
-        self.from_.subtract(f)
+        f = Line._scratch.set_from(self.from_).isub(self.to).normalize().iscale(by / 2.0)
+        self.to.iadd(f)
+        self.from_.isub(f)
         return self
@@ -0,0 +1,138 @@
+import numpy as np
+from array import array
+from typing import List, Tuple, Final
+from Atom import Atom
+from Edge import Edge
+from Graph import Graph
+from Vertex import Vertex
+from MoleculeViews import AtomView, VertexView, EdgeView
+
+
+class MoleculeStore:
+    """A columnar (struct-of-arrays) store for many molecules. Instead of a Vertex, an Atom, an Edge and their Vector2 objects
+per atom and bond, every attribute is a typed array over all atoms or bonds of all molecules, and VertexView, AtomView and
+EdgeView objects give existing call sites the familiar attributes on demand.
+Molecule m owns the atoms atomOffsets[m]:atomOffsets[m + 1] and the bonds bondOffsets[m]:bondOffsets[m + 1];
+vertex and edge ids as well as the sources and targets of the bonds are local to their molecule.
+elements The atomic numbers of the atoms (0 if unknown).
+charges The charges of the atoms.
+atomFlags Bit flags of the atoms (MoleculeStore.AROMATIC, MoleculeStore.RING).
+x, y The coordinates of the atoms.
+sources, targets The local atom indices of the bonds.
+bondOrders The orders (edge weights) of the bonds.
+bondTypeCodes The bond types as indices into MoleculeStore.bondTypes.
+bondFlags Bit flags of the bonds (MoleculeStore.AROMATIC, MoleculeStore.RING).
+The CSR adjacency over all atoms is built lazily by getCsr(), the neighbours and edge ids in it are local to the molecule."""
+
+    AROMATIC: Final = 1
+    RING: Final = 2
+    bondTypes: Final = ('-', '/', '\\', '=', '#', '$')
+    # first symbol per atomic number, e.g. 'C' rather than the aromatic 'c'
+    symbols: Final = {number: symbol for symbol, number in reversed(Atom.atomicNumbers.items())}
+
+    def __init__(self) -> None:
+        'The constructor of the class MoleculeStore.'
+        self.atomOffsets, self.bondOffsets = array('q', [0]), array('q', [0])
+        self.elements, self.charges, self.atomFlags = array('B'), array('b'), array('B')
+        self.x, self.y = array('d'), array('d')
+        self.sources, self.targets = array('q'), array('q')
+        self.bondOrders, self.bondTypeCodes, self.bondFlags = array('B'), array('B'), array('B')
+        self.csrOffsets, self.csrNeighbours, self.csrEdgeIds = np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        self._csrValid = True
+
+    def __len__(self) -> int:
+        return len(self.atomOffsets) - 1
+
+    def addGraph(self, graph: 'Graph') -> int:
+        'Appends the atoms, bonds and positions of a graph as a new molecule and returns its index.'
+        ringAtoms = graph.getComponentsAdjacencyList()
+        bridges = {(u, v) if u < v else (v, u) for u, v in graph.getBridges()}
+        for vertex in graph.vertices:
+            atom = vertex.value
+            self.elements.append(Atom.atomicNumbers.get(atom.element, 0))
+            self.charges.append((atom.bracket.get('charge') or 0) if atom.bracket else 0)
+            self.atomFlags.append(self.AROMATIC * bool(atom.isPartOfAromaticRing) | self.RING * bool(ringAtoms[vertex.id]))
+            self.x.append(vertex.position.x)
+            self.y.append(vertex.position.y)
+        for edge in graph.edges:
+            key = (edge.sourceId, edge.targetId) if edge.sourceId < edge.targetId else (edge.targetId, edge.sourceId)
+            self.sources.append(edge.sourceId)
+            self.targets.append(edge.targetId)
+            self.bondOrders.append(edge.weight)
+            self.bondTypeCodes.append(self.bondTypes.index(edge.bondType))
+            self.bondFlags.append(self.AROMATIC * bool(edge.isPartOfAromaticRing) | self.RING * (key not in bridges))
+        self.atomOffsets.append(len(self.elements))
+        self.bondOffsets.append(len(self.sources))
+        self._csrValid = False
+        return len(self) - 1
+
+    def getAtomCount(self, molecule: int) -> int:
+        'Returns the number of atoms of a molecule.'
+        return self.atomOffsets[molecule + 1] - self.atomOffsets[molecule]
+
+    def getBondCount(self, molecule: int) -> int:
+        'Returns the number of bonds of a molecule.'
+        return self.bondOffsets[molecule + 1] - self.bondOffsets[molecule]
+
+    def getSymbol(self, atomicNumber: int) -> str:
+        'Returns the element symbol of an atomic number.'
+        return self.symbols.get(atomicNumber, '*')
+
+    def getCsr(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Returns the CSR adjacency (offsets, neighbours, edgeIds) over all atoms of the store. The neighbours of the atom
+with global index i are neighbours[offsets[i]:offsets[i + 1]], sorted, as local atom indices; edgeIds holds the local ids of the bonds."""
+        if not self._csrValid:
+            self.__buildCsr()
+        return self.csrOffsets, self.csrNeighbours, self.csrEdgeIds
+
+    def __buildCsr(self) -> None:
+        'PRIVATE FUNCTION used by getCsr().'
+        atomOffsets, bondOffsets = np.frombuffer(self.atomOffsets, dtype=np.int64), np.frombuffer(self.bondOffsets, dtype=np.int64)
+        sources, targets = np.frombuffer(self.sources, dtype=np.int64), np.frombuffer(self.targets, dtype=np.int64)
+        bondsPerMolecule = np.diff(bondOffsets)
+        offset = np.repeat(atomOffsets[:-1], bondsPerMolecule)
+        localIds = np.arange(len(sources)) - np.repeat(bondOffsets[:-1], bondsPerMolecule)
+        ends = np.concatenate((sources + offset, targets + offset))
+        neighbours = np.concatenate((targets, sources))
+        order = np.lexsort((neighbours, ends))
+        self.csrOffsets = np.zeros(len(self.elements) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(ends, minlength=len(self.elements)), out=self.csrOffsets[1:])
+        self.csrNeighbours = neighbours[order]
+        self.csrEdgeIds = np.concatenate((localIds, localIds))[order]
+        self._csrValid = True
+
+    def getVertices(self, molecule: int) -> List[VertexView]:
+        'Returns views of the vertices of a molecule.'
+        return [VertexView(self, molecule, i) for i in range(self.getAtomCount(molecule))]
+
+    def getEdges(self, molecule: int) -> List[EdgeView]:
+        'Returns views of the edges of a molecule.'
+        return [EdgeView(self, molecule, i) for i in range(self.getBondCount(molecule))]
+
+    def getPositions(self, molecule: int) -> np.ndarray:
+        'Returns the coordinates of the atoms of a molecule as an (n, 2) array (a copy).'
+        start, end = self.atomOffsets[molecule], self.atomOffsets[molecule + 1]
+        return np.column_stack((np.frombuffer(self.x, dtype=np.float64)[start:end], np.frombuffer(self.y, dtype=np.float64)[start:end]))
+
+    def toGraph(self, molecule: int) -> 'Graph':
+        'Materializes a molecule as a Graph of Vertex, Atom and Edge objects, for code that needs the full objects.'
+        graph = Graph(None)
+        start = self.atomOffsets[molecule]
+        for i in range(self.getAtomCount(molecule)):
+            atom = Atom(self.getSymbol(self.elements[start + i]))
+            atom.isPartOfAromaticRing = bool(self.atomFlags[start + i] & self.AROMATIC)
+            vertex = Vertex(atom)
+            vertex.position.x, vertex.position.y = self.x[start + i], self.y[start + i]
+            graph.addVertex(vertex)
+        for view in self.getEdges(molecule):
+            edge = Edge(view.sourceId, view.targetId, view.weight)
+            edge.bondType = view.bondType
+            graph.addEdge(edge)
+        return graph
+
+    def nbytes(self) -> int:
+        'Returns the number of bytes held by the columns and the CSR index.'
+        columns = (self.atomOffsets, self.bondOffsets, self.elements, self.charges, self.atomFlags, self.x, self.y,
+                   self.sources, self.targets, self.bondOrders, self.bondTypeCodes, self.bondFlags)
+        return sum(column.itemsize * len(column) for column in columns) + \
+            self.csrOffsets.nbytes + self.csrNeighbours.nbytes + self.csrEdgeIds.nbytes
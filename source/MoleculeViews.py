@@ -0,0 +1,147 @@
+from typing import List
+
+
+class AtomView:
+    """A lightweight read-only view of an atom in a MoleculeStore, offering the Atom attributes the store keeps.
+store The MoleculeStore.
+index The global atom index in the store."""
+    __slots__ = ('store', 'index')
+
+    def __init__(self, store: 'MoleculeStore', index: int) -> None:
+        'The constructor of the class AtomView.'
+        self.store = store
+        self.index = index
+
+    @property
+    def element(self) -> str:
+        return self.store.getSymbol(self.store.elements[self.index])
+
+    @property
+    def atomicNumber(self) -> int:
+        return self.store.elements[self.index]
+
+    @property
+    def charge(self) -> int:
+        return self.store.charges[self.index]
+
+    @property
+    def isPartOfAromaticRing(self) -> bool:
+        return bool(self.store.atomFlags[self.index] & self.store.AROMATIC)
+
+    @property
+    def isInRing(self) -> bool:
+        return bool(self.store.atomFlags[self.index] & self.store.RING)
+
+    def isHeteroAtom(self) -> bool:
+        'Returns whether this atom is a heteroatom (not C and not H).'
+        return self.atomicNumber not in (1, 6)
+
+
+class PositionView:
+    """A view of the position of an atom in a MoleculeStore with the x and y attributes of a Vector2, writing through to the store.
+store The MoleculeStore.
+index The global atom index in the store."""
+    __slots__ = ('store', 'index')
+
+    def __init__(self, store: 'MoleculeStore', index: int) -> None:
+        'The constructor of the class PositionView.'
+        self.store = store
+        self.index = index
+
+    @property
+    def x(self) -> float:
+        return self.store.x[self.index]
+
+    @x.setter
+    def x(self, value: float) -> None:
+        self.store.x[self.index] = value
+
+    @property
+    def y(self) -> float:
+        return self.store.y[self.index]
+
+    @y.setter
+    def y(self, value: float) -> None:
+        self.store.y[self.index] = value
+
+
+class VertexView:
+    """A lightweight view of a vertex of a molecule in a MoleculeStore. Ids are local to the molecule, like in a Graph.
+store The MoleculeStore.
+molecule The index of the molecule in the store.
+id The id of the vertex in the molecule."""
+    __slots__ = ('store', 'molecule', 'id')
+
+    def __init__(self, store: 'MoleculeStore', molecule: int, vertexId: int) -> None:
+        'The constructor of the class VertexView.'
+        self.store = store
+        self.molecule = molecule
+        self.id = vertexId
+
+    @property
+    def value(self) -> AtomView:
+        return AtomView(self.store, self.store.atomOffsets[self.molecule] + self.id)
+
+    @property
+    def position(self) -> PositionView:
+        return PositionView(self.store, self.store.atomOffsets[self.molecule] + self.id)
+
+    @property
+    def neighbours(self) -> List[int]:
+        return self.getNeighbours()
+
+    @property
+    def edges(self) -> List[int]:
+        offsets, _, edgeIds = self.store.getCsr()
+        index = self.store.atomOffsets[self.molecule] + self.id
+        return edgeIds[offsets[index]:offsets[index + 1]].tolist()
+
+    def getNeighbours(self, vertexId: int = None) -> List[int]:
+        'Returns an array of ids of neighbouring vertices, optionally without vertexId.'
+        offsets, neighbours, _ = self.store.getCsr()
+        index = self.store.atomOffsets[self.molecule] + self.id
+        return [neighbour for neighbour in neighbours[offsets[index]:offsets[index + 1]].tolist() if neighbour != vertexId]
+
+    def getNeighbourCount(self) -> int:
+        'Returns the number of neighbours of this vertex.'
+        offsets, _, _ = self.store.getCsr()
+        index = self.store.atomOffsets[self.molecule] + self.id
+        return int(offsets[index + 1] - offsets[index])
+
+
+class EdgeView:
+    """A lightweight read-only view of an edge of a molecule in a MoleculeStore. Ids are local to the molecule, like in a Graph.
+store The MoleculeStore.
+molecule The index of the molecule in the store.
+id The id of the edge in the molecule."""
+    __slots__ = ('store', 'molecule', 'id')
+
+    def __init__(self, store: 'MoleculeStore', molecule: int, edgeId: int) -> None:
+        'The constructor of the class EdgeView.'
+        self.store = store
+        self.molecule = molecule
+        self.id = edgeId
+
+    @property
+    def sourceId(self) -> int:
+        return self.store.sources[self.store.bondOffsets[self.molecule] + self.id]
+
+    @property
+    def targetId(self) -> int:
+        return self.store.targets[self.store.bondOffsets[self.molecule] + self.id]
+
+    @property
+    def bondType(self) -> str:
+        return self.store.bondTypes[self.store.bondTypeCodes[self.store.bondOffsets[self.molecule] + self.id]]
+
+    @property
+    def weight(self) -> int:
+        return self.store.bondOrders[self.store.bondOffsets[self.molecule] + self.id]
+
+    @property
+    def isPartOfAromaticRing(self) -> bool:
+        return bool(self.store.bondFlags[self.store.bondOffsets[self.molecule] + self.id] & self.store.AROMATIC)
+
+    @property
+    def isInRing(self) -> bool:
+        return bool(self.store.bondFlags[self.store.bondOffsets[self.molecule] + self.id] & self.store.RING)
@@ -0,0 +1,104 @@
+import numpy as np
+from Vector2 import Vector2
+from SpatialGrid import SpatialGrid
+from Graph import Graph
+from typing import List, Tuple, Union
+
+
+class OverlapScorer:
+    """Vectorized overlap scores of a graph layout, the scores that overlap resolution minimizes. Two drawn vertices closer
+than the bond length overlap by (bondLength - distance) / bondLength; the score of a vertex is the sum of its overlaps
+and the total score the sum over all pairs. The close pairs come from a SpatialGrid (Graph.spatialGrid, or a temporary
+grid), so scoring is linear in the number of vertices, and candidate rotations of a subtree are scored as one batch.
+graph The graph whose vertex positions (Graph.coordinates) are scored.
+bondLength The bond length of the layout.
+overlapSensitivity The vertex score above which a vertex counts as overlapping in getSubtreeOverlapScore()."""
+
+    def __init__(self, graph: 'Graph', bondLength: float, overlapSensitivity: float = 0.42) -> None:
+        'The constructor of the class OverlapScorer.'
+        self.graph = graph
+        self.bondLength = bondLength
+        self.overlapSensitivity = overlapSensitivity
+
+    def __getDrawn(self) -> np.ndarray:
+        'PRIVATE FUNCTION. Returns a boolean array marking the drawn vertices.'
+        return np.fromiter((vertex.value.isDrawn for vertex in self.graph.vertices), dtype=bool, count=len(self.graph.vertices))
+
+    def __getPairOverlaps(self, drawn: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        'PRIVATE FUNCTION used by getOverlapScore() and scoreRotations(). Returns the overlapping pairs of drawn vertices and their overlaps.'
+        grid = self.graph.spatialGrid
+        if grid is None:
+            grid = SpatialGrid(self.graph, self.bondLength)
+        else:
+            grid.update()
+        pairs = grid.getPairsWithin(self.bondLength)
+        pairs = pairs[drawn[pairs[:, 0]] & drawn[pairs[:, 1]]]
+        coordinates = self.graph.coordinates
+        distances = np.hypot(*(coordinates[pairs[:, 0]] - coordinates[pairs[:, 1]]).T)
+        return pairs, (self.bondLength - distances) / self.bondLength
+
+    def getOverlapScore(self) -> dict:
+        """Returns the overlap scores of the current layout as a dict with the total score ('total'), the score of every vertex
+('vertexScores', an array indexed by vertex id) and the vertices sorted by decreasing score ('scores', dicts with 'id' and 'score')."""
+        pairs, overlaps = self.__getPairOverlaps(self.__getDrawn())
+        count = len(self.graph.vertices)
+        vertexScores = np.bincount(pairs[:, 0], overlaps, minlength=count) + np.bincount(pairs[:, 1], overlaps, minlength=count)
+        order = np.argsort(-vertexScores, kind='stable')
+        return {
+            'total': float(overlaps.sum()),
+            'scores': [{'id': int(vertexId), 'score': float(vertexScores[vertexId])} for vertexId in order],
+            'vertexScores': vertexScores
+        }
+
+    def getSubtreeOverlapScore(self, vertexId: int, parentVertexId: int, vertexScores: np.ndarray) -> dict:
+        """Returns the overlap score of the subtree of vertexId pointing away from parentVertexId: the mean score of its
+overlapping vertices ('value') and the overlap-weighted center of its vertices ('center')."""
+        vertexIds = self.graph.getSubtreeVertexIds(vertexId, parentVertexId)
+        vertexIds = vertexIds[self.__getDrawn()[vertexIds]]
+        scores = vertexScores[vertexIds]
+        overlapping = scores > self.overlapSensitivity
+        score = float(scores[overlapping].sum())
+        count = int(overlapping.sum())
+        x, y = scores @ self.graph.coordinates[vertexIds] / score if score else (0.0, 0.0)
+        return {'value': score / count if count else 0.0, 'center': Vector2(float(x), float(y))}
+
+    def scoreRotations(self, vertexId: int, parentVertexId: int, angles: Union[List[float], np.ndarray], center: 'Vector2') -> np.ndarray:
+        """Returns the total overlap score the layout would have after rotating the subtree of vertexId (pointing away from
+parentVertexId) around center by each of the given angles, without moving any vertex. Only the overlaps between the
+subtree and the rest of the graph change under the rotation; they are computed for all angles at once, against the
+vertices whose distance to the center of rotation can bring them within a bond length of the subtree."""
+        drawn = self.__getDrawn()
+        pairs, overlaps = self.__getPairOverlaps(drawn)
+        subtreeIds = self.graph.getSubtreeVertexIds(vertexId, parentVertexId)
+        inSubtree = np.zeros(len(self.graph.vertices), dtype=bool)
+        inSubtree[subtreeIds] = True
+        fixed = float(overlaps[inSubtree[pairs[:, 0]] == inSubtree[pairs[:, 1]]].sum())
+        coordinates = self.graph.coordinates
+        subtreeIds = subtreeIds[drawn[subtreeIds]]
+        origin = np.array((center.x, center.y))
+        subtreeRadii = np.hypot(*(coordinates[subtreeIds] - origin).T)
+        restIds = np.flatnonzero(drawn & ~inSubtree)
+        restRadii = np.hypot(*(coordinates[restIds] - origin).T)
+        if len(subtreeIds):
+            near = (restRadii > subtreeRadii.min() - self.bondLength) & (restRadii < subtreeRadii.max() + self.bondLength)
+            restIds = restIds[near]
+        angles = np.asarray(angles, dtype=float)
+        if not len(subtreeIds) or not len(restIds):
+            return np.full(len(angles), fixed)
+        candidates = Graph.rotateCoordinates(coordinates[subtreeIds], angles, center)
+        delta = candidates[:, :, np.newaxis, :] - coordinates[restIds][np.newaxis, np.newaxis, :, :]
+        distances = np.sqrt(np.einsum('kmrd,kmrd->kmr', delta, delta))
+        crossing = np.where(distances < self.bondLength, (self.bondLength - distances) / self.bondLength, 0.0)
+        return fixed + crossing.sum(axis=(1, 2))
+
+    def getBestRotation(self, vertexId: int, parentVertexId: int, angles: Union[List[float], np.ndarray],
+                        center: 'Vector2', budget: 'LayoutBudget' = None) -> Tuple[float, float]:
+        """Returns the angle with the lowest total overlap score among the candidate rotations of a subtree, and that score.
+Every candidate spends one iteration of the optional budget; if that exhausts it, the candidates are not scored and
+the subtree is left as it is: the angle 0.0 is returned with the current score."""
+        if budget is not None and budget.spend(len(angles)):
+            budget.degrade('overlap')
+            return 0.0, self.getOverlapScore()['total']
+        totals = self.scoreRotations(vertexId, parentVertexId, angles, center)
+        best = int(np.argmin(totals))
+        return float(np.asarray(angles, dtype=float)[best]), float(totals[best])
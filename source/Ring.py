@@ -21,12 +21,23 @@ isPartOfBridged A boolean whether or not this ring is part of a bridge ring.
 isSpiro A boolean whether or not this ring is part of a spiro.
 isFused A boolean whether or not this ring is part of a fused ring.
 centralAngle The central angle of this ring.
-canFlip A boolean indicating whether or not this ring allows flipping of attached vertices to the inside of the ring."""
+canFlip A boolean indicating whether or not this ring allows flipping of attached vertices to the inside of the ring.
+memberSet A frozen set of the vertex ids of the ring members.
+orderedMembers A tuple of the member vertex ids in the order they are bonded around the ring, built once by buildOrder().
+edgeIds A tuple of the ids of the ring bonds, edgeIds[i] connecting orderedMembers[i] and orderedMembers[i + 1].
+positions A dict mapping the member vertex ids to their index in orderedMembers."""
+    __slots__ = ('id', 'members', 'memberSet', 'orderedMembers', 'edgeIds', 'positions', 'edges', 'insiders',
+                 'neighbours', 'positioned', 'center', 'rings', 'isBridged', 'isPartOfBridged', 'isSpiro', 'isFused',
+                 'centralAngle', 'canFlip')
 
     def __init__(self, members: List[float]) -> None:
         'The constructor for the class Ring.'
         self.id = None
         self.members = members
+        self.memberSet = frozenset(members)
+        self.orderedMembers = None
+        self.edgeIds = None
+        self.positions = None
         self.edges = []
         self.insiders = []
         self.neighbours = []
@@ -55,6 +66,7 @@ canFlip A boolean indicating whether or not this ring allows flipping of attache
         clone.isFused = self.isFused
         clone.centralAngle = self.centralAngle
         clone.canFlip = self.canFlip
+        clone.orderedMembers, clone.edgeIds, clone.positions = self.orderedMembers, self.edgeIds, self.positions
         return clone
 
     def get_size(self) -> int:
@@ -69,10 +81,63 @@ canFlip A boolean indicating whether or not this ring allows flipping of attache
         'Returns the angle of this ring in relation to the coordinate system.'
         return pi - self.centralAngle
 
+    def buildOrder(self, vertices: List['Vertex']) -> bool:
+        """Orders the members by walking the ring bonds once, and records the ids of the ring bonds and the position of each member.
+The ring bonds are the bonds shared by two members. Returns False, leaving the ring unordered, if the members
+do not form a simple cycle (e.g. a bridged ring)."""
+        if self.orderedMembers is not None:
+            return True
+        bonded = {}
+        for member in self.members:
+            for edgeId in vertices[member].edges:
+                bonded.setdefault(edgeId, []).append(member)
+        ringBonds = {member: [] for member in self.members}
+        for edgeId, members in bonded.items():
+            if len(members) == 2:
+                ringBonds[members[0]].append((members[1], edgeId))
+                ringBonds[members[1]].append((members[0], edgeId))
+        if any(len(bonds) != 2 for bonds in ringBonds.values()):
+            return False
+        start = self.members[0]
+        orderedMembers, edgeIds = [start], []
+        previous, (current, edgeId) = start, ringBonds[start][0]
+        while current != start:
+            orderedMembers.append(current)
+            edgeIds.append(edgeId)
+            a, b = ringBonds[current]
+            previous, (current, edgeId) = current, (b if a[0] == previous else a)
+        edgeIds.append(edgeId)
+        if len(orderedMembers) != len(self.members):
+            return False
+        self.orderedMembers, self.edgeIds = tuple(orderedMembers), tuple(edgeIds)
+        self.positions = {member: i for i, member in enumerate(orderedMembers)}
+        return True
+
     def each_member(self, vertices: List['Vertex'], callback: Callable, startVertexId: float = None, previousVertexId: float = None) -> None:
-        'Loops over the members of this ring from a given start position in a direction opposite to the vertex id passed as the previousId.'
-        if startVertexId in (None, 0):
+        """Loops over the members of this ring from a given start position in a direction opposite to the vertex id passed as the previousId.
+For simple rings this is a rotation of orderedMembers; the direction is the one towards the first ring neighbour of the start vertex
+(in the order of its neighbours) that is not previousVertexId."""
+        if startVertexId is None:
             startVertexId = self.members[0]
+        if not self.buildOrder(vertices):
+            self.__walk_members(vertices, callback, startVertexId, previousVertexId)
+            return
+        order, length = self.orderedMembers, len(self.orderedMembers)
+        position = self.positions[startVertexId]
+        after, before = order[(position + 1) % length], order[position - 1]
+        step = 1
+        for neighbour in vertices[startVertexId].neighbours:
+            if neighbour != previousVertexId and neighbour in (after, before):
+                step = 1 if neighbour == after else -1
+                break
+        else:
+            if previousVertexId == after:
+                step = -1
+        for i in range(length):
+            callback(order[(position + step * i) % length])
+
+    def __walk_members(self, vertices: List['Vertex'], callback: Callable, startVertexId: float, previousVertexId: float) -> None:
+        'PRIVATE FUNCTION used by each_member() for rings whose members do not form a simple cycle.'
         current = startVertexId
         max_iter = 0
         while (current is not None) and (max_iter < 100):
@@ -85,11 +150,19 @@ canFlip A boolean indicating whether or not this ring allows flipping of attache
                 current = None
             max_iter += 1
 
+    def getOrderedMembers(self, vertices: List['Vertex']) -> List[float]:
+        'Returns the member vertex ids in the order they are bonded around the ring, or the members if the ring is not a simple cycle.'
+        return list(self.orderedMembers) if self.buildOrder(vertices) else list(self.members)
+
+    def getPosition(self, vertexId: float) -> float:
+        'Returns the position of a member in orderedMembers, or None. Requires buildOrder() to have been called.'
+        return None if self.positions is None else self.positions.get(vertexId)
+
     def get_ordered_neighbours(self, ringConnections: List['RingConnection']) -> List[dict]:
         'Returns an array containing the neighbouring rings of this ring ordered by ring size.'
         orderedNeighbours = [None] * len(self.neighbours)
         for i, neighbour in enumerate(self.neighbours):
-            vertices = RingConnection.get_vertices(
+            vertices = RingConnection.getVertices(
                 ringConnections, self.id, neighbour)
             orderedNeighbours[i] = {
                 'n': len(vertices),
@@ -110,4 +183,4 @@ canFlip A boolean indicating whether or not this ring allows flipping of attache
 
     def contains(self, vertexId: float) -> bool:
         'Checks whether or not this ring contains a member with a given vertex id.'
-        return vertexId in self.members
+        return vertexId in self.memberSet
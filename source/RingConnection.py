@@ -1,6 +1,6 @@
-from Ring import Ring
 from Vertex import Vertex
-from typing import List, Set
+from RingConnectionRegistry import RingConnectionRegistry
+from typing import List, Set, Union
 
 
 class RingConnection:
@@ -9,15 +9,14 @@ id The id of this ring connection.
 firstRingId A ring id.
 secondRingId A ring id.
 vertices A set containing the vertex ids participating in the ring connection."""
+    __slots__ = ('id', 'firstRingId', 'secondRingId', 'vertices')
 
     def __init__(self, firstRing: 'Ring', secondRing: 'Ring') -> None:
         'The constructor for the class RingConnection.'
         self.id = None
         self.firstRingId = firstRing.id
         self.secondRingId = secondRing.id
-        self.vertices = set()
-        [self.addVertex(m) for m in firstRing.members
-         for n in secondRing.members if m == n]
+        self.vertices = firstRing.memberSet & secondRing.memberSet
 
     def addVertex(self, vertexId: float) -> None:
         'Adding a vertex to the ring connection.'
@@ -34,28 +33,32 @@ vertices A set containing the vertex ids participating in the ring connection.""
         'Returns a boolean indicating whether or not a ring with a given id is participating in this ring connection.'
         return self.firstRingId == ringId or self.secondRingId == ringId
 
-    def isBridge(self, vertices: List['Vertex']) -> bool:
+    def isBridgeConnection(self, vertices: List['Vertex']) -> bool:
         'Checks whether or not this ring connection is a bridge in a bridged ring.'
         if len(self.vertices) > 2:
             return True
         for vertexId in self.vertices:
             if len(vertices[vertexId].value.rings) > 2:
                 return True
-        else:
-            return False
+        return False
 
     @staticmethod
-    def isBridge(ringConnections: List['RingConnection'], vertices: List['Vertex'], firstRingId: float, secondRingId: float) -> bool:
-        'Checks whether or not two rings are connected by a bridged bond.'
+    def isBridge(ringConnections: Union[RingConnectionRegistry, List['RingConnection']], vertices: List['Vertex'],
+                 firstRingId: float, secondRingId: float) -> bool:
+        'Checks whether or not two rings are connected by a bridged bond. Uses the index if ringConnections is a RingConnectionRegistry.'
+        if isinstance(ringConnections, RingConnectionRegistry):
+            return ringConnections.isBridge(vertices, firstRingId, secondRingId)
         for ringConnection in ringConnections:
             if (ringConnection.firstRingId == firstRingId and ringConnection.secondRingId == secondRingId) or \
                (ringConnection.firstRingId == secondRingId and ringConnection.secondRingId == firstRingId):
-                return ringConnection.isBridge(vertices)
+                return ringConnection.isBridgeConnection(vertices)
         return False
 
     @staticmethod
-    def getNeighbours(ringConnections: List['RingConnection'], ringId: float) -> List[float]:
-        'Retruns the neighbouring rings of a given ring.'
+    def getNeighbours(ringConnections: Union[RingConnectionRegistry, List['RingConnection']], ringId: float) -> List[float]:
+        'Retruns the neighbouring rings of a given ring. Uses the index if ringConnections is a RingConnectionRegistry.'
+        if isinstance(ringConnections, RingConnectionRegistry):
+            return ringConnections.getNeighbours(ringId)
         neighbours = []
         for ringConnection in ringConnections:
             if ringConnection.firstRingId == ringId:
@@ -65,8 +68,10 @@ vertices A set containing the vertex ids participating in the ring connection.""
         return neighbours
 
     @staticmethod
-    def getVertices(ringConnections: List['RingConnection'], firstRingId: float, secondRingId: float) -> List[float]:
-        'Returns an array of vertex ids associated with a given ring connection.'
+    def getVertices(ringConnections: Union[RingConnectionRegistry, List['RingConnection']], firstRingId: float, secondRingId: float) -> List[float]:
+        'Returns an array of vertex ids associated with a given ring connection. Uses the index if ringConnections is a RingConnectionRegistry.'
+        if isinstance(ringConnections, RingConnectionRegistry):
+            return ringConnections.getVertices(firstRingId, secondRingId)
         for ringConnection in ringConnections:
             if (ringConnection.firstRingId == firstRingId and ringConnection.secondRingId == secondRingId) or \
                (ringConnection.firstRingId == secondRingId and ringConnection.secondRingId == firstRingId):
@@ -0,0 +1,101 @@
+from typing import List, Dict, Tuple, Iterator, Union
+
+
+class RingConnectionRegistry:
+    """An indexed collection of ring connections. Connections are indexed by id, by the unordered pair of ring ids they connect
+and by each of their ring ids, so lookups by ring pair or by ring are O(1) instead of a scan over all connections.
+The ring ids of a registered connection must be changed through updateOther() to keep the indices valid.
+ringConnections A dict mapping the ring connection ids to the ring connections, in insertion order.
+pairs A dict mapping an unordered pair of ring ids (smaller id first) to the id of the ring connection between them.
+ringIndex A dict mapping a ring id to the ids of the ring connections it participates in, in insertion order."""
+
+    def __init__(self, ringConnections: List['RingConnection'] = None) -> None:
+        'The constructor of the class RingConnectionRegistry.'
+        self.ringConnections = {}
+        self.pairs = {}
+        self.ringIndex = {}
+        self.nextId = 0
+        for ringConnection in ringConnections or []:
+            self.add(ringConnection)
+
+    def __len__(self) -> int:
+        return len(self.ringConnections)
+
+    def __iter__(self) -> Iterator['RingConnection']:
+        return iter(list(self.ringConnections.values()))
+
+    def add(self, ringConnection: 'RingConnection') -> int:
+        'Adds a ring connection, assigning it an id if it does not have one, and returns the id.'
+        if ringConnection.id is None:
+            ringConnection.id = self.nextId
+        self.nextId = max(self.nextId, ringConnection.id + 1)
+        self.ringConnections[ringConnection.id] = ringConnection
+        self.__index(ringConnection)
+        return ringConnection.id
+
+    def remove(self, ringConnectionId: int) -> 'RingConnection':
+        'Removes a ring connection and returns it.'
+        ringConnection = self.ringConnections.pop(ringConnectionId)
+        self.__unindex(ringConnection)
+        return ringConnection
+
+    def get(self, ringConnectionId: int) -> Union['RingConnection', None]:
+        'Returns the ring connection with a given id or None.'
+        return self.ringConnections.get(ringConnectionId)
+
+    def updateOther(self, ringConnectionId: int, ringId: int, otherRingId: int) -> None:
+        'Updates the ring id of a ring connection that is not otherRingId to ringId and re-indexes the connection.'
+        ringConnection = self.ringConnections[ringConnectionId]
+        self.__unindex(ringConnection)
+        ringConnection.updateOther(ringId, otherRingId)
+        self.__index(ringConnection)
+
+    def getConnection(self, firstRingId: int, secondRingId: int) -> Union['RingConnection', None]:
+        'Returns the ring connection between two rings or None.'
+        ringConnectionId = self.pairs.get(RingConnectionRegistry.getPair(firstRingId, secondRingId))
+        return None if ringConnectionId is None else self.ringConnections[ringConnectionId]
+
+    def getConnections(self, ringId: int) -> List['RingConnection']:
+        'Returns the ring connections a ring participates in.'
+        return [self.ringConnections[ringConnectionId] for ringConnectionId in self.ringIndex.get(ringId, ())]
+
+    def getNeighbours(self, ringId: int) -> List[int]:
+        'Returns the neighbouring rings of a given ring.'
+        return [ringConnection.secondRingId if ringConnection.firstRingId == ringId else ringConnection.firstRingId
+                for ringConnection in self.getConnections(ringId)]
+
+    def getVertices(self, firstRingId: int, secondRingId: int) -> List[int]:
+        'Returns an array of vertex ids associated with the ring connection between two rings.'
+        ringConnection = self.getConnection(firstRingId, secondRingId)
+        return None if ringConnection is None else list(ringConnection.vertices)
+
+    def isBridge(self, vertices: List['Vertex'], firstRingId: int, secondRingId: int) -> bool:
+        'Checks whether or not two rings are connected by a bridged bond.'
+        ringConnection = self.getConnection(firstRingId, secondRingId)
+        return ringConnection is not None and ringConnection.isBridgeConnection(vertices)
+
+    @staticmethod
+    def getPair(firstRingId: int, secondRingId: int) -> Tuple[int, int]:
+        'Returns the key of an unordered pair of ring ids.'
+        return (firstRingId, secondRingId) if firstRingId <= secondRingId else (secondRingId, firstRingId)
+
+    def __index(self, ringConnection: 'RingConnection') -> None:
+        'PRIVATE FUNCTION used by add() and updateOther().'
+        self.pairs.setdefault(RingConnectionRegistry.getPair(ringConnection.firstRingId, ringConnection.secondRingId), ringConnection.id)
+        for ringId in (ringConnection.firstRingId, ringConnection.secondRingId):
+            self.ringIndex.setdefault(ringId, {})[ringConnection.id] = None
+
+    def __unindex(self, ringConnection: 'RingConnection') -> None:
+        'PRIVATE FUNCTION used by remove() and updateOther(). Falls back to another connection between the same rings, if any.'
+        pair = RingConnectionRegistry.getPair(ringConnection.firstRingId, ringConnection.secondRingId)
+        for ringId in pair:
+            connectionIds = self.ringIndex.get(ringId, {})
+            connectionIds.pop(ringConnection.id, None)
+            if not connectionIds:
+                self.ringIndex.pop(ringId, None)
+        if self.pairs.get(pair) == ringConnection.id:
+            del self.pairs[pair]
+            for other in self.getConnections(pair[0]):
+                if RingConnectionRegistry.getPair(other.firstRingId, other.secondRingId) == pair:
+                    self.pairs[pair] = other.id
+                    break
@@ -0,0 +1,112 @@
+from RingConnection import RingConnection
+from RingConnectionRegistry import RingConnectionRegistry
+from typing import List, Dict, Union
+
+
+class RingSystemGraph:
+    """A graph with the rings of a molecule as nodes and the ring connections (shared atoms) as edges, built once from the rings.
+Every connection is labelled 'spiro' (one shared atom), 'fused' (one shared bond) or 'bridged' (more than two shared atoms,
+or a shared atom that is part of more than two rings), and every ring gets the flags isSpiro, isFused and isPartOfBridged
+of its connections, in a single pass over the atoms and the connections.
+rings A dict mapping the ring ids to the rings.
+ringConnections A RingConnectionRegistry with the connections between the rings.
+connectionTypes A dict mapping the ring connection ids to their label.
+systems The ring systems (connected components of this graph) as lists of ring ids, sorted by their smallest ring id.
+bridgedGroups The groups of rings connected by bridged connections, i.e. the rings that form one bridged ring, as lists of ring ids."""
+
+    def __init__(self, rings: List['Ring']) -> None:
+        'The constructor of the class RingSystemGraph. The rings must have ids.'
+        self.rings = {ring.id: ring for ring in rings}
+        self.ringConnections = RingConnectionRegistry()
+        self.connectionTypes = {}
+        self.systems = []
+        self.bridgedGroups = []
+        self.__systemIndex = {}
+        ringsOfVertex = {}
+        for ring in rings:
+            for member in ring.members:
+                ringsOfVertex.setdefault(member, []).append(ring.id)
+        pairs = {}
+        for ringIds in ringsOfVertex.values():
+            for i, firstRingId in enumerate(ringIds):
+                for secondRingId in ringIds[i + 1:]:
+                    pairs.setdefault(RingConnectionRegistry.getPair(firstRingId, secondRingId), None)
+        for firstRingId, secondRingId in pairs:
+            ringConnection = RingConnection(self.rings[firstRingId], self.rings[secondRingId])
+            self.ringConnections.add(ringConnection)
+            self.connectionTypes[ringConnection.id] = RingSystemGraph.getConnectionLabel(ringConnection, ringsOfVertex)
+        self.__label()
+
+    @staticmethod
+    def getConnectionLabel(ringConnection: 'RingConnection', ringsOfVertex: Dict[int, List[int]]) -> str:
+        'Returns the label of a ring connection, the same test as RingConnection.isBridgeConnection() on the ring membership of the atoms.'
+        if len(ringConnection.vertices) > 2 or any(len(ringsOfVertex[vertexId]) > 2 for vertexId in ringConnection.vertices):
+            return 'bridged'
+        return 'spiro' if len(ringConnection.vertices) == 1 else 'fused'
+
+    def __label(self) -> None:
+        'PRIVATE FUNCTION used by the constructor. Sets the ring flags and collects the systems and bridged groups.'
+        for ring in self.rings.values():
+            ring.isSpiro = ring.isFused = ring.isPartOfBridged = False
+            ring.neighbours = self.ringConnections.getNeighbours(ring.id)
+        for ringConnection in self.ringConnections:
+            label = self.connectionTypes[ringConnection.id]
+            for ringId in (ringConnection.firstRingId, ringConnection.secondRingId):
+                ring = self.rings[ringId]
+                if label == 'spiro':
+                    ring.isSpiro = True
+                elif label == 'fused':
+                    ring.isFused = True
+                else:
+                    ring.isPartOfBridged = True
+        self.systems = self.__components(lambda ringConnection: True)
+        self.bridgedGroups = [group for group in self.__components(lambda ringConnection: self.connectionTypes[ringConnection.id] == 'bridged')
+                              if len(group) > 1]
+        for index, system in enumerate(self.systems):
+            for ringId in system:
+                self.__systemIndex[ringId] = index
+
+    def __components(self, follow) -> List[List[int]]:
+        'PRIVATE FUNCTION used by __label(). Returns the connected components over the ring connections accepted by follow.'
+        visited, components = set(), []
+        for ringId in sorted(self.rings):
+            if ringId in visited:
+                continue
+            visited.add(ringId)
+            component, stack = [], [ringId]
+            while stack:
+                current = stack.pop()
+                component.append(current)
+                for ringConnection in self.ringConnections.getConnections(current):
+                    other = ringConnection.secondRingId if ringConnection.firstRingId == current else ringConnection.firstRingId
+                    if other not in visited and follow(ringConnection):
+                        visited.add(other)
+                        stack.append(other)
+            components.append(sorted(component))
+        return components
+
+    def getSystems(self) -> List[List[int]]:
+        'Returns the ring systems as lists of ring ids.'
+        return self.systems
+
+    def getSystemIndex(self, ringId: int) -> int:
+        'Returns the index of the ring system a ring belongs to.'
+        return self.__systemIndex[ringId]
+
+    def getNeighbours(self, ringId: int) -> List[int]:
+        'Returns the ids of the rings connected to a given ring.'
+        return self.ringConnections.getNeighbours(ringId)
+
+    def getConnectionType(self, firstRingId: int, secondRingId: int) -> Union[str, None]:
+        "Returns the label ('spiro', 'fused' or 'bridged') of the connection between two rings, or None if they are not connected."
+        ringConnection = self.ringConnections.getConnection(firstRingId, secondRingId)
+        return None if ringConnection is None else self.connectionTypes[ringConnection.id]
+
+    def getRingIds(self, label: str) -> List[int]:
+        "Returns the ids of the rings with at least one connection with a given label ('spiro', 'fused' or 'bridged')."
+        attribute = {'spiro': 'isSpiro', 'fused': 'isFused', 'bridged': 'isPartOfBridged'}[label]
+        return [ringId for ringId in sorted(self.rings) if getattr(self.rings[ringId], attribute)]
+
+    def getBridgedGroups(self) -> List[List[int]]:
+        'Returns the groups of rings that are joined by bridged connections, as lists of ring ids.'
+        return self.bridgedGroups
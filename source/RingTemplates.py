@@ -0,0 +1,175 @@
+import numpy as np
+from typing import List, Tuple, Union
+
+
+class RingTemplates:
+    """A store mapping canonical ring-system keys to precomputed 2D coordinates.
+Ring systems found in the store are placed by a rigid transform instead of a force-directed layout.
+The key is derived from the bonds between the members of the ring system only (the elements are ignored),
+so that it does not depend on the order of the atoms in the SMILES.
+templates A map mapping a canonical key to the coordinates of the ring system (in canonical order, for a bond length of 1.0).
+names A map mapping a canonical key to the name of the template.
+maxLeaves The maximum number of leaves explored when searching for the canonical order of a symmetric ring system."""
+
+    # The starter set. Coordinates are given for a bond length of about 1.0, in the order of the indices used by the bonds.
+    bundled = {
+        'adamantane': {
+            'bonds': [(0, 4), (1, 4), (0, 5), (2, 5), (0, 6), (3, 6), (1, 7), (2, 7), (1, 8), (3, 8), (2, 9), (3, 9)],
+            'coordinates': [(0.438, 0.751), (-0.818, -0.78), (0.932, -0.641), (-0.552, 0.671), (-0.38, -0.029), (1.37, 0.11), (-0.114, 1.422), (0.114, -1.422), (-1.37, -0.11), (0.38, 0.029)]
+        },
+        'bicyclo[2.2.2]octane': {
+            'bonds': [(0, 2), (2, 3), (3, 1), (0, 4), (4, 5), (5, 1), (0, 6), (6, 7), (7, 1)],
+            'coordinates': [(-1.213, 0.327), (1.213, -0.327), (-0.249, 0.929), (0.684, 0.677), (-0.684, -0.687), (0.249, -0.938), (-0.467, 0.135), (0.466, -0.116)]
+        },
+        'norbornane': {
+            'bonds': [(0, 2), (2, 3), (3, 1), (0, 4), (4, 5), (5, 1), (0, 6), (6, 1)],
+            'coordinates': [(0.714, 0.688), (-0.714, -0.691), (-0.302, 0.965), (-0.951, 0.338), (0.952, -0.333), (0.303, -0.96), (-0.002, -0.008)]
+        },
+        'cubane': {
+            'bonds': [(0, 1), (0, 2), (0, 4), (1, 3), (1, 5), (2, 3), (2, 6), (3, 7), (4, 5), (4, 6), (5, 7), (6, 7)],
+            'coordinates': [(-0.846, -0.788), (0.321, -0.788), (-0.846, 0.379), (0.321, 0.379), (-0.321, -0.379), (0.846, -0.379), (-0.321, 0.788), (0.846, 0.788)]
+        },
+        'gonane': {
+            'bonds': [(0, 1), (0, 5), (0, 7), (1, 2), (2, 3), (3, 4), (4, 5), (5, 8), (6, 7), (6, 9), (6, 13), (7, 12), (8, 9), (10, 11), (10, 13), (10, 15), (11, 12), (13, 16), (14, 15), (14, 16)],
+            'coordinates': [(-1.119, -0.206), (-1.985, 0.294), (-2.851, -0.206), (-2.851, -1.206), (-1.985, -1.706), (-1.119, -1.206), (0.613, -0.206), (-0.253, 0.294), (-0.253, -1.706), (0.613, -1.206), (1.479, 1.294), (0.613, 1.794), (-0.253, 1.294), (1.479, 0.294), (3.018, 0.794), (2.43, 1.603), (2.43, -0.015)]
+        },
+        'morphinan': {
+            'bonds': [(0, 1), (0, 5), (0, 7), (1, 2), (2, 3), (3, 4), (4, 5), (5, 8), (6, 7), (6, 9), (6, 13), (7, 12), (8, 9), (10, 11), (10, 13), (11, 12), (9, 14), (14, 15), (15, 16), (16, 7)],
+            'coordinates': [(-0.888, 0.155), (-1.703, 0.626), (-2.518, 0.155), (-2.518, -0.786), (-1.703, -1.257), (-0.888, -0.786), (0.743, 0.155), (-0.072, 0.626), (-0.072, -1.257), (0.743, -0.786), (1.558, 1.567), (0.743, 2.038), (-0.072, 1.567), (1.558, 0.626), (1.605, -1.677), (2.166, -0.883), (1.317, -0.082)]
+        },
+        'taxane': {
+            'bonds': [(0, 1), (1, 2), (2, 3), (3, 4), (4, 5), (5, 6), (6, 7), (7, 8), (8, 9), (9, 10), (10, 11), (11, 12), (12, 13), (13, 0), (0, 14), (14, 10), (2, 7)],
+            'coordinates': [(1.211, -0.597), (0.976, 0.366), (0.191, 1.003), (0.392, 1.976), (-0.219, 2.736), (-1.19, 2.539), (-1.432, 1.592), (-0.853, 0.786), (-1.326, -0.111), (-1.134, -1.093), (-0.351, -1.728), (0.258, -2.518), (1.274, -2.33), (1.757, -1.419), (0.448, -1.201)]
+        }
+    }
+
+    def __init__(self, bundled: bool = True, maxLeaves: int = 5000) -> None:
+        'The constructor of the class RingTemplates.'
+        self.templates = {}
+        self.names = {}
+        self.maxLeaves = maxLeaves
+        if bundled:
+            for name, template in RingTemplates.bundled.items():
+                adjacencyList = RingTemplates.bondsToAdjacencyList(len(template['coordinates']), template['bonds'])
+                self.add(adjacencyList, template['coordinates'], name)
+
+    def __len__(self) -> int:
+        return len(self.templates)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.templates
+
+    def add(self, adjacencyList: List[List[int]], coordinates: List[Tuple[float, float]], name: str = None) -> Union[str, None]:
+        """Adds a template for the ring system given by an adjacency list and the coordinates of its vertices.
+The coordinates are centered and scaled to a bond length of 1.0. Returns the key of the template."""
+        key, order = self.getKey(adjacencyList)
+        if key is None:
+            return None
+        arrPosition = np.asarray(coordinates, dtype=np.float64)
+        bonds = [(u, v) for u in range(len(adjacencyList)) for v in adjacencyList[u] if u < v]
+        meanBondLength = np.mean([np.linalg.norm(arrPosition[u] - arrPosition[v]) for u, v in bonds])
+        arrPosition = (arrPosition - arrPosition.mean(axis=0)) / meanBondLength
+        self.templates[key] = arrPosition[order]
+        self.names[key] = name
+        return key
+
+    def addFromGraph(self, graph: 'Graph', vertexIds: List[int], name: str = None) -> Union[str, None]:
+        'Learns a template from the current positions of a ring system in a graph, e.g. after it was positioned by kkLayout.'
+        coordinates = [(graph.vertices[vertexId].position.x, graph.vertices[vertexId].position.y) for vertexId in vertexIds]
+        return self.add(graph.getSubgraphAdjacencyList(vertexIds), coordinates, name)
+
+    def get(self, adjacencyList: List[List[int]]) -> Union[np.ndarray, None]:
+        'Returns the template coordinates (for a bond length of 1.0) of a ring system in the order of the adjacency list, or None.'
+        key, order = self.getKey(adjacencyList)
+        if key not in self.templates:
+            return None
+        arrPosition = np.empty((len(order), 2))
+        arrPosition[order] = self.templates[key]
+        return arrPosition
+
+    def getKey(self, adjacencyList: List[List[int]]) -> Tuple[Union[str, None], Union[List[int], None]]:
+        """Returns the canonical key of a ring system and the canonical order of its vertices (order[label] = index).
+Returns (None, None) if the canonical order could not be determined within maxLeaves."""
+        bonds, order = RingTemplates.canonicalOrder(adjacencyList, maxLeaves=self.maxLeaves)
+        if bonds is None:
+            return None, None
+        return f'{len(adjacencyList)}:' + ','.join(f'{u}-{v}' for u, v in bonds), order
+
+    @staticmethod
+    def canonicalOrder(adjacencyList: List[List[int]], colours: List[int] = None, maxLeaves: int = 5000) -> tuple:
+        """Returns the bond list of a graph in canonical labels and the canonical order of its vertices (order[label] = index).
+Uses colour refinement, starting from the supplied colours (e.g. element ranks), followed by individualization of the vertices
+in the first non-singleton cell, keeping the ordering with the lexicographically smallest bond list.
+Returns (None, None) if more than maxLeaves orderings would have to be compared."""
+        length = len(adjacencyList)
+        best = [None, None]
+        leaves = [0]
+        RingTemplates.__search(adjacencyList, colours or [0] * length, best, leaves, maxLeaves)
+        if leaves[0] > maxLeaves or best[0] is None:
+            return None, None
+        bonds, labels = best
+        order = [0] * length
+        for vertex, label in enumerate(labels):
+            order[label] = vertex
+        return bonds, order
+
+    @staticmethod
+    def __search(adjacencyList: List[List[int]], colours: List[int], best: list, leaves: list, maxLeaves: int) -> None:
+        'PRIVATE FUNCTION used by canonicalOrder().'
+        if leaves[0] > maxLeaves:
+            return
+        colours = RingTemplates.__refine(adjacencyList, colours)
+        cells = {}
+        for vertex, colour in enumerate(colours):
+            cells.setdefault(colour, []).append(vertex)
+        if len(cells) == len(colours):
+            leaves[0] += 1
+            bonds = sorted((min(colours[u], colours[v]), max(colours[u], colours[v]))
+                           for u in range(len(adjacencyList)) for v in adjacencyList[u] if u < v)
+            if best[0] is None or bonds < best[0]:
+                best[0], best[1] = bonds, colours
+            return
+        cell = cells[min(colour for colour, members in cells.items() if len(members) > 1)]
+        for vertex in cell:
+            individualized = [2 * colour + 1 for colour in colours]
+            individualized[vertex] -= 1
+            RingTemplates.__search(adjacencyList, individualized, best, leaves, maxLeaves)
+
+    @staticmethod
+    def __refine(adjacencyList: List[List[int]], colours: List[int]) -> List[int]:
+        'PRIVATE FUNCTION used by canonicalOrder(). Refines the colours until vertices of the same colour have the same neighbouring colours.'
+        count = len(set(colours))
+        while True:
+            signatures = [(colours[u], tuple(sorted(colours[v] for v in adjacencyList[u]))) for u in range(len(adjacencyList))]
+            ranks = {signature: rank for rank, signature in enumerate(sorted(set(signatures)))}
+            colours = [ranks[signature] for signature in signatures]
+            if len(ranks) == count:
+                return colours
+            count = len(ranks)
+
+    @staticmethod
+    def bondsToAdjacencyList(length: int, bonds: List[Tuple[int, int]]) -> List[List[int]]:
+        'Returns the adjacency list of a graph with a given number of vertices and a list of bonds.'
+        adjacencyList = [[] for _ in range(length)]
+        for u, v in bonds:
+            adjacencyList[u].append(v)
+            adjacencyList[v].append(u)
+        return adjacencyList
+
+    @staticmethod
+    def rigidTransform(arrTemplate: np.ndarray, arrPosition: np.ndarray, arrPositioned: np.ndarray, center: 'Vector2') -> np.ndarray:
+        """Moves template coordinates onto a ring system. If at least two vertices are already positioned, the rotation (or reflection)
+and translation minimizing the squared distances to them is used (Kabsch), if one is positioned, the template is translated onto it,
+otherwise the template is centered at the supplied center. Positioned vertices keep their positions."""
+        fixed = np.flatnonzero(arrPositioned)
+        if len(fixed) == 0:
+            result = arrTemplate + (center.x, center.y)
+        elif len(fixed) == 1:
+            result = arrTemplate + (arrPosition[fixed[0]] - arrTemplate[fixed[0]])
+        else:
+            source, target = arrTemplate[fixed], arrPosition[fixed]
+            sourceMean, targetMean = source.mean(axis=0), target.mean(axis=0)
+            u, _, vt = np.linalg.svd((source - sourceMean).T @ (target - targetMean))
+            result = (arrTemplate - sourceMean) @ (u @ vt) + targetMean
+        result[fixed] = arrPosition[fixed]
+        return result
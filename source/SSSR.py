@@ -1,170 +1,539 @@
+import numpy as np
 from Graph import Graph
+from collections import deque
+from concurrent.futures import Executor, Future
 from typing import List, Final, Callable, Dict, Set, Tuple
 
 class SSSR:
     ' A class encapsulating the functionality to find the smallest set of smallest rings in a graph. */'
     
+    counters: Final = {'cycle': 0, 'spiro': 0, 'fused': 0, 'full': 0, 'fallback': 0}
+
+    @staticmethod
+    def getRings(graph: 'Graph', experimental: bool=False, executor: Executor=None,
+                 parallelThreshold: int=64, budget: 'LayoutBudget'=None) -> List[List[float]]:
+        """Returns an array containing arrays, each representing a ring from the smallest set of smallest rings in the graph.
+Isolated rings, spiro pairs and ortho-fused chains are read off a walk around their cycles. Other ring systems are
+split into biconnected blocks, which take the same shortcuts where they can, and only the remaining bridged or cage blocks
+run the path-included distance matrices. SSSR.counters records how often each path was taken.
+executor An optional concurrent.futures executor (e.g. a ProcessPoolExecutor). Ring systems with at least parallelThreshold
+atoms are sent to it as adjacency lists, smaller ones are perceived in-process. The rings are returned in component order either way.
+budget An optional LayoutBudget. Blocks that need the full algorithm once it has run out get a fundamental cycle basis
+instead (the right number of rings, but not necessarily the smallest), counted as 'fallback' and recorded in the budget."""
+        adjacencyList = graph.getComponentsAdjacencyList()
+        if len(adjacencyList) == 0:
+            return None
+        components = graph.getComponents()
+        results = []
+        for component in components:
+            componentAdjacencyList = graph.getSubgraphAdjacencyList(component)
+            if executor is not None and len(component) >= parallelThreshold:
+                results.append(executor.submit(SSSR.getComponentRings, componentAdjacencyList, experimental, budget))
+            else:
+                results.append(SSSR.getComponentRings(componentAdjacencyList, experimental, budget))
+        rings = []
+        for component, result in zip(components, results):
+            componentRings, kinds = result.result() if isinstance(result, Future) else result
+            for kind in kinds:
+                SSSR.counters[kind] += 1
+            if 'fallback' in kinds:
+                budget.degrade('sssr')
+            rings += [[component[member] for member in ring] for ring in componentRings]
+        return rings
+
+    @staticmethod
+    def getComponentRings(adjacencyList: List[List[int]], experimental: bool=False,
+                          budget: 'LayoutBudget'=None) -> Tuple[List[List[int]], List[str]]:
+        """Returns the rings of a connected ring system given as an adjacency list, in its vertex indices, together with the
+paths taken (see SSSR.counters). Only depends on its arguments, so it can run in a worker process."""
+        kinds = []
+        rings = SSSR.__getWalkedRings(adjacencyList, experimental, kinds)
+        if rings is not None:
+            return rings, kinds
+        rings = []
+        for block in Graph.getBiconnectedComponentsFromList(adjacencyList):
+            index = {vertex: i for i, vertex in enumerate(block)}
+            blockAdjacencyList = [[index[v] for v in adjacencyList[u] if v in index] for u in block]
+            blockRings = SSSR.__getWalkedRings(blockAdjacencyList, experimental, kinds)
+            if blockRings is None:
+                blockRings = SSSR.__getBlockRings(Graph.adjacencyListToMatrix(blockAdjacencyList), experimental, budget)
+                kinds.append('full' if blockRings is not None else 'fallback')
+            if blockRings is None:
+                blockRings = SSSR.getFundamentalRings(blockAdjacencyList)
+            rings += [[block[member] for member in ring] for ring in blockRings]
+        return rings, kinds
+
+    @staticmethod
+    def __getWalkedRings(adjacencyList: List[List[int]], experimental: bool, kinds: List[str]) -> List[List[int]]:
+        'PRIVATE FUNCTION used by getComponentRings(). Records the kind of ring system if its rings could be walked.'
+        if experimental:
+            return None
+        kind = SSSR.classify(adjacencyList)
+        rings = SSSR.getWalkedRings(adjacencyList, kind)
+        if rings is not None:
+            kinds.append(kind)
+        return rings
+
+    @staticmethod
+    def resetCounters() -> None:
+        'Resets the counters of the ring perception paths taken by getRings().'
+        for kind in SSSR.counters:
+            SSSR.counters[kind] = 0
+
+    @staticmethod
+    def __getBlockRings(ccAdjacencyMatrix: List[List[int]], experimental: bool, budget: 'LayoutBudget'=None) -> List[Set[int]]:
+        'PRIVATE FUNCTION used by getComponentRings(). Runs the path-included distance matrix algorithm on one block, None if the budget runs out.'
+        if budget is not None and budget.expired():
+            return None
+        length = len(ccAdjacencyMatrix)
+        arrRingCount = [0] * length
+        arrBondCount = [sum(row) for row in ccAdjacencyMatrix]
+        nEdges = sum(arrBondCount) // 2
+        nSssr = nEdges - length + 1
+        if all(elem == 3 for elem in arrBondCount):
+            nSssr = 2 + nEdges - length
+        if experimental:
+            nSssr = 999
+        matrices = SSSR.getPathIncludedDistanceMatrices(ccAdjacencyMatrix, budget)
+        if matrices is None:
+            return None
+        d, pe, pe_prime = matrices.values()
+        c = SSSR.getRingCandidates(d, pe, pe_prime)
+        return SSSR.getSSSR(c, d, ccAdjacencyMatrix, pe, pe_prime, arrBondCount, arrRingCount, nSssr)
+
+    @staticmethod
+    def classify(adjacencyList: List[List[int]]) -> str:
+        """Classifies a connected ring system from its degree and cyclomatic counts: 'cycle' for an isolated ring,
+'spiro' for two rings sharing one atom, 'fused' for ring systems in which every fusion atom is part of exactly one
+fusion bond (ortho-fused chains, if the walk in getWalkedRings() succeeds) and 'full' for everything else."""
+        degrees = [len(neighbours) for neighbours in adjacencyList]
+        cyclomatic = sum(degrees) // 2 - len(degrees) + 1
+        nTwo, nThree = degrees.count(2), degrees.count(3)
+        if cyclomatic == 1 and nTwo == len(degrees):
+            return 'cycle'
+        if cyclomatic == 2 and nTwo == len(degrees) - 1 and degrees.count(4) == 1:
+            return 'spiro'
+        if nTwo + nThree == len(degrees) and nThree == 2 * (cyclomatic - 1):
+            return 'fused'
+        return 'full'
+
     @staticmethod
-    def getRings(graph: 'Graph', experimental: bool=False) -> List[List[float]]:
-        'Returns an array containing arrays, each representing a ring from the smallest set of smallest rings in the graph.'
-        adjacencyMatrix = graph.getComponentsAdjacencyMatrix()
-        if len(adjacencyMatrix) == 0:
+    def getWalkedRings(adjacencyList: List[List[int]], kind: str=None) -> List[List[int]]:
+        """Returns the rings of an isolated ring, a spiro pair or an ortho-fused chain by walking around their cycles,
+with the members in cycle order. kind is the result of classify(), computed if not given.
+Returns None if the ring system needs the full algorithm."""
+        if kind is None:
+            kind = SSSR.classify(adjacencyList)
+        if kind == 'cycle':
+            rings = [SSSR.__walk(adjacencyList, 0, adjacencyList[0][0])]
+        elif kind == 'spiro':
+            centre = next(u for u, neighbours in enumerate(adjacencyList) if len(neighbours) == 4)
+            first = SSSR.__walk(adjacencyList, centre, adjacencyList[centre][0])
+            rings = [first, SSSR.__walk(adjacencyList, centre, next(v for v in adjacencyList[centre] if v not in first))]
+        elif kind == 'fused':
+            rings = SSSR.__walkFused(adjacencyList)
+        else:
+            rings = None
+        return rings
+
+    @staticmethod
+    def getFundamentalRings(adjacencyList: List[List[int]]) -> List[List[int]]:
+        """Returns a fundamental cycle basis of a connected graph: one ring per edge outside a breadth-first spanning tree,
+closed through the tree, with the members in cycle order and sorted by size. Linear in the size of the graph, it is the
+cheap fallback of getRings() when the budget has run out; the rings are independent but not necessarily the smallest."""
+        parent, depth = [None] * len(adjacencyList), [0] * len(adjacencyList)
+        parent[0], queue = 0, deque([0])
+        while queue:
+            u = queue.popleft()
+            for v in adjacencyList[u]:
+                if parent[v] is None:
+                    parent[v], depth[v] = u, depth[u] + 1
+                    queue.append(v)
+        rings = []
+        for u, neighbours in enumerate(adjacencyList):
+            for v in neighbours:
+                if u > v or parent[v] == u or parent[u] == v:
+                    continue
+                left, right = [u], [v]
+                while left[-1] != right[-1]:
+                    if depth[left[-1]] >= depth[right[-1]]:
+                        left.append(parent[left[-1]])
+                    else:
+                        right.append(parent[right[-1]])
+                rings.append(left + right[-2::-1])
+        rings.sort(key=len)
+        return rings
+
+    @staticmethod
+    def __walk(adjacencyList: List[List[int]], start: int, first: int) -> List[int]:
+        'PRIVATE FUNCTION used by getWalkedRings(). Follows vertices with two neighbours from start via first until start is reached again.'
+        members, previous, current = [start], start, first
+        while current != start:
+            members.append(current)
+            a, b = adjacencyList[current]
+            previous, current = current, a if b == previous else b
+        return members
+
+    @staticmethod
+    def __walkFused(adjacencyList: List[List[int]]) -> List[List[int]]:
+        """PRIVATE FUNCTION used by getWalkedRings(). Peels the terminal rings off an ortho-fused chain: a terminal ring is
+a path of atoms with two neighbours whose end atoms are bonded (the fusion bond). For these ring systems the faces are the unique SSSR.
+Returns None if no terminal ring is left before the ring system is reduced to a single cycle (e.g. bridged systems)."""
+        neighbours = [set(adjacent) for adjacent in adjacencyList]
+        alive = set(range(len(adjacencyList)))
+        rings = []
+        while True:
+            ring = next((ring for u in sorted(alive) if len(neighbours[u]) == 3
+                         for ring in SSSR.__ears(neighbours, u)), None)
+            if ring is None:
+                break
+            for member in ring[1:-1]:
+                alive.discard(member)
+            neighbours[ring[0]].discard(ring[1])
+            neighbours[ring[-1]].discard(ring[-2])
+            rings.append(ring)
+        start = min(alive)
+        if any(len(neighbours[u]) != 2 for u in alive):
             return None
-        connectedComponents = Graph.getConnectedComponents(adjacencyMatrix)
-        for connectedComponent in connectedComponents:
-            ccAdjacencyMatrix = graph.getSubgraphAdjacencyMatrix(*connectedComponent)
-            length = len(ccAdjacencyMatrix)
-            arrRingCount = [0] * len(ccAdjacencyMatrix)
-            arrBondCount = [sum(row) for row in ccAdjacencyMatrix]
-            nEdges = sum(elem for row in ccAdjacencyMatrix for elem in row)
-            nSssr = nEdges - length + 1
-            allThree: bool = all(elem == 3 for elem in arrBondCount) 
-            
-            if allThree:
-                nSssr = 2.0 + nEdges - length
-            if type(nSssr) is int and nSssr == 1:
-                rings.append([*connectedComponent])
+        rings.append(SSSR.__walk(neighbours, start, min(neighbours[start])))
+        return rings
+
+    @staticmethod
+    def __ears(neighbours: List[Set[int]], u: int):
+        'PRIVATE FUNCTION used by __walkFused(). Yields the rings closed by a path of atoms with two neighbours from u back to a neighbour of u.'
+        for first in sorted(neighbours[u]):
+            if len(neighbours[first]) != 2:
                 continue
-            if experimental:
-                nSssr = 999
-            d, pe, pe_prime = SSSR.getPathIncludedDistanceMatrices(ccAdjacencyMatrix).values()
-            c = SSSR.getRingCandidates(d, pe, pe_prime)
-            sssr = SSSR.getSSSR(c, d, ccAdjacencyMatrix, pe, pe_prime, arrBondCount, arrRingCount, nSssr)
-            rings = [[connectedComponent[val] for val in sssr_elem] for sssr_elem in sssr ]
+            ring, previous, current = [u], u, first
+            while len(neighbours[current]) == 2:
+                ring.append(current)
+                a, b = neighbours[current]
+                previous, current = current, a if b == previous else b
+            if current != u and current in neighbours[u]:
+                ring.append(current)
+                yield ring
+
+    @staticmethod
+    def getRingsBitset(graph: 'Graph') -> List[List[int]]:
+        """Returns the same rings as getRings(), but the candidate cycles are encoded as integer edge bitmasks
+and their independence is decided by Gaussian elimination over GF(2). The members of each ring are in cycle order."""
+        if len(graph.vertices) == 0:
+            return None
+        rings = []
+        for block in graph.getBlocks():
+            for ring in SSSR.getBitsetSSSR(graph.getSubgraphAdjacencyList(block)):
+                rings.append([block[member] for member in ring])
         return rings
-    
+
     @staticmethod
-    def matrixToString(matrix: List[List[float]]) -> str:
-        'Creates a printable string from a matrix (2D array).'
-        return '\n'.join(' '.join(f'{elem}' for elem in row) for row in matrix)
+    def getBitsetSSSR(adjacencyList: List[List[int]]) -> List[List[int]]:
+        """Returns the smallest set of smallest rings of a connected ring system given as an adjacency list.
+The candidates are the cycles formed by a shortest path tree and one further edge (Horton), sorted by size."""
+        length = len(adjacencyList)
+        edgeIndex, edges = SSSR.getEdgeIndex(adjacencyList)
+        arrBondCount = [len(neighbours) for neighbours in adjacencyList]
+        arrRingCount = [0] * length
+        nSssr = len(edges) - length + 1
+        if all(bondCount == 3 for bondCount in arrBondCount):
+            nSssr += 1
+        rings, basis, seen = [], {}, set()
+        for _, mask in SSSR.getCycleCandidates(adjacencyList, edgeIndex):
+            if len(rings) >= nSssr:
+                break
+            if mask in seen:
+                continue
+            seen.add(mask)
+            members = SSSR.maskToMembers(mask, edges)
+            if SSSR.__acceptRing(mask, members, basis, arrBondCount, arrRingCount):
+                rings.append(members)
+        return rings
 
     @staticmethod
-    def __initialize_matrices(length: int):
-        'private method for getPathIncludedDistanceMatrices'
-        d = [[float('inf')] * length for _ in range(length)]
-        pe = [[[[] for _ in range(length)] for _ in range(length)] for _ in range(length)]
-        pe_prime = [[[[] for _ in range(length)] for _ in range(length)] for _ in range(length)]
-        return d, pe, pe_prime
-
-    @staticmethod
-    def __update_matrices(d: List[List[float]], pe: List[List[List[float]]],\
-        pe_prime: List[List[List[float]]], i: int, j: int, k: int) -> None:
-        'private method for getPathIncludedDistanceMatrices'
-        previous_path_length = d[i][j]
-        new_path_length = d[i][k] + d[k][j]
-        if previous_path_length > new_path_length:
-            d[i][j] = new_path_length
-            pe[i][j] = [[]]
-            pe[i][j][0] = pe[i][k][0] + pe[k][j][0]
-            if previous_path_length == new_path_length + 1:
-                pe_prime[i][j] = [[len(pe[i][j])]]
-                for l in range(len(pe[i][j])):
-                    pe_prime[i][j][l] = [[len(pe[i][j][l])]]
-                    for m in range(len(pe[i][j][l])):
-                        pe_prime[i][j][l][m] = [[len(pe[i][j][l][m])]]
-                        for n in range(len(pe[i][j][l][m])):
-                            pe_prime[i][j][l][m][n] = [pe[i][j][l][m][0], pe[i][j][l][m][1]]
-            else:
-                pe_prime[i][j] = [[]]
-        elif previous_path_length == new_path_length:
-            if pe[i][k] and pe[k][j]:
-                if pe[i][j]:
-                    pe[i][j].append(pe[i][k][0] + pe[k][j][0])
-                else:
-                    pe[i][j][0] = pe[i][k][0] + pe[k][j][0]
-        elif previous_path_length == new_path_length - 1:
-            if pe_prime[i][j]:
-                pe_prime[i][j].append(pe[i][k][0] + pe[k][j][0])
-            else:
-                pe_prime[i][j][0] = pe[i][k][0] + pe[k][j][0]
+    def getRingFamilies(graph: 'Graph') -> List[List[int]]:
+        """Returns the unique ring families (Vismara) of the graph, one prototype ring per family with its members in cycle order.
+Every relevant cycle (a cycle that is not the sum of shorter cycles) belongs to exactly one family, and unlike the SSSR
+the set of families does not depend on the order in which candidates are tried, e.g. bicyclo[2.2.2]octane has three families.
+The families are sorted by size and then by their members."""
+        if len(graph.vertices) == 0:
+            return None
+        families = []
+        for block in graph.getBlocks():
+            for ring in SSSR.getRelevantPrototypes(graph.getSubgraphAdjacencyList(block)):
+                families.append([block[member] for member in ring])
+        families.sort(key=lambda ring: (len(ring), ring))
+        return families
+
+    @staticmethod
+    def getRelevantPrototypes(adjacencyList: List[List[int]]) -> List[List[int]]:
+        """Returns the prototypes of the relevant cycle families of a biconnected ring system given as an adjacency list.
+Each family is rooted at its largest vertex r and built from shortest paths that only use vertices smaller than r,
+closed by an edge (odd) or a vertex (even) whose two paths to r meet only at r. A family is relevant if its prototype
+is independent over GF(2) of all strictly smaller relevant prototypes. The output is polynomial in size even though
+a family may contain exponentially many relevant cycles."""
+        edgeIndex, edges = SSSR.getEdgeIndex(adjacencyList)
+        candidates = []
+        for root in range(len(adjacencyList)):
+            candidates += SSSR.__getFamilyCandidates(adjacencyList, edgeIndex, root)
+        candidates.sort(key=lambda candidate: candidate[0])
+        prototypes, basis, shorter, size = [], {}, [], 0
+        for candidateSize, mask in candidates:
+            if candidateSize != size:
+                for relevant in shorter:
+                    SSSR.addToBasis(basis, relevant)
+                shorter, size = [], candidateSize
+            if SSSR.reduceMask(basis, mask) != 0:
+                shorter.append(mask)
+                prototypes.append(SSSR.maskToMembers(mask, edges))
+        return prototypes
+
+    @staticmethod
+    def __getFamilyCandidates(adjacencyList: List[List[int]], edgeIndex: Dict[Tuple[int, int], int],
+                              root: int) -> List[Tuple[int, int]]:
+        """PRIVATE FUNCTION used by getRelevantPrototypes(). Runs a breadth-first search from root over the vertices smaller than root.
+For every vertex it keeps the bitset of all vertices on any shortest path from root, and one prototype path as an edge bitmask."""
+        distance = {root: 0}
+        predecessors, onPaths, pathMask = {root: []}, {root: 1 << root}, {root: 0}
+        order, queue = [root], deque([root])
+        while queue:
+            u = queue.popleft()
+            for v in adjacencyList[u]:
+                if v >= root:
+                    continue
+                if v not in distance:
+                    distance[v] = distance[u] + 1
+                    predecessors[v] = []
+                    order.append(v)
+                    queue.append(v)
+                if distance[v] == distance[u] + 1:
+                    predecessors[v].append(u)
+        for v in order[1:]:
+            first = min(predecessors[v])
+            pathMask[v] = pathMask[first] | 1 << edgeIndex[(first, v) if first < v else (v, first)]
+            onPaths[v] = 1 << v
+            for u in predecessors[v]:
+                onPaths[v] |= onPaths[u]
+        candidates, rootBit = [], 1 << root
+        for y in order[1:]:
+            for z in adjacencyList[y]:
+                if y < z < root and distance.get(z) == distance[y] and onPaths[y] & onPaths[z] == rootBit:
+                    candidates.append((2 * distance[y] + 1, pathMask[y] | pathMask[z] | 1 << edgeIndex[(y, z)]))
+            parents = sorted(predecessors[y])
+            for i, a in enumerate(parents):
+                for b in parents[i + 1:]:
+                    if onPaths[a] & onPaths[b] == rootBit:
+                        mask = pathMask[a] | pathMask[b]
+                        mask |= 1 << edgeIndex[(a, y) if a < y else (y, a)] | 1 << edgeIndex[(b, y) if b < y else (y, b)]
+                        candidates.append((2 * distance[y], mask))
+        return candidates
+
+    @staticmethod
+    def getEdgeIndex(adjacencyList: List[List[int]]) -> Tuple[Dict[Tuple[int, int], int], List[Tuple[int, int]]]:
+        'Assigns a bit to every edge. Returns a dict from (u, v) with u < v to the bit index and the list of edges by bit index.'
+        edges = [(u, v) for u, neighbours in enumerate(adjacencyList) for v in neighbours if u < v]
+        return {edge: bit for bit, edge in enumerate(edges)}, edges
+
+    @staticmethod
+    def bondsToMask(bonds: List[List[int]], edgeIndex: Dict[Tuple[int, int], int]) -> int:
+        'Encodes a list of bonds as an integer with one bit set per edge.'
+        mask = 0
+        for u, v in bonds:
+            mask |= 1 << edgeIndex[(u, v) if u < v else (v, u)]
+        return mask
+
+    @staticmethod
+    def maskToAtoms(mask: int, edges: List[Tuple[int, int]]) -> Set[int]:
+        'Returns the set of vertices of the edges in an edge bitmask.'
+        atoms = set()
+        while mask:
+            low = mask & -mask
+            atoms.update(edges[low.bit_length() - 1])
+            mask ^= low
+        return atoms
+
+    @staticmethod
+    def isRingMask(mask: int, edges: List[Tuple[int, int]]) -> bool:
+        """Checks whether every vertex of an edge bitmask has exactly two of its edges, i.e. whether the union of two paths
+between the same pair of vertices is a simple ring rather than a ring with a shared tail."""
+        degrees = {}
+        while mask:
+            low = mask & -mask
+            for vertex in edges[low.bit_length() - 1]:
+                degrees[vertex] = degrees.get(vertex, 0) + 1
+            mask ^= low
+        return all(degree == 2 for degree in degrees.values())
+
+    @staticmethod
+    def maskToMembers(mask: int, edges: List[Tuple[int, int]]) -> List[int]:
+        'Decodes the edge bitmask of a cycle into its vertices, in the order they are visited when walking the cycle.'
+        neighbours = {}
+        while mask:
+            low = mask & -mask
+            u, v = edges[low.bit_length() - 1]
+            neighbours.setdefault(u, []).append(v)
+            neighbours.setdefault(v, []).append(u)
+            mask ^= low
+        start = min(neighbours)
+        members, previous, current = [start], start, neighbours[start][0]
+        while current != start:
+            members.append(current)
+            a, b = neighbours[current]
+            previous, current = current, a if b == previous else b
+        return members
+
+    @staticmethod
+    def getCycleCandidates(adjacencyList: List[List[int]], edgeIndex: Dict[Tuple[int, int], int]) -> List[Tuple[int, int]]:
+        """Returns the candidate cycles as (size, mask) tuples sorted by size. For every root, the candidates close
+a breadth-first tree with one non-tree edge whose endpoints lie in different subtrees of the root."""
+        length = len(adjacencyList)
+        candidates = []
+        for root in range(length):
+            depth, branch, pathMask = [-1] * length, [-1] * length, [0] * length
+            depth[root], branch[root] = 0, root
+            queue = deque([root])
+            while queue:
+                u = queue.popleft()
+                for v in adjacencyList[u]:
+                    if depth[v] == -1:
+                        depth[v] = depth[u] + 1
+                        branch[v] = v if u == root else branch[u]
+                        pathMask[v] = pathMask[u] | 1 << edgeIndex[(u, v) if u < v else (v, u)]
+                        queue.append(v)
+            for (u, v), bit in edgeIndex.items():
+                if depth[u] == -1 or branch[u] == branch[v]:
+                    continue
+                edgeBit = 1 << bit
+                if pathMask[u] & edgeBit or pathMask[v] & edgeBit:
+                    continue
+                candidates.append((depth[u] + depth[v] + 1, pathMask[u] | pathMask[v] | edgeBit))
+        candidates.sort(key=lambda candidate: candidate[0])
+        return candidates
+
+    @staticmethod
+    def reduceMask(basis: Dict[int, int], mask: int) -> int:
+        'Reduces an edge bitmask by a basis in row echelon form (a dict from pivot bit to row). Returns 0 if the mask is dependent.'
+        while mask:
+            row = basis.get(mask.bit_length() - 1)
+            if row is None:
+                return mask
+            mask ^= row
+        return 0
+
+    @staticmethod
+    def addToBasis(basis: Dict[int, int], mask: int) -> bool:
+        'Adds an edge bitmask to a basis over GF(2). Returns False, leaving the basis unchanged, if the mask is linearly dependent.'
+        mask = SSSR.reduceMask(basis, mask)
+        if mask == 0:
+            return False
+        basis[mask.bit_length() - 1] = mask
+        return True
+
+    @staticmethod
+    def __acceptRing(mask: int, atoms: List[int], basis: Dict[int, int], arrBondCount: List[int], arrRingCount: List[int]) -> bool:
+        """PRIVATE FUNCTION used by getSSSR() and getBitsetSSSR(). A ring is accepted if it is independent of the rings found so far.
+A single dependent ring is accepted in ring systems where every atom has three bonds, once the basis is complete (the
+sixth face of cubane); it is recorded under the key -1 of the basis, which is never a pivot."""
+        if not SSSR.addToBasis(basis, mask):
+            rank = sum(arrBondCount) // 2 - len(arrBondCount) + 1
+            if -1 in basis or len(basis) < rank or any(bondCount != 3 for bondCount in arrBondCount):
+                return False
+            basis[-1] = mask
+        for atom in atoms:
+            arrRingCount[atom] += 1
+        return True
 
     @staticmethod
-    def getPathIncludedDistanceMatrices(adjacencyMatrix: List[List[float]]) -> dict:
-        length = len(adjacencyMatrix)
-        d, pe, pe_prime = SSSR.__initialize_matrices(length)
-        for i in range(length):
-            for j in range(length):
-                d[i][j] = adjacencyMatrix[i][j] if i == j or adjacencyMatrix[i][j] == 1 else float('inf')
-                if d[i][j] == 1:
-                    pe[i][j] = [[[i, j]]]
+    def matrixToString(matrix: List[List[float]]) -> str:
+        'Creates a printable string from a matrix (2D array).'
+        return '\n'.join(' '.join(f'{elem}' for elem in row) for row in matrix)
 
+    @staticmethod
+    def getPathIncludedDistanceMatrices(adjacencyMatrix: List[List[float]], budget: 'LayoutBudget'=None) -> dict:
+        """Computes the path-included distance matrices of a graph (Lee et al.). d is a NumPy matrix of
+the shortest distances (inf if unreachable). pe and pe_prime are sparse: they map a pair (i, j) to the list of distinct
+shortest and next-shortest paths and only hold entries for pairs that have such paths. Each path is an edge bitmask
+over the bits assigned by getEdgeIndex(). The relaxation over each intermediate vertex k is classified with NumPy,
+only the changed pairs are visited in Python. Each round spends one iteration of the optional budget; returns None if it runs out."""
+        arrAdjacency = np.asarray(adjacencyMatrix, dtype=np.float64)
+        length = len(arrAdjacency)
+        edgeIndex, edges = SSSR.getEdgeIndex(Graph.adjacencyMatrixToList(adjacencyMatrix))
+        d = np.where(arrAdjacency == 1, 1.0, np.inf)
+        np.fill_diagonal(d, 0.0)
+        pe = {}
+        for bit, (u, v) in enumerate(edges):
+            pe[(u, v)] = pe[(v, u)] = [1 << bit]
+        pe_prime = {}
         for k in range(length):
-            for i in range(length):
-                for j in range(length):
-                    SSSR.__update_matrices(d, pe, pe_prime, i, j, k)
+            if budget is not None and budget.spend():
+                return None
+            arrNew = d[:, k, None] + d[k]
+            arrCandidate = np.isfinite(arrNew)
+            arrCandidate[k, :] = False
+            arrCandidate[:, k] = False
+            # pairs through k are independent of each other, since row and column k do not change in this round
+            for i, j in np.argwhere(arrCandidate & (arrNew == d)).tolist():
+                path, paths = pe[(i, k)][0] | pe[(k, j)][0], pe[(i, j)]
+                if path not in paths:
+                    paths.append(path)
+            for i, j in np.argwhere(arrCandidate & (arrNew == d + 1)).tolist():
+                path, paths = pe[(i, k)][0] | pe[(k, j)][0], pe_prime.setdefault((i, j), [])
+                if path not in paths:
+                    paths.append(path)
+            arrShorter = arrCandidate & (arrNew < d)
+            for i, j in np.argwhere(arrShorter).tolist():
+                if d[i, j] == arrNew[i, j] + 1:
+                    pe_prime[(i, j)] = pe[(i, j)]
+                else:
+                    pe_prime.pop((i, j), None)
+                pe[(i, j)] = [pe[(i, k)][0] | pe[(k, j)][0]]
+            d[arrShorter] = arrNew[arrShorter]
         return {'d': d, 'pe': pe, 'pe_prime': pe_prime}
 
     @staticmethod
-    def getRingCandidates(d: List[List[float]], pe: List[List[float]],\
-        pe_prime: List[List[float]]) -> List[List[float]]:
-        'Get the ring candidates from the path-included distance matrices.'
-        length = len(d)
+    def getRingCandidates(d: np.ndarray, pe: Dict[Tuple[int, int], List],
+                          pe_prime: Dict[Tuple[int, int], List]) -> List[List]:
+        """Get the ring candidates from the path-included distance matrices, sorted by ring size. A pair with several
+shortest paths and next-shortest paths yields both an even and an odd candidate."""
         candidates = []
-        c = 0
-        for i in range(length):
-            for j in range(length):
-                if not (d[i][j] == 0 or (len(pe[i][j]) == 1 and pe_prime[i][j] == 0)):
-                    c = 2 * (d[i][j] + 0.5) if len(pe_prime[i][j]) else 2 * d[i][j]
-                    if c is not None:
-                        candidates.append([c, pe[i][j], pe_prime[i][j]])
-        candidates.sort(key=lambda x: x[0])
+        for pair in sorted(pe):
+            paths, primePaths = pe[pair], pe_prime.get(pair, [])
+            if len(paths) == 1 and not primePaths:
+                continue
+            distance = int(d[pair])
+            if len(paths) > 1:
+                candidates.append([2 * distance, paths, []])
+            if primePaths:
+                candidates.append([2 * distance + 1, paths, primePaths])
+        candidates.sort(key=lambda candidate: candidate[0])
         return candidates
 
     @staticmethod
     def getSSSR(c: List[List[float]], d: List[List[float]], adjacencyMatrix: List[List[float]],
         pe: List[List[float]], pe_prime: List[List[float]], arrBondCount: List, arrRingCount: List,
         nsssr: float) -> List[Set]:
-        'Searches the candidates for the smallest set of smallest rings.'
-        c_sssr, all_bonds = [], []
-        for i in range(len(c)):
-            if c[i][0] % 2 != 0:
-                c_sssr, all_bonds = SSSR.__process_odd_case(c[i],\
-                    c_sssr, all_bonds, adjacencyMatrix, nsssr)
-            else:
-                c_sssr, all_bonds = SSSR.__process_even_case(c[i],\
-                    c_sssr, all_bonds, adjacencyMatrix, nsssr)
+        """Searches the candidates for the smallest set of smallest rings. Each candidate ring is encoded as an edge bitmask
+and tested for independence against the rings found so far by Gaussian elimination over GF(2)."""
+        _, edges = SSSR.getEdgeIndex(Graph.adjacencyMatrixToList(adjacencyMatrix))
+        c_sssr, basis, seen = [], {}, set()
+        for candidate in c:
+            for mask in SSSR.__candidateMasks(candidate):
+                if len(c_sssr) >= nsssr:
+                    return c_sssr
+                if mask in seen:
+                    continue
+                seen.add(mask)
+                atoms = SSSR.maskToAtoms(mask, edges)
+                if SSSR.isRingMask(mask, edges) and SSSR.getBondCount(atoms, adjacencyMatrix) == len(atoms) and \
+                        SSSR.__acceptRing(mask, atoms, basis, arrBondCount, arrRingCount):
+                    c_sssr.append(atoms)
         return c_sssr
 
     @staticmethod
-    def __process_odd_case(data: List[float], c_sssr: List[Set], all_bonds: List[Set],
-                        adjacencyMatrix: List[List[float]], nsssr: float) -> Tuple[List[Set], List[Set]]:
-        'private method for getSSSR'
-        for j in range(len(data[2])):
-            bonds = data[1][0] + data[2][j]
-            bonds = SSSR.__flatten_nested_lists(bonds)
-            atoms = SSSR.bondsToAtoms(bonds)
-            if SSSR.bondsToAtoms(atoms, adjacencyMatrix) == len(atoms) and \
-                    not SSSR.pathSetsContain(c_sssr, atoms, bonds, all_bonds):
-                c_sssr.append(atoms)
-                all_bonds += bonds
-                
-            if len(c_sssr) > nsssr:
-                return c_sssr, all_bonds
-                
-        return c_sssr, all_bonds
-
-    @staticmethod
-    def __process_even_case(data: List[float], c_sssr: List[Set], all_bonds: List[Set],
-                        adjacencyMatrix: List[List[float]], nsssr: float) -> Tuple[List[Set], List[Set]]:
-        'private method for getSSSR'
-        for j in range(len(data[1]) - 1):
-            bonds = data[1][j] + data[1][j + 1]
-            bonds = SSSR.__flatten_nested_lists(bonds)
-            atoms = SSSR.bonds_to_atoms(bonds)
-            if SSSR.get_bond_count(atoms, adjacencyMatrix) == len(atoms) and \
-                    not SSSR.pathSetsContain(c_sssr, atoms, bonds, all_bonds):
-                c_sssr.append(atoms)
-                all_bonds += bonds
-                
-            if len(c_sssr) > nsssr:
-                return c_sssr, all_bonds
-            
-        return c_sssr, all_bonds
-
-    @staticmethod
-    def __flatten_nested_lists(lst: List[List]) -> List:
-        'private method for getSSSR'
-        return [item for sublist in lst for item in sublist]
+    def __candidateMasks(candidate: List) -> List[int]:
+        'PRIVATE FUNCTION used by getSSSR(). Returns the edge bitmasks of the rings formed by the paths of a candidate.'
+        size, paths, primePaths = candidate
+        if size % 2 != 0:
+            return [paths[0] | primePath for primePath in primePaths]
+        return [paths[j] | paths[j + 1] for j in range(len(paths) - 1)]
 
     @staticmethod
     def getEdgeCount(adjacencyMatrix: List[List[int]]) -> int:
@@ -196,7 +565,7 @@ class SSSR:
     @staticmethod
     def getBondCount(atoms: Set[int], adjacency_matrix: List[List[int]]) -> int:
         'Returns the number of bonds within a set of atoms.'
-        return sum(adjacency_matrix[u][v] for u in atoms for v in atoms if u == v) // 2    
+        return sum(adjacency_matrix[u][v] for u in atoms for v in atoms if u < v)
     
     @staticmethod
     def pathSetsContain(path_sets: Set, path_set: Set[int], bonds: List[List[int]],\
@@ -0,0 +1,150 @@
+import numpy as np
+from math import floor, ceil
+from typing import List, Tuple, Union
+
+
+class SpatialGrid:
+    """A uniform grid (spatial hash) over the vertex positions of a graph, for radius and nearest-neighbour queries that only
+look at the vertices in nearby cells instead of at all vertices. The cell size is meant to be the bond length, so a
+query with a radius of a few bond lengths visits a constant number of cells.
+The grid reads the positions from Graph.coordinates. It must be told about moved vertices with update(); when it is set
+as Graph.spatialGrid, the coordinate operations of the graph (translate, rotate, rotateSubtree, the layouts, ...) do that.
+graph The graph whose vertices are indexed.
+cellSize The edge length of the square cells.
+cells A dict mapping cell coordinates (i, j) to the ids of the vertices in the cell.
+vertexCells An (n, 2) array of the cell coordinates of every indexed vertex."""
+
+    def __init__(self, graph: 'Graph', cellSize: float) -> None:
+        'The constructor of the class SpatialGrid.'
+        self.graph = graph
+        self.cellSize = float(cellSize)
+        self.cells = {}
+        self.vertexCells = np.zeros((0, 2), dtype=np.int64)
+        self.update()
+
+    def __len__(self) -> int:
+        return len(self.vertexCells)
+
+    def getCell(self, x: float, y: float) -> Tuple[int, int]:
+        'Returns the coordinates of the cell containing a point.'
+        return floor(x / self.cellSize), floor(y / self.cellSize)
+
+    def update(self, vertexIds: Union[List[int], np.ndarray] = None) -> int:
+        """Moves the given vertices (all vertices by default) to the cells of their current positions and indexes vertices
+that were added to the graph since the last update. Returns the number of vertices that changed cells."""
+        coordinates = self.graph.getCoordinates()
+        known = len(self.vertexCells)
+        if len(coordinates) > known:
+            added = np.floor(coordinates[known:] / self.cellSize).astype(np.int64)
+            self.vertexCells = np.concatenate((self.vertexCells, added))
+            for vertexId, cell in enumerate(added.tolist(), known):
+                self.cells.setdefault(tuple(cell), []).append(vertexId)
+        rows = np.arange(known) if vertexIds is None else np.asarray(vertexIds, dtype=np.intp)
+        rows = rows[rows < known]
+        newCells = np.floor(coordinates[rows] / self.cellSize).astype(np.int64)
+        changed = np.flatnonzero((newCells != self.vertexCells[rows]).any(axis=1))
+        for index in changed.tolist():
+            vertexId = int(rows[index])
+            oldCell = tuple(self.vertexCells[vertexId].tolist())
+            newCell = tuple(newCells[index].tolist())
+            members = self.cells[oldCell]
+            members.remove(vertexId)
+            if not members:
+                del self.cells[oldCell]
+            self.cells.setdefault(newCell, []).append(vertexId)
+            self.vertexCells[vertexId] = newCell
+        return len(changed) + len(coordinates) - known
+
+    def __candidates(self, x: float, y: float, reach: int) -> List[int]:
+        'PRIVATE FUNCTION used by the queries. Returns the ids of the vertices in the cells within reach cells of a point.'
+        i, j = self.getCell(x, y)
+        candidates = []
+        for di in range(-reach, reach + 1):
+            for dj in range(-reach, reach + 1):
+                candidates.extend(self.cells.get((i + di, j + dj), ()))
+        return candidates
+
+    @staticmethod
+    def getRing(reach: int) -> List[Tuple[int, int]]:
+        'Returns the cell offsets at a Chebyshev distance of exactly reach cells.'
+        if reach == 0:
+            return [(0, 0)]
+        side = range(-reach, reach)
+        return [(di, -reach) for di in side] + [(reach, dj) for dj in side] + \
+            [(-di, reach) for di in side] + [(-reach, -dj) for dj in side]
+
+    def getVerticesAt(self, position: 'Vector2', radius: float, excludeVertexId: int = None) -> List[int]:
+        'Returns the ids of the vertices within a radius of a position, optionally without excludeVertexId.'
+        candidates = self.__candidates(position.x, position.y, ceil(radius / self.cellSize))
+        if not candidates:
+            return []
+        arrCandidates = np.array(candidates, dtype=np.intp)
+        delta = self.graph.coordinates[arrCandidates] - (position.x, position.y)
+        found = arrCandidates[np.einsum('ij,ij->i', delta, delta) <= radius * radius].tolist()
+        return [vertexId for vertexId in found if vertexId != excludeVertexId]
+
+    def getNearestVertices(self, position: 'Vector2', k: int = 1, excludeVertexId: int = None) -> List[Tuple[int, float]]:
+        """Returns the k vertices closest to a position as (vertex id, distance) pairs, closest first. The search grows ring
+by ring of cells and stops once the k-th distance is smaller than the distance to any cell not searched yet."""
+        total = len(self.vertexCells) - (excludeVertexId is not None)
+        k = min(k, total)
+        if k <= 0:
+            return []
+        i, j = self.getCell(position.x, position.y)
+        seen, reach = [], 0
+        while True:
+            for di, dj in SpatialGrid.getRing(reach):
+                seen.extend(vertexId for vertexId in self.cells.get((i + di, j + dj), ()) if vertexId != excludeVertexId)
+            if len(seen) >= k:
+                arrSeen = np.array(seen, dtype=np.intp)
+                distances = np.hypot(*(self.graph.coordinates[arrSeen] - (position.x, position.y)).T)
+                order = np.argsort(distances, kind='stable')[:k]
+                if len(seen) == total or distances[order[-1]] <= reach * self.cellSize:
+                    return [(int(arrSeen[index]), float(distances[index])) for index in order]
+            reach += 1
+
+    def getClosestVertex(self, vertexId: int) -> Union[int, None]:
+        'Returns the id of the vertex closest to a given vertex, or None if it is the only vertex.'
+        nearest = self.getNearestVertices(self.graph.vertices[vertexId].position, 1, vertexId)
+        return nearest[0][0] if nearest else None
+
+    def getCenterOfMassInNeighbourhood(self, position: 'Vector2', radius: float) -> Tuple[float, float]:
+        'Returns the center of mass of the vertices within a radius of a position (the position itself if there are none).'
+        vertexIds = self.getVerticesAt(position, radius)
+        if not vertexIds:
+            return position.x, position.y
+        x, y = self.graph.coordinates[vertexIds].mean(axis=0)
+        return float(x), float(y)
+
+    def getPairsWithin(self, radius: float) -> np.ndarray:
+        """Returns the pairs (i, j), i < j, of vertices closer than radius to each other as an (m, 2) array. Each vertex is
+only compared with the vertices in its own and the neighbouring cells (half of them, so every pair is seen once):
+the vertices are sorted by cell key and the neighbouring cells are looked up with a binary search, all vectorized."""
+        count = len(self.vertexCells)
+        if count < 2:
+            return np.zeros((0, 2), dtype=np.intp)
+        reach = ceil(radius / self.cellSize)
+        cells = self.vertexCells - self.vertexCells.min(axis=0) + reach
+        width = int(cells[:, 1].max()) + reach + 1
+        keys = cells[:, 0] * width + cells[:, 1]
+        order = np.argsort(keys, kind='stable')
+        sortedKeys = keys[order]
+        coordinates = self.graph.coordinates[:count]
+        pairs = []
+        for di in range(0, reach + 1):
+            for dj in range(-reach, reach + 1):
+                if di == 0 and dj < 0:
+                    continue
+                targets = keys + di * width + dj
+                starts = np.searchsorted(sortedKeys, targets, side='left')
+                counts = np.searchsorted(sortedKeys, targets, side='right') - starts
+                first = np.repeat(np.arange(count), counts)
+                positions = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts - starts, counts)
+                second = order[positions]
+                if di == 0 and dj == 0:
+                    keep = first < second
+                    first, second = first[keep], second[keep]
+                delta = coordinates[first] - coordinates[second]
+                close = np.einsum('ij,ij->i', delta, delta) < radius * radius
+                pairs.append(np.column_stack((first[close], second[close])))
+        return np.sort(np.concatenate(pairs), axis=1)
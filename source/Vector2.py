@@ -3,7 +3,11 @@ from typing import Union, List
 
 
 class Vector2:
-    'A class representing a 2D vector.'
+    """A class representing a 2D vector.
+The operators (+, -, *, /) and the static helpers return new vectors. The in-place methods iadd(), isub(), iscale(),
+set_from() and rotate_around_inplace() modify this vector and return it, so they can be chained and used in hot loops
+without allocating."""
+    __slots__ = ('x', 'y')
 
     def __init__(self, x: Union[float, 'Vector2'], y: float) -> None:
         """ The constructor of the class Vector2.
@@ -15,7 +19,7 @@ class Vector2:
         elif (x is not None) and (y is None):
             self.x, self.y = x.x, x.y
         else:
-            self.x, self.y = x, x
+            self.x, self.y = x, y
 
     def clone(self) -> 'Vector2':
         'Clones this vector and returns the clone.'
@@ -35,8 +39,8 @@ class Vector2:
         new_y = self.y - vec.y
         return Vector2(new_x, new_y)
 
-    def __truediv__(self, vec: 'Vector2') -> 'Vector2':
-        return Vector2(self, 1 / vec)
+    def __truediv__(self, scalar: float) -> 'Vector2':
+        return Vector2(self.x / scalar, self.y / scalar)
 
     def __mul__(self, val: 'Vector2') -> 'Vector2':
         if isinstance(val, Vector2):
@@ -47,14 +51,46 @@ class Vector2:
             new_y = self.y * val
         return Vector2(new_x, new_y)
 
-    def __rmul__(self, scalar: 'Vector2') -> 'Vector2':
-        return Vector2(self, scalar)
+    def __rmul__(self, scalar: float) -> 'Vector2':
+        return Vector2(self.x * scalar, self.y * scalar)
 
     def __neg__(self) -> 'Vector2':
         new_x = -self.x
         new_y = -self.y
         return Vector2(new_x, new_y)
 
+    def set_from(self, vec: 'Vector2') -> 'Vector2':
+        'Copies the coordinates of another vector into this vector.'
+        self.x = vec.x
+        self.y = vec.y
+        return self
+
+    def iadd(self, vec: 'Vector2') -> 'Vector2':
+        'Adds another vector to this vector in place.'
+        self.x += vec.x
+        self.y += vec.y
+        return self
+
+    def isub(self, vec: 'Vector2') -> 'Vector2':
+        'Subtracts another vector from this vector in place.'
+        self.x -= vec.x
+        self.y -= vec.y
+        return self
+
+    def iscale(self, scalar: float) -> 'Vector2':
+        'Multiplies this vector by a scalar in place.'
+        self.x *= scalar
+        self.y *= scalar
+        return self
+
+    def rotate_around_inplace(self, angle: float, vec: 'Vector2') -> 'Vector2':
+        'Rotates this vector by a given number of radians around a specified point, in place.'
+        sinAngle, cosAngle = sin(angle), cos(angle)
+        x, y = self.x - vec.x, self.y - vec.y
+        self.x = x * cosAngle - y * sinAngle + vec.x
+        self.y = x * sinAngle + y * cosAngle + vec.y
+        return self
+
     def angle(self) -> float:
         'Returns the angle of this vector in relation to the coordinate system.'
         return atan2(self.y, self.x)
@@ -90,13 +126,7 @@ direction compared to another vector in relation to the coordinate system."""
 
     def rotateAround(self, angle: float, vec: 'Vector2') -> 'Vector2':
         'Rotates this vector by a given number of radians around a specified point.'
-        sinAngle = sin(angle)
-        cosAngle = cos(angle)
-        self -= vec
-        self.x = self.x * cosAngle - self.y * sinAngle
-        self.y = self.x * sinAngle + self.y * cosAngle
-        self += vec
-        return self
+        return self.rotate_around_inplace(angle, vec)
 
     def rotateTo(self, vec: 'Vector2', center: 'Vector2', offsetAngle=0.0) -> 'Vector2':
         """Rotate a vector around a given center to the same angle as another vector 
@@ -150,7 +180,8 @@ direction compared to another vector in relation to the coordinate system."""
             j = i
         return odd_nodes
 
-    def __len__(self):
+    def length(self) -> float:
+        'Returns the length of this vector.'
         return sqrt((self.x ** 2) + (self.y ** 2))
 
     def lengthSq(self) -> float:
@@ -159,12 +190,11 @@ direction compared to another vector in relation to the coordinate system."""
 
     def normalize(self) -> 'Vector2':
         'Normalizes this vector.'
-        self /= len(self)
-        return self
+        return self.iscale(1.0 / self.length())
 
     def normalized(self) -> 'Vector2':
         'Returns a normalized copy of this vector.'
-        return self / len(self)
+        return self / self.length()
 
     def whichSide(self, vecA: 'Vector2', vecB: 'Vector2') -> float:
         'Calculates which side of a line spanned by two vectors this vector is.'
@@ -208,7 +238,7 @@ direction compared to another vector in relation to the coordinate system."""
     def angle(vecA: 'Vector2', vecB: 'Vector2') -> float:
         'Returns the angle between two vectors.'
         dot = Vector2.dot(vecA, vecB)
-        return acos(dot / (len(vecA) * len(vecB)))
+        return acos(dot / (vecA.length() * vecB.length()))
 
     @staticmethod
     def threePointangle(vecA: 'Vector2', vecB: 'Vector2', vecC: 'Vector2') -> float:
@@ -230,5 +260,5 @@ direction compared to another vector in relation to the coordinate system."""
         'Returns the average vector (normalized) of the input vectors.'
         avg = Vector2(0, 0)
         for vec in vecs:
-            avg += vec
+            avg.iadd(vec)
         return avg.normalize()
@@ -1,3 +1,4 @@
+from math import atan2
 from typing import List
 from MathHelper import MathHelper
 from ArrayHelper import ArrayHelper
@@ -9,7 +10,7 @@ class Vertex:
     """ A class representing a vertex.
 - id The id of this vertex.
 - value The atom associated with this vertex.
-- position The position of this vertex.
+- position The position of this vertex. Once the vertex is added to a Graph, a CoordinateView of its row in Graph.coordinates.
 - previousPosition The position of the previous vertex.
 - parentVertexId The id of the previous vertex.
 - children The ids of the children of this vertex.
@@ -22,6 +23,11 @@ class Vertex:
 - neighbours The vertex ids of neighbouring vertices.
 - neighbouringElements The element symbols associated with neighbouring vertices.
 - forcePositioned A boolean indicating whether or not this vertex was positioned using a force-based approach."""
+    __slots__ = ('id', 'value', 'position', 'previousPosition', 'parentVertexId', 'children', 'spanningTreeChildren',
+                 'edges', 'positioned', 'angle', 'dir', 'neighbourCount', 'neighbours', 'neighbouringElements',
+                 'forcePositioned')
+
+    _scratch = Vector2(0, 0)  # reused by getAngle()
 
     def __init__(self, value: 'Atom', x: float = 0, y: float = 0) -> None:
         'The constructor for the class Vertex.'
@@ -123,13 +129,11 @@ has property hasAttachedPseudoElements set to true."""
     def getAngle(self, referenceVector: 'Vector2' = None, returnAsDegrees: bool = False) -> float:
         """Returns the angle of this vertexes positional vector. 
     If a reference vector is supplied in relations to this vector, else in relations to the coordinate system."""
-        if not referenceVector:
-            u = Vector2.subtract(self.position, self.previousPosition)
-        else:
-            u = Vector2.subtract(self.position, referenceVector)
+        u = Vertex._scratch.set_from(self.position).isub(referenceVector if referenceVector is not None else self.previousPosition)
+        angle = atan2(u.y, u.x)
         if returnAsDegrees:
-            return MathHelper.toDeg(u.angle())
-        return u.angle()
+            return MathHelper.toDeg(angle)
+        return angle
 
     def getTextDirection(self, vertices: List['Vertex'], onlyHorizontal: bool = False) -> str:
         'Returns the suggested text direction when text is added at the position of this vertex.'
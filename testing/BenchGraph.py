@@ -0,0 +1,299 @@
+'Benchmarking the Graph module'
+import sys
+import random
+import timeit
+import numpy as np
+from math import sin, cos, sqrt
+sys.path.append(r'/home/jesse/cimm/source')
+from Graph import Graph
+from Vertex import Vertex
+from Vector2 import Vector2
+from MathHelper import MathHelper
+from Atom import Atom
+from Edge import Edge
+from SpatialGrid import SpatialGrid
+from OverlapScorer import OverlapScorer
+
+
+def build_bridged(n, bridges, seed=1):
+    'A bridged ring system: an n-membered ring spanned by one-atom bridges between random members.'
+    rnd = random.Random(seed)
+    graph = Graph(None)
+    for _ in range(n):
+        graph.addVertex(Vertex(Atom('C')))
+    for i in range(n):
+        graph.addEdge(Edge(i, (i + 1) % n))
+    for _ in range(bridges):
+        a = rnd.randrange(n)
+        b = (a + rnd.randrange(3, n // 2)) % n
+        c = graph.addVertex(Vertex(Atom('C')))
+        graph.addEdge(Edge(a, c))
+        graph.addEdge(Edge(c, b))
+    return graph
+
+
+def stress(graph, vertexIds, bondLength):
+    'The Kamada-Kawai stress of the current positions, used to compare the quality of two layouts.'
+    dist = graph.getSubgraphDistanceMatrix(vertexIds)
+    total = 0.0
+    for i, a in enumerate(vertexIds):
+        for j in range(i + 1, len(vertexIds)):
+            u, v = graph.vertices[a].position, graph.vertices[vertexIds[j]].position
+            total += (sqrt((u.x - v.x) ** 2 + (u.y - v.y) ** 2) - bondLength * dist[i][j]) ** 2 / dist[i][j] ** 2
+    return total
+
+
+def reset_positions(graph):
+    for vertex in graph.vertices:
+        vertex.position.x, vertex.position.y = 0.0, 0.0
+        vertex.positioned = vertex.forcePositioned = False
+
+
+def kk_layout_scalar(graph, vertexIds, center, bondLength, threshold=0.1, innerThreshold=0.1,
+                     maxIteration=2000, maxInnerIteration=50, maxEnergy=1e9):
+    'The nested-list Kamada-Kawai implementation that Graph.kkLayout replaced, kept as the baseline.'
+    length = len(vertexIds)
+    matDist = graph.getSubgraphDistanceMatrix(vertexIds).tolist()
+    radius = MathHelper.polyCircumradius(500, length)
+    angle = MathHelper.centralAngle(length)
+    a = 0.0
+    posX, posY, positioned = [0.0] * length, [0.0] * length, [False] * length
+    for i in range(length):
+        vertex = graph.vertices[vertexIds[i]]
+        if not vertex.positioned:
+            posX[i], posY[i] = center.x + cos(a) * radius, center.y + sin(a) * radius
+        else:
+            posX[i], posY[i] = vertex.position.x, vertex.position.y
+        positioned[i] = vertex.positioned
+        a += angle
+    matLength = [[bondLength * matDist[i][j] for j in range(length)] for i in range(length)]
+    matStrength = [[bondLength * matDist[i][j] ** -2.0 if i != j else 0.0 for j in range(length)]
+                   for i in range(length)]
+    matEnergy = [[0.0] * length for _ in range(length)]
+    sumX, sumY = [0.0] * length, [0.0] * length
+    for i in range(length):
+        ux, uy = posX[i], posY[i]
+        dEx, dEy = 0.0, 0.0
+        for j in range(length):
+            if i != j:
+                vx, vy = posX[j], posY[j]
+                denom = 1.0 / sqrt((ux - vx) ** 2 + (uy - vy) ** 2)
+                matEnergy[i][j] = [matStrength[i][j] * ((ux - vx) - matLength[i][j] * (ux - vx) * denom),
+                                   matStrength[i][j] * ((uy - vy) - matLength[i][j] * (uy - vy) * denom)]
+                matEnergy[j][i] = matEnergy[i][j]
+                dEx += matEnergy[i][j][0]
+                dEy += matEnergy[i][j][1]
+        sumX[i], sumY[i] = dEx, dEy
+
+    def energy(index):
+        return sumX[index] * sumX[index] + sumY[index] * sumY[index], sumX[index], sumY[index]
+
+    def update(index, dEX, dEY):
+        dxx, dyy, dxy = 0.0, 0.0, 0.0
+        ux, uy = posX[index], posY[index]
+        arrL, arrK = matLength[index], matStrength[index]
+        for i in range(length):
+            if i != index:
+                vx, vy = posX[i], posY[i]
+                l, k = arrL[i], arrK[i]
+                m = (ux - vx) * (ux - vx)
+                denom = 1.0 / ((m + (uy - vy) * (uy - vy)) ** 1.5)
+                dxx += k * (1 - l * (uy - vy) * (uy - vy) * denom)
+                dyy += k * (1 - l * m * denom)
+                dxy += k * (l * (ux - vx) * (uy - vy) * denom)
+        dxx = 0.1 if dxx == 0 else dxx
+        dyy = 0.1 if dyy == 0 else dyy
+        dxy = 0.1 if dxy == 0 else dxy
+        dy = (dEX / dxx + dEY / dxy) / (dxy / dxx - dyy / dxy)
+        dx = -(dxy * dy + dEX) / dxx
+        posX[index] += dx
+        posY[index] += dy
+        arrE = matEnergy[index]
+        dEX, dEY = 0.0, 0.0
+        ux, uy = posX[index], posY[index]
+        for i in range(length):
+            if index != i:
+                vx, vy = posX[i], posY[i]
+                prevEx, prevEy = arrE[i][0], arrE[i][1]
+                denom = 1.0 / sqrt((ux - vx) * (ux - vx) + (uy - vy) * (uy - vy))
+                dx = arrK[i] * ((ux - vx) - arrL[i] * (ux - vx) * denom)
+                dy = arrK[i] * ((uy - vy) - arrL[i] * (uy - vy) * denom)
+                arrE[i] = [dx, dy]
+                dEX += dx
+                dEY += dy
+                sumX[i] += dx - prevEx
+                sumY[i] += dy - prevEy
+        sumX[index], sumY[index] = dEX, dEY
+
+    iteration = 0
+    while maxEnergy > threshold and maxIteration > iteration:
+        iteration += 1
+        maxEnergy, maxEnergyId, dEX, dEY = 0.0, 0, 0.0, 0.0
+        for i in range(length):
+            delta, x, y = energy(i)
+            if delta > maxEnergy and not positioned[i]:
+                maxEnergy, maxEnergyId, dEX, dEY = delta, i, x, y
+        delta, innerIteration = maxEnergy, 0
+        while delta > innerThreshold and maxInnerIteration > innerIteration:
+            innerIteration += 1
+            update(maxEnergyId, dEX, dEY)
+            delta, dEX, dEY = energy(maxEnergyId)
+    return list(zip(posX, posY))
+
+
+def bench_kk_layout(sizes=((24, 8), (36, 12), (48, 16), (72, 24)), repeat=3):
+    print('Kamada-Kawai layout of bridged ring systems (best of %d)' % repeat)
+    print('%6s %11s %11s %8s %14s %12s %12s' % ('atoms', 'scalar [s]', 'numpy [s]', 'speedup',
+                                                'dev @400 it', 'stress old', 'stress new'))
+    for n, bridges in sizes:
+        graph = build_bridged(n, bridges)
+        vertexIds = graph.getVertexList()
+        center = Vector2(0, 0)
+
+        def run_numpy(maxIteration=2000):
+            reset_positions(graph)
+            graph.kkLayout(vertexIds, center, 0, None, 15.0, maxIteration=maxIteration)
+
+        def run_scalar(maxIteration=2000):
+            reset_positions(graph)
+            return kk_layout_scalar(graph, vertexIds, center, 15.0, maxIteration=maxIteration)
+
+        scalar = min(timeit.repeat(run_scalar, number=1, repeat=repeat))
+        vectorized = min(timeit.repeat(run_numpy, number=1, repeat=repeat))
+        # Both engines follow the same trajectory; near convergence rounding differences may pick another vertex.
+        reference = run_scalar(400)
+        run_numpy(400)
+        deviation = max(sqrt((v.position.x - x) ** 2 + (v.position.y - y) ** 2)
+                        for v, (x, y) in zip(graph.vertices, reference))
+        for vertex, (x, y) in zip(graph.vertices, run_scalar()):
+            vertex.position.x, vertex.position.y = x, y
+        stressScalar = stress(graph, vertexIds, 15.0)
+        run_numpy()
+        stressNumpy = stress(graph, vertexIds, 15.0)
+        print('%6d %11.4f %11.4f %7.1fx %14.2e %12.1f %12.1f' % (len(vertexIds), scalar, vectorized, scalar / vectorized,
+                                                             deviation, stressScalar, stressNumpy))
+
+
+def bench_layout_engines(sizes=((24, 8), (36, 12), (48, 16), (72, 24), (120, 40))):
+    print('Kamada-Kawai against stress majorization on bridged ring systems')
+    print('%6s %11s %8s %10s %11s %8s %10s' % ('atoms', 'kk [s]', 'kk it', 'kk stress',
+                                               'smacof [s]', 'sm it', 'sm stress'))
+    for n, bridges in sizes:
+        graph = build_bridged(n, bridges)
+        vertexIds = graph.getVertexList()
+        results = []
+        for layout in (graph.kkLayout, graph.smacofLayout):
+            reset_positions(graph)
+            start = timeit.default_timer()
+            result = layout(vertexIds, Vector2(0, 0), 0, None, 15.0)
+            results.append((timeit.default_timer() - start, result['iterations'], result['stress']))
+        print('%6d %11.4f %8d %10.1f %11.4f %8d %10.1f' % (len(vertexIds), *results[0], *results[1]))
+
+
+def chain_tree(length):
+    'The parse tree of a linear chain of carbon atoms.'
+    node = None
+    for _ in range(length):
+        node = {'atom': 'C', 'bond': '-', 'branches': [], 'branchCount': 0, 'ringbonds': [],
+                'ringbondCount': 0, 'next': node, 'hasNext': node is not None}
+    return node
+
+
+def bench_chains(lengths=(1000, 10000, 100000)):
+    print('Stack-based traversals on linear chains (recursion limit %d)' % sys.getrecursionlimit())
+    print('%8s %10s %10s %10s %10s %12s' % ('atoms', 'build [s]', 'bridges', 'components', 'tree depth', 'traverseTree'))
+    for length in lengths:
+        tree = chain_tree(length)
+        start = timeit.default_timer()
+        graph = Graph(tree)
+        build = timeit.default_timer() - start
+        adjacencyList = graph.getAdjacencyList()
+        timings = [
+            timeit.timeit(graph.getBridges, number=1),
+            timeit.timeit(lambda: Graph.getConnectedComponentsFromList(adjacencyList), number=1),
+            timeit.timeit(lambda: graph.getTreeDepth(1, 0), number=1),
+            timeit.timeit(lambda: graph.traverseTree(0, None, lambda vertex: None), number=1)
+        ]
+        print('%8d %10.4f %10.4f %10.4f %10.4f %12.4f' % (length, build, *timings))
+
+
+def bench_subtree_rotation(lengths=(100, 1000, 10000), repeat=20):
+    print('Rotating the subtree of vertex 1 (per-vertex traverseTree + rotateAround vs rotateSubtree), ms per rotation')
+    print('%8s %12s %12s' % ('atoms', 'per vertex', 'batched'))
+    center = Vector2(0, 0)
+    for length in lengths:
+        graph = Graph(chain_tree(length))
+        graph.getCoordinates()[:, 0] = np.arange(length)
+        perVertex = timeit.timeit(lambda: graph.traverseTree(1, 0, lambda vertex: vertex.position.rotateAround(0.1, center)),
+                                  number=repeat)
+        graph.rotateSubtree(1, 0, 0.1, center)
+        batched = timeit.timeit(lambda: graph.rotateSubtree(1, 0, 0.1, center), number=repeat)
+        print('%8d %12.3f %12.3f' % (length, perVertex / repeat * 1e3, batched / repeat * 1e3))
+
+
+def bench_spatial_grid(sizes=(100, 500, 2000), bondLength=15.0):
+    print('Vertex pairs closer than 0.8 bond lengths (all-pairs loop vs SpatialGrid.getPairsWithin), ms')
+    print('%8s %12s %12s %12s' % ('atoms', 'all pairs', 'grid build', 'grid pairs'))
+    rnd = random.Random(1)
+    for n in sizes:
+        graph = Graph(None)
+        side = sqrt(n) * bondLength
+        for _ in range(n):
+            vertex = Vertex(Atom('C'))
+            vertex.position.x, vertex.position.y = rnd.uniform(0, side), rnd.uniform(0, side)
+            graph.addVertex(vertex)
+        positions = [vertex.position.clone() for vertex in graph.vertices]
+        limit = (0.8 * bondLength) ** 2
+        allPairs = timeit.timeit(lambda: [(i, j) for i in range(n) for j in range(i + 1, n)
+                                          if positions[i].distanceSq(positions[j]) < limit], number=1)
+        build = timeit.timeit(lambda: SpatialGrid(graph, bondLength), number=1)
+        grid = SpatialGrid(graph, bondLength)
+        pairs = timeit.timeit(lambda: grid.getPairsWithin(0.8 * bondLength), number=1)
+        print('%8d %12.2f %12.2f %12.2f' % (n, allPairs * 1e3, build * 1e3, pairs * 1e3))
+
+
+def overlap_score_loop(graph, bondLength):
+    'The pairwise double loop over the vertices that OverlapScorer replaces, kept as the baseline.'
+    total = 0.0
+    for i, a in enumerate(graph.vertices):
+        for j in range(i + 1, len(graph.vertices)):
+            dist = a.position.distanceSq(graph.vertices[j].position)
+            if dist < bondLength ** 2:
+                total += (bondLength - sqrt(dist)) / bondLength
+    return total
+
+
+def bench_overlap(sizes=(100, 500), bondLength=15.0, candidates=12):
+    print('Overlap scoring (loop vs OverlapScorer) and %d candidate rotations of half the molecule, ms' % candidates)
+    print('%8s %12s %12s %12s %12s' % ('atoms', 'loop score', 'score', 'loop batch', 'batch'))
+    rnd = random.Random(1)
+    for n in sizes:
+        graph = Graph(chain_tree(n))
+        side = sqrt(n) * bondLength
+        graph.getCoordinates()[:] = [(rnd.uniform(0, side), rnd.uniform(0, side)) for _ in range(n)]
+        scorer = OverlapScorer(graph, bondLength)
+        center = graph.vertices[n // 2 - 1].position.clone()
+        angles = np.linspace(0.0, 2 * np.pi, candidates, endpoint=False)
+
+        def loop_batch():
+            for angle in angles:
+                graph.rotateSubtree(n // 2, n // 2 - 1, angle, center)
+                overlap_score_loop(graph, bondLength)
+                graph.rotateSubtree(n // 2, n // 2 - 1, -angle, center)
+
+        timings = [
+            timeit.timeit(lambda: overlap_score_loop(graph, bondLength), number=1),
+            timeit.timeit(scorer.getOverlapScore, number=1),
+            timeit.timeit(loop_batch, number=1),
+            timeit.timeit(lambda: scorer.scoreRotations(n // 2, n // 2 - 1, angles, center), number=1)
+        ]
+        print('%8d %12.2f %12.2f %12.2f %12.2f' % (n, *(timing * 1e3 for timing in timings)))
+
+
+if __name__ == '__main__':
+    bench_kk_layout()
+    bench_layout_engines()
+    bench_chains()
+    bench_subtree_rotation()
+    bench_spatial_grid()
+    bench_overlap()
@@ -0,0 +1,58 @@
+'Benchmarking the memory of a MoleculeStore against a list of Graphs'
+import sys
+import random
+import tracemalloc
+sys.path.append(r'/home/jesse/cimm/source')
+from Graph import Graph
+from Vertex import Vertex
+from Atom import Atom
+from Edge import Edge
+from MoleculeStore import MoleculeStore
+
+
+def build_molecule(rnd):
+    'A drug-sized molecule: a benzene ring with a random chain of 10 to 30 heavy atoms.'
+    graph = Graph(None)
+    for _ in range(6):
+        graph.addVertex(Vertex(Atom('c')))
+    for i in range(6):
+        graph.addEdge(Edge(i, (i + 1) % 6))
+    for _ in range(rnd.randrange(10, 30)):
+        vertexId = graph.addVertex(Vertex(Atom(rnd.choice('CCCNOS'))))
+        graph.addEdge(Edge(rnd.randrange(vertexId), vertexId))
+    for vertex in graph.vertices:
+        vertex.position.x, vertex.position.y = rnd.random(), rnd.random()
+    return graph
+
+
+def measure(build):
+    'Returns the result of build() and the bytes it keeps allocated.'
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def bench_memory(count):
+    graphs, graphBytes = measure(lambda: [build_molecule(rnd) for rnd in [random.Random(1)] for _ in range(count)])
+    atoms = sum(len(graph.vertices) for graph in graphs)
+    del graphs
+
+    def build_store():
+        # the same molecules, each Graph is dropped once it is in the store
+        rnd, store = random.Random(1), MoleculeStore()
+        for _ in range(count):
+            store.addGraph(build_molecule(rnd))
+        store.getCsr()
+        return store
+
+    store, storeBytes = measure(build_store)
+    print(f'{count} molecules, {atoms} atoms')
+    print(f'{"Graph objects":>14}: {graphBytes / 2 ** 20:8.1f} MiB ({graphBytes / atoms:6.0f} B/atom)')
+    print(f'{"MoleculeStore":>14}: {storeBytes / 2 ** 20:8.1f} MiB ({storeBytes / atoms:6.0f} B/atom, columns {store.nbytes() / atoms:.0f} B/atom)')
+
+
+if __name__ == '__main__':
+    bench_memory(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,55 @@
+'Benchmarking the SSSR module'
+import sys
+import resource
+import subprocess
+import timeit
+sys.path.append(r'/home/jesse/cimm/source')
+from SSSR import SSSR
+
+
+def ladder(n):
+    'A fused ring component of n atoms (n even): two chains of n / 2 atoms joined by a rung at every other position.'
+    half = n // 2
+    adjacencyMatrix = [[0] * n for _ in range(n)]
+    bonds = [(i, i + 1) for i in range(half - 1)] + [(half + i, half + i + 1) for i in range(half - 1)]
+    bonds += [(i, half + i) for i in range(0, half, 2)]
+    for u, v in bonds:
+        adjacencyMatrix[u][v] = adjacencyMatrix[v][u] = 1
+    return adjacencyMatrix
+
+
+def peak_rss():
+    'The peak resident set size of this process in MiB (ru_maxrss is in KiB on Linux).'
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(mode, n):
+    'Runs in a fresh process, so that the peak RSS only covers one component.'
+    adjacencyMatrix = ladder(n)
+    before = peak_rss()
+    start = timeit.default_timer()
+    if mode == 'nested':
+        # the n x n x n nested lists SSSR allocated for pe and pe_prime before any work started
+        pe = [[[[] for _ in range(n)] for _ in range(n)] for _ in range(n)]
+        pe_prime = [[[[] for _ in range(n)] for _ in range(n)] for _ in range(n)]
+    else:
+        SSSR.getPathIncludedDistanceMatrices(adjacencyMatrix)
+    print(f'{peak_rss() - before:.1f} {timeit.default_timer() - start:.2f}')
+
+
+def bench_pidm(sizes=(50, 100, 300), nestedLimit=100):
+    print('peak RSS above baseline of getPathIncludedDistanceMatrices on ring components (MiB, s)')
+    print(f'{"atoms":>6} {"sparse MiB":>11} {"sparse s":>9} {"nested MiB":>11}')
+    for n in sizes:
+        sparse = subprocess.run([sys.executable, __file__, 'sparse', str(n)], capture_output=True, text=True).stdout.split()
+        nested = ['skipped']
+        if n <= nestedLimit:
+            nested = subprocess.run([sys.executable, __file__, 'nested', str(n)], capture_output=True, text=True).stdout.split()
+        print(f'{n:>6} {sparse[0]:>11} {sparse[1]:>9} {nested[0]:>11}')
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 3:
+        measure(sys.argv[1], int(sys.argv[2]))
+    else:
+        bench_pidm()
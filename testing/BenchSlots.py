@@ -0,0 +1,52 @@
+'Benchmarking the allocations of the slotted Vertex, Atom, Edge and Vector2 classes against dict-backed copies of them'
+import sys
+import random
+import tracemalloc
+sys.path.append(r'/home/jesse/cimm/source')
+import Vertex
+import Atom
+import Edge
+import Vector2
+import Graph
+from BenchMoleculeStore import build_molecule
+
+
+def unslotted(cls):
+    'Returns a copy of a slotted class that keeps its attributes in a per-instance __dict__, i.e. the class before __slots__.'
+    namespace = {key: value for key, value in vars(cls).items() if key not in cls.__slots__ and key != '__slots__'}
+    return type(cls.__name__, (), namespace)
+
+
+def patch(classes):
+    'Installs the given classes in every module that refers to them by name.'
+    for module in (Vertex, Atom, Edge, Vector2, Graph, sys.modules['BenchMoleculeStore']):
+        for cls in classes:
+            if hasattr(module, cls.__name__):
+                setattr(module, cls.__name__, cls)
+
+
+def measure(count):
+    'Returns the number of allocated blocks and bytes held by count molecules.'
+    rnd = random.Random(1)
+    tracemalloc.start()
+    graphs = [build_molecule(rnd) for _ in range(count)]
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = snapshot.statistics('filename')
+    return sum(stat.count for stat in stats), sum(stat.size for stat in stats), sum(len(graph.vertices) for graph in graphs)
+
+
+def bench_slots(count):
+    slotted = [Vertex.Vertex, Atom.Atom, Edge.Edge, Vector2.Vector2]
+    blocks, size, atoms = measure(count)
+    patch([unslotted(cls) for cls in slotted])
+    dictBlocks, dictSize, _ = measure(count)
+    patch(slotted)
+    print(f'{count} molecules, {atoms} atoms')
+    print(f'{"":>10} {"blocks/mol":>11} {"bytes/mol":>10}')
+    print(f'{"__dict__":>10} {dictBlocks / count:>11.0f} {dictSize / count:>10.0f}')
+    print(f'{"__slots__":>10} {blocks / count:>11.0f} {size / count:>10.0f}')
+
+
+if __name__ == '__main__':
+    bench_slots(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,59 @@
+'Benchmarking the allocating Vector2 operators against the in-place Vector2 API'
+import sys
+import timeit
+sys.path.append(r'/home/jesse/cimm/source')
+from Vector2 import Vector2
+from Line import Line
+
+
+def shorten_allocating(line, by):
+    'Line.shorten_from() written with the allocating operators.'
+    f = line.to - line.from_
+    line.from_ = line.from_ + f / f.length() * by
+
+
+def shorten_in_place(line, by):
+    line.shorten_from(by)
+
+
+def rotate_allocating(vec, center, angle):
+    vec.set_from(Vector2.__add__(Vector2(vec.x - center.x, vec.y - center.y).rotate(angle), center))
+
+
+def rotate_in_place(vec, center, angle):
+    vec.rotate_around_inplace(angle, center)
+
+
+def count_vectors(loop):
+    'Returns the number of Vector2 objects created by loop().'
+    count, init = [0], Vector2.__init__
+
+    def counting(self, *args):
+        count[0] += 1
+        init(self, *args)
+
+    Vector2.__init__ = counting
+    try:
+        loop()
+    finally:
+        Vector2.__init__ = init
+    return count[0]
+
+
+def bench_vector2(iterations=100000):
+    line, vec, center = Line(Vector2(0.0, 0.0), Vector2(1e9, 1.0)), Vector2(1.0, 0.0), Vector2(0.5, 0.5)
+    loops = {
+        'shorten allocating': lambda: shorten_allocating(line, 1e-3),
+        'shorten in place': lambda: shorten_in_place(line, 1e-3),
+        'rotate allocating': lambda: rotate_allocating(vec, center, 1e-3),
+        'rotate in place': lambda: rotate_in_place(vec, center, 1e-3),
+    }
+    print(f'{"":>20} {"vectors/iter":>13} {"ns/iter":>8}')
+    for name, loop in loops.items():
+        vectors = count_vectors(lambda: [loop() for _ in range(1000)]) / 1000
+        seconds = timeit.timeit(loop, number=iterations)
+        print(f'{name:>20} {vectors:>13.0f} {seconds / iterations * 1e9:>8.0f}')
+
+
+if __name__ == '__main__':
+    bench_vector2()
@@ -0,0 +1,241 @@
+'Testing the Graph module'
+import unittest
+import sys
+from math import pi
+sys.path.append(r'/home/jesse/cimm/source')
+from Graph import Graph
+from Vertex import Vertex
+from Atom import Atom
+from Edge import Edge
+from Vector2 import Vector2
+from LayoutCache import LayoutCache
+from Ring import Ring
+import numpy as np
+
+
+def build_graph(count, bonds):
+    graph = Graph(None)
+    for _ in range(count):
+        graph.addVertex(Vertex(Atom('C')))
+    for source, target in bonds:
+        graph.addEdge(Edge(source, target))
+    return graph
+
+
+def parse_node(atom, next=None, branches=(), bond='-', branchBond=None):
+    return {'atom': atom, 'bond': bond, 'branchBond': branchBond, 'branches': list(branches),
+            'branchCount': len(branches), 'ringbonds': [], 'ringbondCount': 0,
+            'next': next, 'hasNext': next is not None}
+
+
+def chain_tree(length):
+    node = None
+    for _ in range(length):
+        node = parse_node('C', node)
+    return node
+
+
+class TestAddFunction(unittest.TestCase):
+    def setUp(self):
+        # methylcyclopropane with an ethyl bridge to a cyclobutane: 0-1-2 ring, 2-3-4, 4-5-6-7 ring
+        self.graph = build_graph(8, [(0, 1), (1, 2), (2, 0), (2, 3), (3, 4),
+                                     (4, 5), (5, 6), (6, 7), (7, 4)])
+
+    def test_csr_index(self):
+        offsets, neighbours, edgeIds = self.graph.getCsr()
+        self.assertEqual(list(offsets), [0, 2, 4, 7, 9, 12, 14, 16, 18])
+        self.assertEqual(list(neighbours[offsets[2]:offsets[3]]), [0, 1, 3])
+        self.assertEqual(list(edgeIds[offsets[2]:offsets[3]]), [2, 1, 3])
+
+    def test_csr_follows_add_edge(self):
+        self.graph.getCsr()
+        self.graph.addVertex(Vertex(Atom('O')))
+        self.graph.addEdge(Edge(8, 3))
+        self.assertEqual(self.graph.getNeighbourIds(3), [2, 4, 8])
+        self.assertEqual(self.graph.getNeighbourIds(8), [3])
+
+    def test_has_edge_and_get_edge(self):
+        self.assertTrue(self.graph.hasEdge(0, 2))
+        self.assertTrue(self.graph.hasEdge(2, 0))
+        self.assertFalse(self.graph.hasEdge(0, 3))
+        self.assertEqual(self.graph.getEdge(4, 7).id, 8)
+        self.assertIsNone(self.graph.getEdge(1, 5))
+        self.graph.getCsr()
+        self.assertEqual(self.graph.getEdge(7, 4).id, 8)
+        self.assertIsNone(self.graph.getEdge(1, 5))
+
+    def test_adjacency_list(self):
+        self.assertEqual(self.graph.getAdjacencyList(),
+                         [[1, 2], [0, 2], [0, 1, 3], [2, 4], [3, 5, 7], [4, 6], [5, 7], [4, 6]])
+        self.assertEqual(self.graph.getSubgraphAdjacencyList([4, 5, 6, 7]),
+                         [[1, 3], [0, 2], [1, 3], [0, 2]])
+        self.assertEqual(self.graph.getSubgraphAdjacencyMatrix([0, 1, 3]),
+                         [[0, 1, 0], [1, 0, 0], [0, 0, 0]])
+
+    def test_bridges(self):
+        self.assertEqual(sorted(sorted(bridge) for bridge in self.graph.getBridges()), [[2, 3], [3, 4]])
+
+    def test_traverse_bf(self):
+        order = []
+        self.graph.traverseBF(3, lambda vertex: order.append(vertex.id))
+        self.assertEqual(order[:5], [3, 2, 4, 0, 1])
+
+    def test_connected_components(self):
+        components = Graph.getConnectedComponentsFromList(self.graph.getComponentsAdjacencyList())
+        self.assertEqual(components, [[0, 1, 2], [4, 5, 6, 7]])
+        self.assertEqual(Graph.getConnectedComponents(self.graph.getComponentsAdjacencyMatrix()), components)
+        self.assertEqual(Graph.getConnectedComponentCount(self.graph.getComponentsAdjacencyMatrix()), 3)
+        self.assertEqual(self.graph.getComponents(), components)
+
+    def test_blocks(self):
+        self.assertEqual(self.graph.getBlocks(), [[0, 1, 2], [4, 5, 6, 7]])
+        # a spiro centre (2) and a bridge (4-5) between two fused rings
+        blocks = Graph.getBiconnectedComponentsFromList([[1, 2], [0, 2], [0, 1, 3, 4], [2, 4], [2, 3, 5], [4]])
+        self.assertEqual(blocks, [[0, 1, 2], [2, 3, 4], [4, 5]])
+
+    def test_derived_structures_cached(self):
+        adjacencyList = self.graph.getAdjacencyList()
+        components = self.graph.getComponents()
+        dist = self.graph.getDistanceMatrix()
+        self.assertIs(self.graph.getAdjacencyList(), adjacencyList)
+        self.assertIs(self.graph.getComponents(), components)
+        self.assertIs(self.graph.getDistanceMatrix(), dist)
+        self.assertIs(self.graph.getSubgraphDistanceMatrix([4, 5, 6, 7]), self.graph.getSubgraphDistanceMatrix([4, 5, 6, 7]))
+        self.assertFalse(dist.flags.writeable)
+        self.assertEqual(adjacencyList[2], [0, 1, 3])
+        self.graph.addEdge(Edge(3, 5))
+        self.assertIsNot(self.graph.getAdjacencyList(), adjacencyList)
+        self.assertEqual(self.graph.getBridges(), [[2, 3]])
+        self.assertEqual(self.graph.getComponents(), [[0, 1, 2], [3, 4, 5, 6, 7]])
+        self.assertEqual(self.graph.getDistanceMatrix()[0, 5], 3)
+
+    def test_distance_matrix(self):
+        dist = self.graph.getDistanceMatrix()
+        self.assertEqual(dist.shape, (8, 8))
+        self.assertEqual(dist[0].tolist(), [0, 1, 1, 2, 3, 4, 5, 4])
+        self.assertTrue((dist == dist.T).all())
+        sub = self.graph.getSubgraphDistanceMatrix([7, 5, 4, 0])
+        self.assertEqual(sub[:2, :2].tolist(), [[0, 2], [2, 0]])
+        self.assertEqual(sub[3].tolist(), [Graph.UNREACHABLE] * 3 + [0])
+
+    def test_coordinate_buffer(self):
+        graph = build_graph(3, [(0, 1), (1, 2)])
+        graph.vertices[1].position.x = 1.0
+        graph.vertices[2].setPosition(1.0, 1.0)
+        self.assertEqual(graph.getCoordinates().tolist(), [[0.0, 0.0], [1.0, 0.0], [1.0, 1.0]])
+        graph.translate(2.0, 3.0)
+        self.assertEqual((graph.vertices[2].position.x, graph.vertices[2].position.y), (3.0, 4.0))
+        graph.rotate(pi / 2, Vector2(2.0, 3.0), [1, 2])
+        self.assertAlmostEqual(graph.vertices[1].position.x, 2.0)
+        self.assertAlmostEqual(graph.vertices[1].position.y, 4.0)
+        graph.scale(2.0, Vector2(2.0, 3.0))
+        self.assertEqual(graph.getBounds(), (0.0, 3.0, 2.0, 5.0))
+        # the buffer grows without detaching the positions of the existing vertices
+        for _ in range(20):
+            graph.addVertex(Vertex(Atom('C'), 7.0, 8.0))
+        graph.translate(1.0, 0.0, [0])
+        self.assertAlmostEqual(graph.vertices[0].position.x, 3.0)
+        self.assertEqual(graph.getCoordinates().shape, (23, 2))
+        self.assertEqual(graph.getCoordinates()[22].tolist(), [7.0, 8.0])
+
+    def test_subtree_kernels(self):
+        # C-C(-C)-O with a ring anchored to the branch carbon
+        graph = Graph(parse_node('C', next=parse_node('C', branches=[parse_node('C')], next=parse_node('O'))))
+        graph.getCoordinates()[:] = [(-1.0, 0.0), (0.0, 0.0), (1.0, 1.0), (1.0, -1.0)]
+        ring = Ring([2])
+        ring.id, ring.center.x, ring.center.y = 5, 2.0, 0.0
+        graph.vertices[2].value.anchoredRings.append(5)
+        self.assertEqual(graph.getSubtreeVertexIds(1, 0).tolist(), [1, 2, 3])
+        graph.rotateSubtree(1, 0, pi, Vector2(0, 0), {5: ring})
+        self.assertEqual(graph.getCoordinates().round(9).tolist(), [[-1.0, 0.0], [0.0, 0.0], [-1.0, -1.0], [-1.0, 1.0]])
+        self.assertAlmostEqual(ring.center.x, -2.0)
+        graph.translateSubtree(2, 1, 0.5, 0.0, {5: ring})
+        self.assertAlmostEqual(graph.vertices[2].position.x, -0.5)
+        self.assertAlmostEqual(ring.center.x, -1.5)
+        self.assertAlmostEqual(graph.vertices[3].position.x, -1.0)
+        candidates = Graph.rotateCoordinates(graph.getCoordinates(), np.array([0.0, pi / 2, pi]), Vector2(0, 0))
+        self.assertEqual(candidates.shape, (3, 4, 2))
+        self.assertEqual(candidates[2, 0].round(9).tolist(), [1.0, 0.0])
+
+    def test_kk_layout(self):
+        graph = build_graph(6, [(i, (i + 1) % 6) for i in range(6)])
+        graph.vertices[0].positioned = True
+        graph.vertices[0].position.x, graph.vertices[0].position.y = 100.0, 0.0
+        graph.kkLayout(graph.getVertexList(), Vector2(0, 0), 0, None, 15.0)
+        self.assertEqual((graph.vertices[0].position.x, graph.vertices[0].position.y), (100.0, 0.0))
+        for edge in graph.edges:
+            u, v = graph.vertices[edge.sourceId].position, graph.vertices[edge.targetId].position
+            self.assertAlmostEqual(((u.x - v.x) ** 2 + (u.y - v.y) ** 2) ** 0.5, 15.0, delta=2.5)
+        self.assertTrue(all(vertex.forcePositioned for vertex in graph.vertices))
+
+    def test_smacof_layout(self):
+        graph = build_graph(10, [(i, (i + 1) % 8) for i in range(8)] + [(0, 8), (8, 4), (2, 9), (9, 6)])
+        graph.vertices[0].positioned = True
+        graph.vertices[0].position.x, graph.vertices[0].position.y = 50.0, 50.0
+        result = graph.smacofLayout(graph.getVertexList(), Vector2(0, 0), 0, None, 15.0)
+        self.assertEqual((graph.vertices[0].position.x, graph.vertices[0].position.y), (50.0, 50.0))
+        self.assertGreater(result['iterations'], 0)
+        self.assertLess(result['stress'], 5.0)
+        for edge in graph.edges:
+            u, v = graph.vertices[edge.sourceId].position, graph.vertices[edge.targetId].position
+            self.assertAlmostEqual(((u.x - v.x) ** 2 + (u.y - v.y) ** 2) ** 0.5, 15.0, delta=5.0)
+
+    def test_layout_cache(self):
+        cache = LayoutCache(maxSize=1)
+        bonds = [(0, 1), (1, 2), (2, 3), (3, 4), (4, 0), (0, 5), (5, 2), (2, 6), (6, 0)]
+        first = build_graph(7, bonds)
+        first.layoutCache = cache
+        self.assertNotIn('cached', first.kkLayout(first.getVertexList(), Vector2(0, 0), 0, None, 15.0))
+        # the same ring system with the atoms in another order
+        permutation = [3, 6, 0, 5, 1, 4, 2]
+        second = build_graph(7, [(permutation[u], permutation[v]) for u, v in bonds])
+        second.layoutCache = cache
+        result = second.kkLayout(second.getVertexList(), Vector2(0, 0), 0, None, 15.0)
+        self.assertTrue(result['cached'])
+        # equal up to an automorphism of the ring system
+        lengths = [sorted(round(graph.vertices[edge.sourceId].position.distance(graph.vertices[edge.targetId].position), 6)
+                          for edge in graph.edges) for graph in (first, second)]
+        self.assertEqual(lengths[0], lengths[1])
+        self.graph.layoutCache = cache
+        self.graph.kkLayout(self.graph.getVertexList(), Vector2(0, 0), 0, None, 15.0)
+        self.assertEqual(cache.getStats(), {'hits': 1, 'misses': 2, 'evictions': 1, 'size': 1})
+
+    def test_parse_tree(self):
+        # C(=O)(N)C[C@H](C)O
+        tree = parse_node('C', branches=[parse_node('O', branchBond='='), parse_node('N')], next=parse_node(
+            'C', next=parse_node({'element': 'C', 'chirality': '@', 'hcount': 1, 'class': None},
+                                 branches=[parse_node('C')], next=parse_node('O'))))
+        graph = Graph(tree)
+        self.assertEqual([vertex.value.element for vertex in graph.vertices], ['C', 'O', 'N', 'C', 'C', 'H', 'C', 'O'])
+        self.assertEqual(graph.getEdgeList(), [[0, 1], [0, 2], [0, 3], [3, 4], [4, 5], [4, 6], [4, 7]])
+        self.assertEqual(graph.edges[0].weight, 2)
+        self.assertTrue(graph.vertices[4].value.isStereoCenter)
+        self.assertEqual(graph.atomIdxToVertexId, [0, 1, 2, 3, 4, 6, 7])
+
+    def test_tree_walks(self):
+        graph = Graph(parse_node('C', branches=[parse_node('C', next=parse_node('C'))],
+                                 next=parse_node('C', branches=[parse_node('O')], next=parse_node('C'))))
+        order = []
+        graph.traverseTree(0, None, lambda vertex: order.append(vertex.id))
+        self.assertEqual(order, [0, 1, 2, 3, 4, 5])
+        order = []
+        graph.traverseTree(3, 0, lambda vertex: order.append(vertex.id), maxDepth=1, ignoreFirst=True)
+        self.assertEqual(order, [4, 5])
+        self.assertEqual(graph.getTreeDepth(0, 3), 3)
+        self.assertEqual(graph.getTreeDepth(3, 0), 2)
+        self.assertEqual(graph.getTreeDepth(3, None), 0)
+
+    def test_long_chain(self):
+        graph = Graph(chain_tree(20000))
+        self.assertEqual(len(graph.edges), 19999)
+        self.assertEqual(graph.getTreeDepth(1, 0), 19999)
+        self.assertEqual(len(graph.getBridges()), 19999)
+        count = [0]
+        graph.traverseTree(0, None, lambda vertex: count.__setitem__(0, count[0] + 1))
+        self.assertEqual(count[0], 20000)
+        self.assertEqual(Graph.getConnectedComponentCountFromList(graph.getAdjacencyList()), 1)
+        self.assertEqual(len(Graph.getConnectedComponentsFromList(graph.getAdjacencyList())[0]), 20000)
+
+
+if __name__ == '__main__':
+    unittest.main()
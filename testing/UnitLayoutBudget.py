@@ -0,0 +1,105 @@
+'Testing the LayoutBudget module'
+import unittest
+import sys
+import numpy as np
+sys.path.append(r'/home/jesse/cimm/source')
+from LayoutBudget import LayoutBudget
+from LayoutCache import LayoutCache
+from OverlapScorer import OverlapScorer
+from SSSR import SSSR
+from Vector2 import Vector2
+from UnitGraph import build_graph
+from UnitSSSR import cycle, is_cycle
+
+
+class TestAddFunction(unittest.TestCase):
+    def test_budget(self):
+        budget = LayoutBudget(maxIterations=3)
+        self.assertEqual([budget.spend() for _ in range(3)], [False, False, False])
+        self.assertTrue(budget.expired())
+        self.assertTrue(budget.spend())
+        self.assertEqual(budget.getRemainingTime(), float('inf'))
+        self.assertTrue(LayoutBudget(seconds=0.0).expired())
+        budget.degrade('sssr')
+        budget.degrade('sssr')
+        self.assertTrue(budget.degraded)
+        self.assertEqual(budget.getReasons(), ['sssr'])
+
+    def test_sssr_fallback(self):
+        # cubane needs the full algorithm; without budget its rings are a fundamental cycle basis
+        graph = build_graph(8, cycle(4) + cycle(4, 4) + [(i, i + 4) for i in range(4)])
+        budget = LayoutBudget(maxIterations=0)
+        before = SSSR.counters['fallback']
+        rings = SSSR.getRings(graph, budget=budget)
+        self.assertEqual(SSSR.counters['fallback'], before + 1)
+        self.assertEqual(len(rings), 5)
+        self.assertTrue(all(is_cycle(graph, ring) for ring in rings))
+        self.assertEqual(budget.getReasons(), ['sssr'])
+        # the fast paths do not need the budget
+        budget = LayoutBudget(maxIterations=0)
+        self.assertEqual(len(SSSR.getRings(build_graph(6, cycle(6)), budget=budget)), 1)
+        self.assertFalse(budget.degraded)
+
+    def test_kk_layout(self):
+        graph = build_graph(8, cycle(8) + [(0, 4)])
+        graph.layoutCache = LayoutCache()
+        budget = LayoutBudget(maxIterations=5)
+        result = graph.kkLayout(graph.getVertexList(), Vector2(0, 0), 0, None, 15.0, budget=budget)
+        self.assertTrue(result['degraded'])
+        self.assertEqual(result['iterations'], 5)
+        self.assertEqual(budget.getReasons(), ['kkLayout'])
+        self.assertEqual(len(graph.layoutCache), 0)
+        # an exhausted budget places the vertices on a circle
+        graph = build_graph(8, cycle(8) + [(0, 4)])
+        result = graph.kkLayout(graph.getVertexList(), Vector2(0, 0), 0, None, 15.0, budget=budget)
+        self.assertEqual(result['iterations'], 0)
+        radii = np.hypot(*graph.getCoordinates().T)
+        self.assertTrue(np.allclose(radii, radii[0]))
+        self.assertNotIn('degraded', graph.kkLayout(graph.getVertexList(), Vector2(0, 0), 0, None, 15.0, budget=LayoutBudget()))
+
+    def test_exact_budget(self):
+        # a budget of exactly the iterations a layout needs is not degraded, one less is
+        for layout in ('kkLayout', 'smacofLayout'):
+            needed = getattr(build_graph(8, cycle(8) + [(0, 4)]), layout)(list(range(8)), Vector2(0, 0), 0, None, 15.0)['iterations']
+            budget = LayoutBudget(maxIterations=needed)
+            result = getattr(build_graph(8, cycle(8) + [(0, 4)]), layout)(list(range(8)), Vector2(0, 0), 0, None, 15.0, budget=budget)
+            self.assertEqual(result['iterations'], needed, layout)
+            self.assertNotIn('degraded', result)
+            self.assertFalse(budget.degraded)
+            budget = LayoutBudget(maxIterations=needed - 1)
+            result = getattr(build_graph(8, cycle(8) + [(0, 4)]), layout)(list(range(8)), Vector2(0, 0), 0, None, 15.0, budget=budget)
+            self.assertEqual(result['iterations'], needed - 1, layout)
+            self.assertTrue(result['degraded'])
+
+    def test_smacof_layout(self):
+        graph = build_graph(8, cycle(8) + [(0, 4)])
+        budget = LayoutBudget(maxIterations=2)
+        result = graph.smacofLayout(graph.getVertexList(), Vector2(0, 0), 0, None, 15.0, threshold=0.0, budget=budget)
+        self.assertTrue(result['degraded'])
+        self.assertEqual(result['iterations'], 2)
+        self.assertEqual(budget.getReasons(), ['smacofLayout'])
+
+    def test_best_rotation(self):
+        graph = build_graph(8, [(i, i + 1) for i in range(7)])
+        graph.getCoordinates()[:] = np.random.default_rng(5).uniform(0.0, 40.0, (8, 2))
+        scorer = OverlapScorer(graph, 15.0)
+        angles = np.linspace(0.0, 6.0, 8)
+        # exactly enough iterations left for all candidates
+        budget = LayoutBudget(maxIterations=len(angles))
+        best = scorer.getBestRotation(4, 3, angles, graph.vertices[3].position, budget)
+        self.assertEqual(best, scorer.getBestRotation(4, 3, angles, graph.vertices[3].position))
+        self.assertEqual(budget.iterations, 8)
+        self.assertFalse(budget.degraded)
+        self.assertTrue(budget.expired())
+        # a budget smaller than the number of candidates is exhausted by the call itself
+        budget = LayoutBudget(maxIterations=len(angles) - 1)
+        angle, score = scorer.getBestRotation(4, 3, angles, graph.vertices[3].position, budget)
+        self.assertEqual(angle, 0.0)
+        self.assertAlmostEqual(score, scorer.getOverlapScore()['total'])
+        self.assertEqual(budget.getReasons(), ['overlap'])
+        angle, _ = scorer.getBestRotation(4, 3, angles, graph.vertices[3].position, LayoutBudget(maxIterations=0))
+        self.assertEqual(angle, 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+'Testing the MoleculeStore module'
+import unittest
+import sys
+sys.path.append(r'/home/jesse/cimm/source')
+from MoleculeStore import MoleculeStore
+from Graph import Graph
+from Vertex import Vertex
+from Atom import Atom
+from Edge import Edge
+
+
+def pyridine_with_methyl():
+    graph = Graph(None)
+    for element in ['c', 'c', 'c', 'n', 'c', 'c', 'C']:
+        vertex = Vertex(Atom(element))
+        vertex.position.x, vertex.position.y = len(graph.vertices) * 10.0, 5.0
+        graph.addVertex(vertex)
+    for i in range(6):
+        edge = Edge(i, (i + 1) % 6)
+        edge.isPartOfAromaticRing = True
+        graph.addEdge(edge)
+    edge = Edge(0, 6)
+    edge.setBondType('=')
+    graph.addEdge(edge)
+    graph.vertices[3].value.bracket = {'hcount': 1, 'charge': 1}
+    return graph
+
+
+class TestAddFunction(unittest.TestCase):
+    def setUp(self):
+        self.store = MoleculeStore()
+        self.store.addGraph(pyridine_with_methyl())
+        self.store.addGraph(pyridine_with_methyl())
+
+    def test_columns(self):
+        self.assertEqual(len(self.store), 2)
+        self.assertEqual(list(self.store.atomOffsets), [0, 7, 14])
+        self.assertEqual(self.store.getBondCount(1), 7)
+        self.assertEqual(list(self.store.elements[:7]), [6, 6, 6, 7, 6, 6, 6])
+        self.assertEqual(self.store.charges[10], 1)
+
+    def test_views(self):
+        vertices = self.store.getVertices(1)
+        self.assertEqual(vertices[3].value.element, 'N')
+        self.assertTrue(vertices[3].value.isPartOfAromaticRing)
+        self.assertTrue(vertices[3].value.isHeteroAtom())
+        self.assertTrue(vertices[0].value.isInRing)
+        self.assertFalse(vertices[6].value.isInRing)
+        self.assertEqual(vertices[0].neighbours, [1, 5, 6])
+        self.assertEqual(vertices[0].getNeighbours(5), [1, 6])
+        self.assertEqual(vertices[0].edges, [0, 5, 6])
+        edge = self.store.getEdges(1)[6]
+        self.assertEqual((edge.sourceId, edge.targetId, edge.bondType, edge.weight), (0, 6, '=', 2))
+        self.assertFalse(edge.isInRing)
+        self.assertTrue(self.store.getEdges(1)[0].isPartOfAromaticRing)
+
+    def test_positions_write_through(self):
+        position = self.store.getVertices(1)[2].position
+        self.assertEqual((position.x, position.y), (20.0, 5.0))
+        position.x = -1.0
+        self.assertEqual(self.store.x[9], -1.0)
+        self.assertEqual(self.store.getPositions(1)[2].tolist(), [-1.0, 5.0])
+        self.assertEqual(self.store.getPositions(0)[2].tolist(), [20.0, 5.0])
+
+    def test_csr_follows_add_graph(self):
+        self.store.getCsr()
+        index = self.store.addGraph(pyridine_with_methyl())
+        self.assertEqual(self.store.getVertices(index)[6].neighbours, [0])
+        offsets, _, _ = self.store.getCsr()
+        self.assertEqual(len(offsets), 22)
+
+    def test_to_graph(self):
+        graph = self.store.toGraph(1)
+        self.assertEqual(graph.getEdgeList(), pyridine_with_methyl().getEdgeList())
+        self.assertEqual([vertex.value.element for vertex in graph.vertices], ['C', 'C', 'C', 'N', 'C', 'C', 'C'])
+        self.assertTrue(graph.vertices[3].value.isPartOfAromaticRing)
+        self.assertEqual(graph.edges[6].weight, 2)
+        self.assertEqual((graph.vertices[4].position.x, graph.vertices[4].position.y), (40.0, 5.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+'Testing the OverlapScorer module'
+import unittest
+import sys
+import numpy as np
+from math import pi
+sys.path.append(r'/home/jesse/cimm/source')
+from OverlapScorer import OverlapScorer
+from SpatialGrid import SpatialGrid
+from Graph import Graph
+from Vector2 import Vector2
+from UnitGraph import chain_tree
+
+
+def overlap_score_loop(graph, bondLength):
+    'The pairwise double loop the scorer replaces.'
+    total, scores = 0.0, [0.0] * len(graph.vertices)
+    for i, a in enumerate(graph.vertices):
+        for j in range(i + 1, len(graph.vertices)):
+            b = graph.vertices[j]
+            if not a.value.isDrawn or not b.value.isDrawn:
+                continue
+            dist = (a.position - b.position).lengthSq()
+            if dist < bondLength ** 2:
+                weighted = (bondLength - dist ** 0.5) / bondLength
+                total += weighted
+                scores[i] += weighted
+                scores[j] += weighted
+    return total, scores
+
+
+class TestAddFunction(unittest.TestCase):
+    def setUp(self):
+        # a chain of 30 atoms at random positions, so that many of them overlap
+        self.graph = Graph(chain_tree(30))
+        self.graph.getCoordinates()[:] = np.random.default_rng(3).uniform(0.0, 60.0, (30, 2))
+        self.graph.vertices[7].value.isDrawn = False
+        self.scorer = OverlapScorer(self.graph, 15.0)
+
+    def test_overlap_score(self):
+        total, scores = overlap_score_loop(self.graph, 15.0)
+        result = self.scorer.getOverlapScore()
+        self.assertAlmostEqual(result['total'], total)
+        np.testing.assert_allclose(result['vertexScores'], scores)
+        self.assertEqual(result['scores'][0]['id'], int(np.argmax(scores)))
+        self.graph.spatialGrid = SpatialGrid(self.graph, 40.0)
+        self.assertAlmostEqual(self.scorer.getOverlapScore()['total'], total)
+
+    def test_subtree_overlap_score(self):
+        vertexScores = self.scorer.getOverlapScore()['vertexScores']
+        subtree = self.scorer.getSubtreeOverlapScore(20, 19, vertexScores)
+        scores = vertexScores[20:]
+        self.assertAlmostEqual(subtree['value'], scores[scores > 0.42].mean())
+        self.assertAlmostEqual(subtree['center'].x, scores @ self.graph.getCoordinates()[20:, 0] / scores[scores > 0.42].sum())
+
+    def test_score_rotations(self):
+        center = self.graph.vertices[19].position.clone()
+        angles = np.linspace(0.0, 2 * pi, 12, endpoint=False)
+        totals = self.scorer.scoreRotations(20, 19, angles, center)
+        self.assertAlmostEqual(totals[0], self.scorer.getOverlapScore()['total'])
+        angle, score = self.scorer.getBestRotation(20, 19, angles, center)
+        self.assertEqual((angle, score), (angles[np.argmin(totals)], totals.min()))
+        self.graph.rotateSubtree(20, 19, angles[5], center)
+        self.assertAlmostEqual(totals[5], self.scorer.getOverlapScore()['total'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+'Testing the Ring module'
+import unittest
+import sys
+sys.path.append(r'/home/jesse/cimm/source')
+from Ring import Ring
+from UnitGraph import build_graph
+
+
+class TestAddFunction(unittest.TestCase):
+    def setUp(self):
+        # a six-membered ring with a methyl group on vertex 0, the members are not in ring order
+        self.graph = build_graph(7, [(0, 1), (1, 2), (2, 3), (3, 4), (4, 5), (5, 0), (0, 6)])
+        self.ring = Ring([3, 1, 0, 2, 5, 4])
+        self.ring.id = 0
+
+    def test_order(self):
+        self.assertTrue(self.ring.buildOrder(self.graph.vertices))
+        self.assertEqual(self.ring.orderedMembers, (3, 2, 1, 0, 5, 4))
+        self.assertEqual([self.graph.edges[edgeId].sourceId for edgeId in self.ring.edgeIds], [2, 1, 0, 5, 4, 3])
+        self.assertEqual(self.ring.getPosition(0), 3)
+        self.assertIsNone(self.ring.getPosition(6))
+        self.assertTrue(self.ring.contains(5))
+        self.assertFalse(self.ring.contains(6))
+        self.assertIs(self.ring.clone().orderedMembers, self.ring.orderedMembers)
+
+    def test_each_member(self):
+        members = []
+        self.ring.each_member(self.graph.vertices, members.append, 2, 1)
+        self.assertEqual(members, [2, 3, 4, 5, 0, 1])
+        members = []
+        self.ring.each_member(self.graph.vertices, members.append, 2, 3)
+        self.assertEqual(members, [2, 1, 0, 5, 4, 3])
+        # without a previous vertex, the walk follows the first ring neighbour of the start vertex
+        self.graph.vertices[0].neighbours = [6, 5, 1]
+        members = []
+        self.ring.each_member(self.graph.vertices, members.append, 0)
+        self.assertEqual(members, [0, 5, 4, 3, 2, 1])
+
+    def test_not_a_simple_cycle(self):
+        graph = build_graph(8, [(0, 1), (1, 2), (2, 3), (3, 0), (0, 4), (4, 5), (5, 6), (6, 7), (7, 0)])
+        self.assertFalse(Ring([0, 1, 2, 3, 4, 5, 6, 7]).buildOrder(graph.vertices))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+'Testing the RingConnection and RingConnectionRegistry modules'
+import unittest
+import sys
+sys.path.append(r'/home/jesse/cimm/source')
+from Ring import Ring
+from RingConnection import RingConnection
+from RingConnectionRegistry import RingConnectionRegistry
+from Vertex import Vertex
+from Atom import Atom
+
+
+def ring(ringId, members):
+    r = Ring(members)
+    r.id = ringId
+    return r
+
+
+class TestAddFunction(unittest.TestCase):
+    def setUp(self):
+        # three fused rings 0-1-2 in a row and a spiro ring 3 on ring 2
+        self.rings = [ring(0, [0, 1, 2, 3, 4, 5]), ring(1, [4, 5, 6, 7, 8, 9]),
+                      ring(2, [8, 9, 10, 11, 12, 13]), ring(3, [12, 14, 15, 16])]
+        self.connections = [RingConnection(self.rings[0], self.rings[1]), RingConnection(self.rings[1], self.rings[2]),
+                            RingConnection(self.rings[2], self.rings[3])]
+        for i, ringConnection in enumerate(self.connections):
+            ringConnection.id = i
+        self.registry = RingConnectionRegistry(self.connections)
+        self.vertices = [Vertex(Atom('C')) for _ in range(17)]
+
+    def test_lookups(self):
+        self.assertEqual(len(self.registry), 3)
+        self.assertEqual(self.registry.getNeighbours(1), [0, 2])
+        self.assertEqual(sorted(self.registry.getVertices(2, 1)), [8, 9])
+        self.assertIs(self.registry.getConnection(3, 2), self.connections[2])
+        self.assertIsNone(self.registry.getConnection(0, 3))
+        self.assertIsNone(self.registry.getVertices(0, 3))
+
+    def test_static_helpers_delegate(self):
+        for ringConnections in (self.connections, self.registry):
+            self.assertEqual(RingConnection.getNeighbours(ringConnections, 2), [1, 3])
+            self.assertEqual(sorted(RingConnection.getVertices(ringConnections, 0, 1)), [4, 5])
+            self.assertFalse(RingConnection.isBridge(ringConnections, self.vertices, 1, 0))
+        self.vertices[4].value.rings = [0, 1, 4]
+        self.assertTrue(RingConnection.isBridge(self.registry, self.vertices, 0, 1))
+
+    def test_remove_and_update_other(self):
+        self.registry.remove(1)
+        self.assertEqual(self.registry.getNeighbours(1), [0])
+        self.assertIsNone(self.registry.getConnection(1, 2))
+        # ring 0 is merged into a new ring 4, e.g. when a bridged ring is created
+        self.registry.updateOther(0, 4, 1)
+        self.assertEqual(self.registry.getNeighbours(1), [4])
+        self.assertEqual(self.registry.getNeighbours(0), [])
+        self.assertIs(self.registry.getConnection(1, 4), self.connections[0])
+        newId = self.registry.add(RingConnection(self.rings[0], self.rings[3]))
+        self.assertEqual(newId, 3)
+        self.assertEqual(self.registry.getNeighbours(3), [2, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+'Testing the RingSystemGraph module'
+import unittest
+import sys
+sys.path.append(r'/home/jesse/cimm/source')
+from Ring import Ring
+from RingSystemGraph import RingSystemGraph
+
+
+def rings(*memberLists):
+    result = []
+    for ringId, members in enumerate(memberLists):
+        ring = Ring(members)
+        ring.id = ringId
+        result.append(ring)
+    return result
+
+
+class TestAddFunction(unittest.TestCase):
+    def setUp(self):
+        # naphthalene (0, 1) with a spiro cyclopentane (2) and, separately, norbornane (3, 4) and benzene (5)
+        self.rings = rings([0, 1, 2, 3, 4, 5], [4, 5, 6, 7, 8, 9], [9, 10, 11, 12, 13],
+                           [20, 21, 22, 23, 24], [20, 25, 26, 23, 24], [30, 31, 32, 33, 34, 35])
+        self.graph = RingSystemGraph(self.rings)
+
+    def test_connections(self):
+        self.assertEqual(self.graph.getConnectionType(1, 0), 'fused')
+        self.assertEqual(self.graph.getConnectionType(1, 2), 'spiro')
+        self.assertEqual(self.graph.getConnectionType(3, 4), 'bridged')
+        self.assertIsNone(self.graph.getConnectionType(0, 2))
+        self.assertEqual(self.graph.getNeighbours(1), [0, 2])
+
+    def test_ring_labels(self):
+        self.assertEqual(self.graph.getRingIds('fused'), [0, 1])
+        self.assertEqual(self.graph.getRingIds('spiro'), [1, 2])
+        self.assertEqual(self.graph.getRingIds('bridged'), [3, 4])
+        self.assertTrue(self.rings[1].isFused and self.rings[1].isSpiro)
+        self.assertFalse(self.rings[5].isFused or self.rings[5].isSpiro or self.rings[5].isPartOfBridged)
+        self.assertEqual(self.rings[0].neighbours, [1])
+
+    def test_systems(self):
+        self.assertEqual(self.graph.getSystems(), [[0, 1, 2], [3, 4], [5]])
+        self.assertEqual(self.graph.getSystemIndex(4), 1)
+        self.assertEqual(self.graph.getBridgedGroups(), [[3, 4]])
+
+
+if __name__ == '__main__':
+    unittest.main()
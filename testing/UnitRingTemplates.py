@@ -0,0 +1,64 @@
+'Testing the RingTemplates module'
+import unittest
+import random
+import sys
+sys.path.append(r'/home/jesse/cimm/source')
+from RingTemplates import RingTemplates
+from UnitGraph import build_graph
+from Vector2 import Vector2
+
+
+class TestAddFunction(unittest.TestCase):
+    def setUp(self):
+        self.templates = RingTemplates()
+
+    def permuted(self, name, seed):
+        template = RingTemplates.bundled[name]
+        length = len(template['coordinates'])
+        permutation = list(range(length))
+        random.Random(seed).shuffle(permutation)
+        bonds = [(permutation[u], permutation[v]) for u, v in template['bonds']]
+        return length, bonds
+
+    def test_bundled_templates(self):
+        self.assertEqual(len(self.templates), len(RingTemplates.bundled))
+        self.assertIn('cubane', self.templates.names.values())
+
+    def test_key_is_canonical(self):
+        for name in RingTemplates.bundled:
+            keys = set()
+            for seed in range(5):
+                length, bonds = self.permuted(name, seed)
+                keys.add(self.templates.getKey(RingTemplates.bondsToAdjacencyList(length, bonds))[0])
+            self.assertEqual(len(keys), 1, name)
+            self.assertIn(keys.pop(), self.templates)
+
+    def test_template_keeps_bond_lengths(self):
+        length, bonds = self.permuted('adamantane', 3)
+        arrPosition = self.templates.get(RingTemplates.bondsToAdjacencyList(length, bonds))
+        for u, v in bonds:
+            self.assertAlmostEqual(((arrPosition[u] - arrPosition[v]) ** 2).sum() ** 0.5, 1.0, delta=0.25)
+
+    def test_kk_layout_uses_template(self):
+        length, bonds = self.permuted('cubane', 7)
+        graph = build_graph(length, bonds)
+        graph.ringTemplates = self.templates
+        for vertexId, (x, y) in ((0, (10.0, 10.0)), (1, (10.0, 25.0))):
+            graph.vertices[vertexId].position.x, graph.vertices[vertexId].position.y = x, y
+            graph.vertices[vertexId].positioned = True
+        result = graph.kkLayout(graph.getVertexList(), Vector2(0, 0), 0, None, 15.0)
+        self.assertTrue(result['template'])
+        self.assertEqual(result['iterations'], 0)
+        self.assertEqual((graph.vertices[1].position.x, graph.vertices[1].position.y), (10.0, 25.0))
+
+    def test_learned_template(self):
+        graph = build_graph(9, [(i, (i + 1) % 7) for i in range(7)] + [(0, 7), (7, 8), (8, 4)])
+        self.assertIsNone(self.templates.get(graph.getAdjacencyList()))
+        graph.smacofLayout(graph.getVertexList(), Vector2(0, 0), 0, None, 15.0)
+        key = self.templates.addFromGraph(graph, graph.getVertexList(), 'learned')
+        self.assertIn(key, self.templates)
+        self.assertIsNotNone(self.templates.get(graph.getAdjacencyList()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+'Testing the SSSR module'
+import unittest
+import sys
+from concurrent.futures import ProcessPoolExecutor
+sys.path.append(r'/home/jesse/cimm/source')
+from SSSR import SSSR
+from RingTemplates import RingTemplates
+from UnitGraph import build_graph
+
+
+def cycle(length, offset=0):
+    return [(offset + i, offset + (i + 1) % length) for i in range(length)]
+
+
+def is_cycle(graph, ring):
+    return all(graph.hasEdge(ring[i], ring[(i + 1) % len(ring)]) for i in range(len(ring)))
+
+
+class TestAddFunction(unittest.TestCase):
+    def assertRings(self, count, bonds, sizes):
+        graph = build_graph(count, bonds)
+        rings = SSSR.getRingsBitset(graph)
+        self.assertEqual(sorted(len(ring) for ring in rings), sizes)
+        self.assertTrue(all(is_cycle(graph, ring) for ring in rings))
+        return rings
+
+    def test_gf2_basis(self):
+        basis = {}
+        self.assertTrue(SSSR.addToBasis(basis, 0b0111))
+        self.assertTrue(SSSR.addToBasis(basis, 0b1110))
+        self.assertFalse(SSSR.addToBasis(basis, 0b1001))
+        self.assertEqual(SSSR.reduceMask(basis, 0b1001), 0)
+        self.assertEqual(len(basis), 2)
+
+    def test_mask_round_trip(self):
+        edgeIndex, edges = SSSR.getEdgeIndex([[1, 3], [0, 2], [1, 3], [0, 2]])
+        mask = SSSR.bondsToMask([[0, 1], [2, 1], [2, 3], [3, 0]], edgeIndex)
+        self.assertEqual(mask, 0b1111)
+        self.assertEqual(SSSR.maskToMembers(mask, edges), [0, 1, 2, 3])
+
+    def test_fused_and_spiro(self):
+        self.assertRings(10, cycle(6) + [(5, 6), (6, 7), (7, 8), (8, 9), (9, 0)], [6, 6])
+        self.assertRings(9, cycle(5) + [(0, 5), (5, 6), (6, 7), (7, 8), (8, 0)], [5, 5])
+        self.assertEqual(SSSR.getRingsBitset(build_graph(3, [(0, 1), (1, 2)])), [])
+
+    def test_cubane(self):
+        rings = self.assertRings(8, cycle(4) + cycle(4, 4) + [(i, i + 4) for i in range(4)], [4] * 6)
+        self.assertEqual(len({frozenset(ring) for ring in rings}), 6)
+
+    def test_dependent_ring(self):
+        # the 4-ring 0-2-1-6 is the sum of the triangles 0-1-2 and 0-1-6 and must not replace the 5-ring
+        bonds = [(0, 1), (0, 2), (0, 6), (1, 2), (1, 6), (2, 3), (3, 4), (4, 5), (4, 6), (5, 6)]
+        rings = self.assertRings(7, bonds, [3, 3, 3, 5])
+        self.assertNotIn([0, 1, 2, 6], [sorted(ring) for ring in rings])
+
+    def test_bridged(self):
+        for name, sizes in (('adamantane', [6, 6, 6]), ('norbornane', [5, 5]), ('gonane', [5, 6, 6, 6])):
+            bonds = RingTemplates.bundled[name]['bonds']
+            self.assertRings(len(RingTemplates.bundled[name]['coordinates']), bonds, sizes)
+
+    def test_components(self):
+        # two rings connected by a chain, the chain atoms are not part of any ring
+        rings = self.assertRings(11, cycle(3) + [(2, 3), (3, 4)] + cycle(6, 5) + [(4, 5)], [3, 6])
+        self.assertEqual(sorted(sorted(ring) for ring in rings), [[0, 1, 2], [5, 6, 7, 8, 9, 10]])
+
+    def test_spiro_blocks(self):
+        # three rings joined at spiro centres 0 and 5 are perceived as three independent blocks
+        bonds = cycle(5) + [(0, 5), (5, 6), (6, 7), (7, 8), (8, 0)] + [(5, 9), (9, 10), (10, 11), (11, 5)]
+        graph = build_graph(12, bonds)
+        self.assertEqual(len(graph.getBlocks()), 3)
+        rings = SSSR.getRings(graph)
+        self.assertEqual(sorted(sorted(ring) for ring in rings),
+                         [[0, 1, 2, 3, 4], [0, 5, 6, 7, 8], [5, 9, 10, 11]])
+        self.assertEqual(sorted(map(sorted, SSSR.getRingsBitset(graph))), sorted(map(sorted, rings)))
+
+    def test_classify(self):
+        self.assertEqual(SSSR.classify(build_graph(6, cycle(6)).getAdjacencyList()), 'cycle')
+        self.assertEqual(SSSR.classify(build_graph(9, cycle(5) + [(0, 5), (5, 6), (6, 7), (7, 8), (8, 0)]).getAdjacencyList()), 'spiro')
+        self.assertEqual(SSSR.classify(build_graph(10, cycle(10) + [(0, 5)]).getAdjacencyList()), 'fused')
+        self.assertEqual(SSSR.classify(build_graph(5, cycle(4) + [(i, 4) for i in range(4)]).getAdjacencyList()), 'full')
+
+    def test_fast_paths(self):
+        SSSR.resetCounters()
+        anthracene = build_graph(14, cycle(14) + [(4, 13), (6, 11)])
+        rings = SSSR.getRings(anthracene)
+        self.assertEqual(sorted(sorted(ring) for ring in rings),
+                         [[0, 1, 2, 3, 4, 13], [4, 5, 6, 11, 12, 13], [6, 7, 8, 9, 10, 11]])
+        self.assertTrue(all(is_cycle(anthracene, ring) for ring in rings))
+        self.assertEqual(SSSR.getRings(build_graph(6, cycle(6))), [[0, 1, 2, 3, 4, 5]])
+        self.assertEqual(len(SSSR.getRings(build_graph(9, cycle(5) + [(0, 5), (5, 6), (6, 7), (7, 8), (8, 0)]))), 2)
+        # crossing fusion bonds are a bridged system
+        self.assertEqual(len(SSSR.getRings(build_graph(8, cycle(8) + [(0, 4), (2, 6)]))), 3)
+        self.assertEqual(SSSR.counters, {'cycle': 1, 'spiro': 1, 'fused': 1, 'full': 1, 'fallback': 0})
+
+    def test_process_pool(self):
+        # a salt of two cage ring systems and a benzene ring
+        bonds = RingTemplates.bundled['adamantane']['bonds'] + cycle(6, 10)
+        bonds += [(u + 16, v + 16) for u, v in RingTemplates.bundled['cubane']['bonds']]
+        graph = build_graph(24, bonds)
+        SSSR.resetCounters()
+        serial = SSSR.getRings(graph)
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            parallel = SSSR.getRings(graph, executor=executor, parallelThreshold=8)
+        self.assertEqual(parallel, serial)
+        self.assertEqual(SSSR.counters, {'cycle': 2, 'spiro': 0, 'fused': 0, 'full': 4, 'fallback': 0})
+
+    def test_ring_families(self):
+        # the SSSR of bicyclo[2.2.2]octane picks two of its three six-membered rings, the ring families are all three
+        bonds = RingTemplates.bundled['bicyclo[2.2.2]octane']['bonds']
+        graph = build_graph(8, bonds)
+        families = SSSR.getRingFamilies(graph)
+        self.assertEqual([len(ring) for ring in families], [6, 6, 6])
+        self.assertEqual(len(SSSR.getRings(graph)), 2)
+        permutation = [5, 2, 7, 0, 3, 6, 1, 4]
+        permuted = SSSR.getRingFamilies(build_graph(8, [(permutation[u], permutation[v]) for u, v in bonds]))
+        self.assertEqual(sorted(sorted(permutation[member] for member in ring) for ring in families),
+                         sorted(sorted(ring) for ring in permuted))
+        # the ten-membered perimeter of naphthalene is not relevant
+        self.assertEqual([len(ring) for ring in SSSR.getRingFamilies(build_graph(10, cycle(10) + [(0, 5)]))], [6, 6])
+        self.assertEqual([len(ring) for ring in SSSR.getRingFamilies(build_graph(8, cycle(8) + [(0, 4), (2, 6)]))], [5] * 4)
+
+    def test_path_included_distance_matrices(self):
+        graph = build_graph(6, cycle(6))
+        d, pe, pe_prime = SSSR.getPathIncludedDistanceMatrices(graph.getAdjacencyMatrix()).values()
+        self.assertEqual(d[0].tolist(), [0, 1, 2, 3, 2, 1])
+        self.assertEqual(len(pe[(0, 3)]), 2)
+        self.assertEqual(pe[(0, 3)][0] | pe[(0, 3)][1], 0b111111)
+        self.assertNotIn((0, 2), pe_prime)
+        self.assertNotIn((0, 0), pe)
+        candidates = SSSR.getRingCandidates(d, pe, pe_prime)
+        self.assertEqual({candidate[0] for candidate in candidates}, {6})
+
+    def test_even_and_odd_candidates(self):
+        # pairs with several shortest paths and a next-shortest path also close an even ring
+        for count, bonds, sizes in ((6, [(0, 1), (1, 2), (2, 3), (3, 0), (0, 4), (4, 1), (1, 5), (5, 4)], [3, 3, 4]),
+                                    (7, [(0, 1), (0, 3), (0, 6), (1, 2), (1, 4), (1, 6), (2, 3), (4, 6)], [3, 3, 4])):
+            graph = build_graph(count, bonds)
+            rings = SSSR.getRings(graph)
+            self.assertEqual(sorted(len(ring) for ring in rings), sizes)
+            self.assertTrue(all(is_cycle(graph, ring) for ring in rings))
+
+    def test_pidm_sssr_matches_bitset(self):
+        for name, template in RingTemplates.bundled.items():
+            graph = build_graph(len(template['coordinates']), template['bonds'])
+            adjacencyMatrix = graph.getAdjacencyMatrix()
+            d, pe, pe_prime = SSSR.getPathIncludedDistanceMatrices(adjacencyMatrix).values()
+            arrBondCount = [sum(row) for row in adjacencyMatrix]
+            nSssr = len(graph.edges) - len(graph.vertices) + 1 + all(count == 3 for count in arrBondCount)
+            rings = SSSR.getSSSR(SSSR.getRingCandidates(d, pe, pe_prime), d, adjacencyMatrix, pe, pe_prime,
+                                 arrBondCount, [0] * len(arrBondCount), nSssr)
+            self.assertEqual(sorted(len(ring) for ring in rings),
+                             sorted(len(ring) for ring in SSSR.getRingsBitset(graph)), name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+'Testing the SpatialGrid module'
+import unittest
+import sys
+import numpy as np
+sys.path.append(r'/home/jesse/cimm/source')
+from SpatialGrid import SpatialGrid
+from Vector2 import Vector2
+from Vertex import Vertex
+from Atom import Atom
+from UnitGraph import build_graph
+
+
+class TestAddFunction(unittest.TestCase):
+    def setUp(self):
+        self.graph = build_graph(200, [])
+        self.graph.getCoordinates()[:] = np.random.default_rng(7).uniform(-100.0, 100.0, (200, 2))
+        self.grid = SpatialGrid(self.graph, 15.0)
+
+    def brute_force(self, x, y):
+        return np.hypot(*(self.graph.getCoordinates() - (x, y)).T)
+
+    def test_radius_query(self):
+        found = self.grid.getVerticesAt(Vector2(10.0, -5.0), 32.0, excludeVertexId=3)
+        expected = [i for i in np.flatnonzero(self.brute_force(10.0, -5.0) <= 32.0).tolist() if i != 3]
+        self.assertEqual(sorted(found), expected)
+
+    def test_nearest_vertices(self):
+        nearest = self.grid.getNearestVertices(Vector2(40.0, 40.0), 5)
+        self.assertEqual([vertexId for vertexId, _ in nearest], np.argsort(self.brute_force(40.0, 40.0))[:5].tolist())
+        distances = self.brute_force(*self.graph.getCoordinates()[17])
+        distances[17] = np.inf
+        self.assertEqual(self.grid.getClosestVertex(17), int(np.argmin(distances)))
+        self.assertEqual(len(self.grid.getNearestVertices(Vector2(1e4, 1e4), 500)), 200)
+
+    def test_pairs_within(self):
+        coordinates = self.graph.getCoordinates()
+        distances = np.hypot(*(coordinates[:, np.newaxis] - coordinates[np.newaxis]).transpose(2, 0, 1))
+        expected = sorted(map(tuple, np.argwhere(np.triu(distances < 20.0, k=1)).tolist()))
+        self.assertEqual(sorted(map(tuple, self.grid.getPairsWithin(20.0).tolist())), expected)
+
+    def test_incremental_update(self):
+        self.graph.spatialGrid = self.grid
+        self.graph.translate(500.0, 0.0, [4])
+        self.assertEqual(self.grid.getNearestVertices(self.graph.vertices[4].position, 1)[0][0], 4)
+        self.graph.vertices[5].position.x, self.graph.vertices[5].position.y = -500.0, 0.0
+        self.assertEqual(self.grid.update([5]), 1)
+        self.graph.addVertex(Vertex(Atom('C'), -501.0, 0.0))
+        self.assertEqual(self.grid.update(), 1)
+        self.assertEqual(sorted(self.grid.getVerticesAt(Vector2(-500.0, 0.0), 2.0)), [5, 200])
+        self.assertEqual(sum(len(members) for members in self.grid.cells.values()), 201)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+'Testing the Vector2 and Line modules'
+import unittest
+import sys
+from math import pi
+sys.path.append(r'/home/jesse/cimm/source')
+from Vector2 import Vector2
+from Line import Line
+from Vertex import Vertex
+from Atom import Atom
+
+
+class TestAddFunction(unittest.TestCase):
+    def test_constructor(self):
+        self.assertEqual((Vector2(1, 2).x, Vector2(1, 2).y), (1, 2))
+        self.assertEqual(Vector2(Vector2(3, 4), None).y, 4)
+
+    def test_in_place_operations(self):
+        vec = Vector2(1.0, 2.0)
+        self.assertIs(vec.iadd(Vector2(1.0, 1.0)).isub(Vector2(0.0, 3.0)).iscale(2.0), vec)
+        self.assertEqual((vec.x, vec.y), (4.0, 0.0))
+        self.assertIs(vec.set_from(Vector2(5.0, 6.0)), vec)
+        self.assertEqual((vec.x, vec.y), (5.0, 6.0))
+        vec.rotate_around_inplace(pi / 2, Vector2(5.0, 5.0))
+        self.assertAlmostEqual(vec.x, 4.0)
+        self.assertAlmostEqual(vec.y, 5.0)
+        self.assertAlmostEqual(Vector2(3.0, 4.0).normalize().length(), 1.0)
+
+    def test_line_shorten(self):
+        line = Line(Vector2(0.0, 0.0), Vector2(10.0, 0.0))
+        line.shorten_from(2.0).shorten_to(3.0)
+        self.assertEqual((line.from_.x, line.to.x), (2.0, 7.0))
+        line.shorten(1.0)
+        self.assertEqual((line.from_.x, line.to.x), (2.5, 6.5))
+        self.assertEqual(line.get_length(), 4.0)
+        self.assertIsNot(Line().from_, Line().from_)
+
+    def test_vertex_angle(self):
+        vertex = Vertex(Atom('C'), 1.0, 1.0)
+        self.assertAlmostEqual(vertex.getAngle(), pi / 4)
+        self.assertAlmostEqual(vertex.getAngle(Vector2(1.0, 0.0), True), 90.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
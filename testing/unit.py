@@ -2,6 +2,17 @@ import unittest
 import UnitArrayHelper 
 import UnitAtom 
 import UnitEdge 
+import UnitGraph
+import UnitRingTemplates
+import UnitSSSR
+import UnitRingConnection
+import UnitRing
+import UnitRingSystemGraph
+import UnitMoleculeStore
+import UnitVector2
+import UnitSpatialGrid
+import UnitOverlapScorer
+import UnitLayoutBudget
 
 # Создаем тестовый набор
 def suite():
@@ -9,6 +20,17 @@ def suite():
     test_suite.addTest(unittest.makeSuite(UnitArrayHelper.TestAddFunction))
     # test_suite.addTest(unittest.makeSuite(UnitAtom.TestAddFunction))
     # test_suite.addTest(unittest.makeSuite(UnitEdge.TestAddFunction))
+    test_suite.addTest(unittest.makeSuite(UnitGraph.TestAddFunction))
+    test_suite.addTest(unittest.makeSuite(UnitRingTemplates.TestAddFunction))
+    test_suite.addTest(unittest.makeSuite(UnitSSSR.TestAddFunction))
+    test_suite.addTest(unittest.makeSuite(UnitRingConnection.TestAddFunction))
+    test_suite.addTest(unittest.makeSuite(UnitRing.TestAddFunction))
+    test_suite.addTest(unittest.makeSuite(UnitRingSystemGraph.TestAddFunction))
+    test_suite.addTest(unittest.makeSuite(UnitMoleculeStore.TestAddFunction))
+    test_suite.addTest(unittest.makeSuite(UnitVector2.TestAddFunction))
+    test_suite.addTest(unittest.makeSuite(UnitSpatialGrid.TestAddFunction))
+    test_suite.addTest(unittest.makeSuite(UnitOverlapScorer.TestAddFunction))
+    test_suite.addTest(unittest.makeSuite(UnitLayoutBudget.TestAddFunction))
     return test_suite
 
 if __name__ == '__main__':